@@ -1,8 +1,10 @@
-import inspect, os
+import inspect, os, sys
 from typing import Tuple
+from contextlib import contextmanager
 from importlib import import_module
 from pafmvc.conf.settings import BASE_DIR
 from pafmvc.orm.model import Model
+from .manifest import manifest
 
 MODELS_MODULE = "models"
 URLS_MODULE = "urls"
@@ -14,6 +16,21 @@ def get_is_exactly_subclass_checker(module: str, cls: object):
 		return inspect.isclass(challenger) and issubclass(challenger, cls) and challenger.__module__ == module
 	return handler
 
+def get_module_path(module: str) -> str:
+	return os.path.join(BASE_DIR, os.path.join(*module.split(separator)))
+
+@contextmanager
+def base_dir_in_path():
+	base_dir = str(BASE_DIR)
+	if base_dir in sys.path:
+		yield
+		return
+	sys.path.insert(0, base_dir)
+	try:
+		yield
+	finally:
+		sys.path.remove(base_dir)
+
 class App:
 	app_name = None
 
@@ -21,36 +38,57 @@ class App:
 		name = module.rpartition(separator)[2]
 		self._module = module
 		self._app_name = self.app_name or name
-		self._models = ()
-		self._urlpatterns = ()
-
-		self.collect_models()
-		self.collect_urls()
+		self._models = None
+		self._urlpatterns = None
 
 	def get_models(self) -> Tuple[Model]:
+		if self._models is None:
+			self.collect_models()
 		return self._models
 
+	def get_module_name(self) -> str:
+		return self._module
+
 	def get_app_path(self) -> str:
-		return os.path.join(BASE_DIR, os.path.join(*self._module.split(separator)))
+		return get_module_path(self._module)
 
 	def get_urlpatterns(self) -> Tuple[object]:
+		if self._urlpatterns is None:
+			self.collect_urls()
 		return self._urlpatterns
 
 	def collect_models(self):
-		try:
-			module = separator.join((self._module, MODELS_MODULE))
-			models_module = import_module(module)
-			self._models = tuple(model for _, model in inspect.getmembers(models_module, get_is_exactly_subclass_checker(module, Model)))
-		except ModuleNotFoundError:
-			pass
+		self._models = ()
+		module = separator.join((self._module, MODELS_MODULE))
+		model_names = manifest.get(self._module, self.get_app_path(), MODELS_MODULE)
+		with base_dir_in_path():
+			if model_names is not None:
+				if model_names:
+					models_module = import_module(module)
+					self._models = tuple(getattr(models_module, name) for name in model_names)
+				return
+			try:
+				models_module = import_module(module)
+				members = inspect.getmembers(models_module, get_is_exactly_subclass_checker(module, Model))
+				self._models = tuple(model for _, model in members)
+				model_names = list(name for name, _ in members)
+			except ModuleNotFoundError:
+				model_names = []
+		manifest.set(self._module, self.get_app_path(), MODELS_MODULE, model_names)
 	
 	def collect_urls(self):
+		self._urlpatterns = ()
+		module = separator.join((self._module, URLS_MODULE))
+		has_urls = manifest.get(self._module, self.get_app_path(), URLS_MODULE)
+		if has_urls is False:
+			return
 		try:
-			module = separator.join((self._module, URLS_MODULE))
-			models_module = import_module(module)
-			urlpatterns = getattr(models_module, URLPATTERNS, None)
+			with base_dir_in_path():
+				urls_module = import_module(module)
+			urlpatterns = getattr(urls_module, URLPATTERNS, None)
 			if not isinstance(urlpatterns, tuple):
 				raise ModuleNotFoundError()
 			self._urlpatterns = urlpatterns
 		except ModuleNotFoundError:
-			pass
\ No newline at end of file
+			pass
+		manifest.set(self._module, self.get_app_path(), URLS_MODULE, bool(self._urlpatterns))
@@ -0,0 +1,85 @@
+import os, json, threading
+from pafmvc.conf import settings
+
+MANIFEST_FILE_NAME = ".app_manifest.json"
+MANIFEST_VERSION = 2
+FINGERPRINT_FILES = ("apps.py", "models.py", "urls.py", "models", "urls")
+SOURCE_POSTFIX = ".py"
+
+def get_stat(path: str) -> list:
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return [stat.st_mtime_ns, stat.st_size]
+
+def get_package_fingerprint(path: str) -> list:
+	fingerprint = []
+	for directory, directories, files in os.walk(path):
+		directories.sort()
+		for name in sorted(files):
+			if name.endswith(SOURCE_POSTFIX):
+				file_path = os.path.join(directory, name)
+				fingerprint.append([os.path.relpath(file_path, path), get_stat(file_path)])
+	return fingerprint
+
+def get_fingerprint(path: str) -> list:
+	fingerprint = [get_stat(path)]
+	for name in FINGERPRINT_FILES:
+		file_path = os.path.join(path, name)
+		fingerprint.append(get_package_fingerprint(file_path) if os.path.isdir(file_path) else get_stat(file_path))
+	return fingerprint
+
+class DiscoveryManifest:
+	def __init__(self, path: str):
+		self._path = path
+		self._entries = None
+		self._lock = threading.Lock()
+
+	def _load(self) -> dict:
+		if self._entries is None:
+			try:
+				with open(self._path) as f:
+					data = json.load(f)
+				self._entries = data["apps"] if data.get("version") == MANIFEST_VERSION else {}
+			except (OSError, ValueError, KeyError, AttributeError):
+				self._entries = {}
+		return self._entries
+
+	def _save(self):
+		tmp_path = self._path + ".tmp"
+		try:
+			with open(tmp_path, 'w') as f:
+				json.dump({"version": MANIFEST_VERSION, "apps": self._entries}, f)
+			os.replace(tmp_path, self._path)
+		except OSError:
+			pass
+
+	def get(self, module: str, path: str, key: str) -> any:
+		if not self._path:
+			return None
+		with self._lock:
+			entry = self._load().get(module, None)
+			if entry is None or entry["fingerprint"] != get_fingerprint(path):
+				return None
+			return entry["data"].get(key, None)
+
+	def set(self, module: str, path: str, key: str, value: any):
+		if not self._path:
+			return
+		with self._lock:
+			entries = self._load()
+			fingerprint = get_fingerprint(path)
+			entry = entries.get(module, None)
+			if entry is None or entry["fingerprint"] != fingerprint:
+				entry = {"fingerprint": fingerprint, "data": {}}
+				entries[module] = entry
+			if entry["data"].get(key, None) != value:
+				entry["data"][key] = value
+				self._save()
+
+def get_manifest_path() -> str:
+	default = os.path.join(str(getattr(settings, "BASE_DIR", "")), MANIFEST_FILE_NAME)
+	return getattr(settings, "APP_MANIFEST_PATH", default)
+
+manifest = DiscoveryManifest(get_manifest_path())
@@ -0,0 +1,70 @@
+import sys, time
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
+REPORT_LIMIT = 30
+
+class TimedLoader:
+	def __init__(self, loader: object, profiler: object):
+		self._loader = loader
+		self._profiler = profiler
+
+	def create_module(self, spec: object) -> object:
+		return self._loader.create_module(spec)
+
+	def exec_module(self, module: object):
+		self._profiler.enter()
+		start = time.perf_counter()
+		try:
+			self._loader.exec_module(module)
+		finally:
+			self._profiler.exit(module.__name__, time.perf_counter() - start)
+			if getattr(module, "__loader__", None) is self:
+				module.__loader__ = self._loader
+			spec = getattr(module, "__spec__", None)
+			if spec is not None and spec.loader is self:
+				spec.loader = self._loader
+
+	def __getattr__(self, name: str) -> any:
+		return getattr(self._loader, name)
+
+class ImportProfiler:
+	def __init__(self):
+		self.timings = {}
+		self._children = []
+
+	def find_spec(self, fullname: str, path=None, target=None) -> object:
+		for finder in sys.meta_path:
+			find_spec = getattr(finder, "find_spec", None)
+			if finder is self or find_spec is None:
+				continue
+			spec = find_spec(fullname, path, target)
+			if spec is not None:
+				if hasattr(spec.loader, "exec_module"):
+					spec.loader = TimedLoader(spec.loader, self)
+				return spec
+		return None
+
+	def enter(self):
+		self._children.append(0.0)
+
+	def exit(self, module: str, duration: float):
+		children = self._children.pop()
+		if self._children:
+			self._children[-1] += duration
+		self.timings[module] = (duration, duration - children)
+
+	def __enter__(self) -> object:
+		sys.meta_path.insert(0, self)
+		return self
+
+	def __exit__(self, *args):
+		sys.meta_path.remove(self)
+
+	def report(self, limit: int=REPORT_LIMIT, file=None):
+		file = file or sys.stderr
+		total = sum(own for _, own in self.timings.values())
+		print(f"startup imports: {len(self.timings)} modules, {total * 1000:.1f} ms", file=file)
+		print(f"{'cumulative ms':>14} {'self ms':>10}  module", file=file)
+		ordered = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+		for module, (cumulative, own) in ordered[:limit]:
+			print(f"{cumulative * 1000:>14.1f} {own * 1000:>10.1f}  {module}", file=file)
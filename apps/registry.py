@@ -1,38 +1,65 @@
-import inspect, sys
+import inspect, sys, threading
 from importlib import import_module
-from pafmvc.conf.settings import REGISTERED_APPS, BASE_DIR
-from .app import App, get_is_exactly_subclass_checker
+from pafmvc.conf.settings import REGISTERED_APPS
+from .app import App, get_is_exactly_subclass_checker, get_module_path, base_dir_in_path
+from .manifest import manifest
+from .profiling import ImportProfiler, PROFILE_STARTUP_FLAG
 
 separator = "."
 APP_MODULE_NAME = "apps"
+APP_CONFIG = "config"
 
 class AppRegistry:
 	def __init__(self):
-		self.registered_apps = {}
+		self._registered_apps = None
+		self._lock = threading.Lock()
 
-		self.populate()
+	@property
+	def registered_apps(self) -> dict:
+		if self._registered_apps is None:
+			with self._lock:
+				if self._registered_apps is None:
+					self._registered_apps = self.populate()
+		return self._registered_apps
 
 	def _get_app_config(self, module: str) -> App:
 		config = App
 		try:
 			app_config_module = separator.join((module, APP_MODULE_NAME))
 			app_config = import_module(app_config_module)
-			configs = inspect.getmembers(app_config, get_is_exactly_subclass_checker(app_config_module, App))
-			if configs:
-				conf, *others = configs
-				if others:
-					raise Exception("more than one app config found")
-				_, config = conf
+			config_name = manifest.get(module, get_module_path(module), APP_CONFIG)
+			if config_name is None:
+				configs = inspect.getmembers(app_config, get_is_exactly_subclass_checker(app_config_module, App))
+				config_name = ""
+				if configs:
+					conf, *others = configs
+					if others:
+						raise Exception("more than one app config found")
+					config_name, _ = conf
+				manifest.set(module, get_module_path(module), APP_CONFIG, config_name)
+			if config_name:
+				config = getattr(app_config, config_name)
 		except ModuleNotFoundError as e:
 			raise ModuleNotFoundError(f"{module} app not found")
 		return config(module)
 		
 	def populate(self) -> dict:
-		sys.path.insert(0, str(BASE_DIR))
-		for module in REGISTERED_APPS:
-			config = self._get_app_config(module)
-			self.registered_apps[config.app_name] = config
-		sys.path.remove(str(BASE_DIR))
+		registered_apps = {}
+		with base_dir_in_path():
+			for module in REGISTERED_APPS:
+				config = self._get_app_config(module)
+				registered_apps[config._app_name] = config
+		return registered_apps
+
+	def load_all(self) -> dict:
+		for app in self.registered_apps.values():
+			app.get_models()
+			app.get_urlpatterns()
 		return self.registered_apps
 
-apps = AppRegistry()
\ No newline at end of file
+apps = AppRegistry()
+
+if PROFILE_STARTUP_FLAG in sys.argv:
+	with ImportProfiler() as profiler:
+		apps.load_all()
+	profiler.report()
@@ -10,5 +10,8 @@ class Url:
 			path = path[:-1]
 		return re.match(self._path, path)
 	
+	def get_path(self) -> str:
+		return self._path
+
 	def get_view(self) -> object:
 		return self._view
\ No newline at end of file
@@ -0,0 +1,65 @@
+import threading
+from pafmvc.conf import settings
+from pafmvc.core.response import default_responses
+
+DEFAULT_GROUP = "default"
+DEFAULT_QUEUE_SIZE = 0
+DEFAULT_QUEUE_TIMEOUT = 1.0
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_EXEMPT_PATHS = ("/health",)
+
+class AdmissionGroup:
+	def __init__(self, name: str, *, limit: int, queue: int=DEFAULT_QUEUE_SIZE, timeout: float=DEFAULT_QUEUE_TIMEOUT, retry_after: int=DEFAULT_RETRY_AFTER, prefix: str=""):
+		self.name = name
+		self.prefix = prefix
+		self.rejection = default_responses.ServiceUnavailable(retry_after=retry_after)
+		self._semaphore = threading.BoundedSemaphore(limit)
+		self._queue_size = queue
+		self._queue_timeout = timeout
+		self._waiting = 0
+		self._lock = threading.Lock()
+
+	def acquire(self) -> bool:
+		if self._semaphore.acquire(blocking=False):
+			return True
+		with self._lock:
+			if self._waiting >= self._queue_size:
+				return False
+			self._waiting += 1
+		try:
+			return self._semaphore.acquire(timeout=self._queue_timeout)
+		finally:
+			with self._lock:
+				self._waiting -= 1
+
+	def release(self):
+		self._semaphore.release()
+
+class AdmissionController:
+	def __init__(self, groups: dict, exempt: tuple=DEFAULT_EXEMPT_PATHS):
+		self._default = None
+		self._groups = []
+		self._exempt = tuple(exempt)
+		for name, config in groups.items():
+			group = AdmissionGroup(name, **config)
+			if name == DEFAULT_GROUP:
+				self._default = group
+			else:
+				self._groups.append(group)
+		self._groups.sort(key=lambda group: len(group.prefix), reverse=True)
+
+	def get_group(self, path: str) -> AdmissionGroup:
+		if any(path == exempt or path.startswith(exempt.rstrip("/") + "/") for exempt in self._exempt):
+			return None
+		for group in self._groups:
+			if path.startswith(group.prefix):
+				return group
+		return self._default
+
+def get_admission_controller() -> AdmissionController:
+	groups = getattr(settings, "ADMISSION_GROUPS", None)
+	if not groups:
+		return None
+	return AdmissionController(groups, getattr(settings, "ADMISSION_EXEMPT_PATHS", DEFAULT_EXEMPT_PATHS))
+
+admission = get_admission_controller()
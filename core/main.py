@@ -1,28 +1,50 @@
+import time
+from contextlib import ExitStack
+from contextvars import Context, copy_context
+from pafmvc.conf import settings
 from pafmvc.conf.settings import DEBUG
 from pafmvc.apps.registry import apps
+from pafmvc.orm.db.instrumentation import capture_queries, logger
+from pafmvc.orm.model.loader import batch_loading
+from pafmvc.orm.db.executor import QueryTimeout, query_timeout
 from pafmvc.view import View
-from pafmvc.core.response import Response
+from pafmvc.controller.url import Url
+from pafmvc.core.response import Response, ResponseIterator
 from request import Request
 from response import default_responses, exceptions
+from admission import admission
+from metrics import metrics, metrics_url, UNMATCHED_ROUTE
 
 class PyMVC:
 	def _get_request(self, environ: dict) -> Request:
 		return Request(environ)
 
-	def _find_view(self, url: str) -> View:
+	def _find_url(self, url: str) -> Url:
+		if metrics_url is not None and metrics_url.match(url):
+			return metrics_url
 		for app in apps.registered_apps.values():
 			for urlpattern in app.get_urlpatterns():
 				if urlpattern.match(url):
-					return urlpattern.get_view()
-		raise exceptions.ResponseException(404, "view not found")
+					return urlpattern
+		return None
+
+	def _find_view(self, urlpattern: Url) -> View:
+		if urlpattern is None:
+			raise exceptions.ResponseException(404, "view not found")
+		return urlpattern.get_view()
 	
-	def _get_response(self, request: Request, url: str) -> Response:
+	def _get_response(self, request: Request, url: str, urlpattern: Url) -> Response:
 		try:
-			view = self._find_view(url)
+			view = self._find_view(urlpattern)
 			response = view(request)
 			if not isinstance(response, Response):
 				raise exceptions.ResponseException(500, "view didn't return Response object")
 			return response
+		except QueryTimeout as exc:
+			logger.warning("%s timed out: %s", url, exc)
+			if not DEBUG:
+				return default_responses.get_default_page(str(getattr(settings, "DB_TIMEOUT_STATUS", 503)))
+			raise exc
 		except Exception as exc:
 			if not DEBUG:
 				if isinstance(exc, exceptions.ResponseException):
@@ -32,13 +54,57 @@ class PyMVC:
 
 	def _start_response(self, response: Response, start_response):
 		start_response(response.status, response.get_headers())
-		return [response.body]
+		return response.iter_body()
 	
-	def __call__(self, environ: dict, start_response, **kwargs) -> list:
-		request = self._get_request(environ)
-		response = self._get_response(request, environ['PATH_INFO'])
+	def _check_query_count(self, url: str, query_log: object, response: Response):
+		max_queries = getattr(settings, "DB_MAX_QUERIES_PER_REQUEST", None)
+		if max_queries is not None and query_log.count > max_queries:
+			logger.warning("%s ran %d queries (limit %d)", url, query_log.count, max_queries)
+		if DEBUG:
+			response.update_headers({"X-DB-Query-Count": query_log.count, "X-DB-Query-Time": "%.3f" % query_log.duration})
+
+	def _handle(self, environ: dict, start_response, group: object, context: Context) -> ResponseIterator:
+		started = time.perf_counter()
+		scope = ExitStack()
+		query_log = scope.enter_context(capture_queries())
+		scope.enter_context(batch_loading())
+		scope.enter_context(query_timeout(getattr(settings, "DB_REQUEST_TIMEOUT", None)))
+		try:
+			request = self._get_request(environ)
+			urlpattern = self._find_url(environ['PATH_INFO'])
+			response = self._get_response(request, environ['PATH_INFO'], urlpattern)
+			self._check_query_count(environ['PATH_INFO'], query_log, response)
+			body = self._start_response(response, start_response)
+		except BaseException:
+			scope.close()
+			raise
+
+		def finish():
+			try:
+				scope.close()
+			finally:
+				if group is not None:
+					group.release()
+			if metrics is not None:
+				route = urlpattern.get_path() if urlpattern is not None else UNMATCHED_ROUTE
+				metrics.record_request(route, request.method, response.status, time.perf_counter() - started, query_log)
+				metrics.flush()
 
-		return self._start_response(response, start_response)
+		return ResponseIterator(context, body, finish)
+
+	def __call__(self, environ: dict, start_response, **kwargs) -> ResponseIterator:
+		group = admission and admission.get_group(environ['PATH_INFO'])
+		if group is not None and not group.acquire():
+			if metrics is not None:
+				metrics.inc("pafmvc_admission_rejected_total", (("group", group.name),))
+			return self._start_response(group.rejection, start_response)
+		context = copy_context()
+		try:
+			return context.run(self._handle, environ, start_response, group, context)
+		except BaseException:
+			if group is not None:
+				group.release()
+			raise
 	
 def main(environ: dict, start_response, **kwargs):
 	mvc = PyMVC()
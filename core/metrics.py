@@ -0,0 +1,193 @@
+import os, re, json, time, bisect, threading
+from pafmvc.conf import settings
+from pafmvc.view import View
+from pafmvc.controller.url import Url
+from pafmvc.core.response import Response, template_cache
+from pafmvc.orm.db import aio
+from pafmvc.orm.db.cache import query_cache
+from pafmvc.orm.db.executor import get_open_connections
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PATH = "/metrics"
+DEFAULT_FLUSH_INTERVAL = 1.0
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+FILE_PREFIX = "metrics-"
+FILE_POSTFIX = ".json"
+UNMATCHED_ROUTE = "unmatched"
+
+def escape(value: str) -> str:
+	return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_labels(labels: tuple, *extra) -> str:
+	labels = tuple(labels) + extra
+	if not labels:
+		return ""
+	return "{" + ",".join(f"{name}=\"{escape(value)}\"" for name, value in labels) + "}"
+
+def format_bound(bound: float) -> str:
+	return repr(float(bound))
+
+def is_alive(pid: int) -> bool:
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:
+		pass
+	return True
+
+class MetricsRegistry:
+	def __init__(self, directory: str=None, flush_interval: float=DEFAULT_FLUSH_INTERVAL):
+		self._directory = directory
+		self._flush_interval = flush_interval
+		self._flushed = 0
+		self.reset()
+
+	def reset(self):
+		self._lock = threading.Lock()
+		self._counters = {}
+		self._histograms = {}
+		query_cache.hits = query_cache.misses = 0
+		template_cache.hits = template_cache.misses = 0
+
+	def inc(self, name: str, labels: tuple=(), value: float=1):
+		key = (name, tuple(labels))
+		with self._lock:
+			self._counters[key] = self._counters.get(key, 0) + value
+
+	def observe(self, name: str, value: float, labels: tuple=(), buckets: tuple=LATENCY_BUCKETS):
+		key = (name, tuple(labels))
+		index = bisect.bisect_left(buckets, value)
+		with self._lock:
+			histogram = self._histograms.get(key, None)
+			if histogram is None:
+				histogram = self._histograms[key] = (buckets, [0] * (len(buckets) + 1), [0.0])
+			histogram[1][index] += 1
+			histogram[2][0] += value
+
+	def record_request(self, route: str, method: str, status: str, duration: float, query_log: object):
+		route = (("route", route),)
+		self.inc("pafmvc_http_requests_total", route + (("method", method), ("status", status)))
+		self.observe("pafmvc_http_request_duration_seconds", duration, route)
+		self.inc("pafmvc_db_queries_total", route, query_log.count)
+		self.inc("pafmvc_db_query_seconds_total", route, query_log.duration)
+		self.observe("pafmvc_db_queries_per_request", query_log.count, route, QUERY_COUNT_BUCKETS)
+		self.observe("pafmvc_db_query_seconds_per_request", query_log.duration, route)
+
+	def get_gauges(self) -> list:
+		active, queued = aio.get_pool_usage()
+		return [
+			("pafmvc_db_open_connections", (), get_open_connections()),
+			("pafmvc_db_async_active", (), active),
+			("pafmvc_db_async_queued", (), queued),
+		]
+
+	def snapshot(self) -> dict:
+		with self._lock:
+			counters = [(name, labels, value) for (name, labels), value in self._counters.items()]
+			histograms = [(name, labels, buckets, list(counts), total[0]) for (name, labels), (buckets, counts, total) in self._histograms.items()]
+		counters.extend((
+			("pafmvc_query_cache_hits_total", (), query_cache.hits),
+			("pafmvc_query_cache_misses_total", (), query_cache.misses),
+			("pafmvc_template_cache_hits_total", (), template_cache.hits),
+			("pafmvc_template_cache_misses_total", (), template_cache.misses),
+		))
+		return {"pid": os.getpid(), "counters": counters, "histograms": histograms, "gauges": self.get_gauges()}
+
+	def _get_path(self, pid: int) -> str:
+		return os.path.join(self._directory, f"{FILE_PREFIX}{pid}{FILE_POSTFIX}")
+
+	def flush(self, force=False):
+		if self._directory is None:
+			return
+		now = time.monotonic()
+		if not force and now - self._flushed < self._flush_interval:
+			return
+		self._flushed = now
+		snapshot = self.snapshot()
+		path = self._get_path(snapshot["pid"])
+		tmp_path = f"{path}.{threading.get_ident()}.tmp"
+		with open(tmp_path, "w") as snapshot_io:
+			json.dump(snapshot, snapshot_io)
+		os.replace(tmp_path, path)
+
+	def collect(self) -> list:
+		if self._directory is None:
+			return [self.snapshot()]
+		self.flush(force=True)
+		snapshots = []
+		for file_name in os.listdir(self._directory):
+			if not (file_name.startswith(FILE_PREFIX) and file_name.endswith(FILE_POSTFIX)):
+				continue
+			try:
+				with open(os.path.join(self._directory, file_name)) as snapshot_io:
+					snapshots.append(json.load(snapshot_io))
+			except (OSError, ValueError):
+				continue
+		return snapshots
+
+	def render(self) -> str:
+		counters, histograms, gauges = {}, {}, {}
+		for snapshot in self.collect():
+			for name, labels, value in snapshot["counters"]:
+				key = (name, tuple(map(tuple, labels)))
+				counters[key] = counters.get(key, 0) + value
+			for name, labels, buckets, counts, total in snapshot["histograms"]:
+				key = (name, tuple(map(tuple, labels)))
+				merged = histograms.setdefault(key, (tuple(buckets), [0] * len(counts), [0.0]))
+				for index, count in enumerate(counts):
+					merged[1][index] += count
+				merged[2][0] += total
+			if snapshot["pid"] != os.getpid() and not is_alive(snapshot["pid"]):
+				continue
+			for name, labels, value in snapshot["gauges"]:
+				key = (name, tuple(map(tuple, labels)))
+				gauges[key] = gauges.get(key, 0) + value
+
+		lines = []
+		for kind, metrics in (("counter", counters), ("gauge", gauges)):
+			for name in sorted(set(name for name, _ in metrics)):
+				lines.append(f"# TYPE {name} {kind}")
+				for (metric, labels), value in sorted(metrics.items()):
+					if metric == name:
+						lines.append(f"{name}{format_labels(labels)} {value}")
+		for name in sorted(set(name for name, _ in histograms)):
+			lines.append(f"# TYPE {name} histogram")
+			for (metric, labels), (buckets, counts, total) in sorted(histograms.items()):
+				if metric != name:
+					continue
+				cumulative = 0
+				for bound, count in zip(buckets, counts):
+					cumulative += count
+					lines.append(f"{name}_bucket{format_labels(labels, ('le', format_bound(bound)))} {cumulative}")
+				cumulative += counts[-1]
+				lines.append(f"{name}_bucket{format_labels(labels, ('le', '+Inf'))} {cumulative}")
+				lines.append(f"{name}_sum{format_labels(labels)} {total[0]}")
+				lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+		return "\n".join(lines) + "\n"
+
+class MetricsView(View):
+	def __init__(self, registry: MetricsRegistry):
+		self._registry = registry
+
+	def get(self, request: object) -> Response:
+		return Response("200", self._registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+def get_metrics_registry() -> MetricsRegistry:
+	if not getattr(settings, "METRICS_ENABLED", False):
+		return None
+	directory = getattr(settings, "METRICS_DIR", None)
+	if directory is not None:
+		os.makedirs(directory, exist_ok=True)
+	registry = MetricsRegistry(directory, getattr(settings, "METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+	os.register_at_fork(after_in_child=registry.reset)
+	return registry
+
+def get_metrics_url(registry: MetricsRegistry) -> Url:
+	if registry is None:
+		return None
+	return Url("^" + re.escape(getattr(settings, "METRICS_PATH", DEFAULT_PATH).rstrip("/")) + "$", MetricsView(registry))
+
+metrics = get_metrics_registry()
+metrics_url = get_metrics_url(metrics)
@@ -0,0 +1,165 @@
+import re
+from typing import Tuple
+from tempfile import SpooledTemporaryFile
+from pafmvc.conf import settings
+from pafmvc.core.response.exceptions import ResponseException
+
+CRLF = b"\r\n"
+HEADERS_END = b"\r\n\r\n"
+PARAM = re.compile(r';\s*([\w*.-]+)\s*=\s*("(?:\\.|[^"\\])*"|[^;]*)')
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MEMORY_THRESHOLD = 1024 * 1024
+DEFAULT_MAX_FIELD_SIZE = 1024 * 1024
+DEFAULT_MAX_HEADER_SIZE = 16 * 1024
+DEFAULT_MAX_PARTS = 1000
+
+def parse_header(value: str) -> Tuple[str, dict]:
+	main, _, rest = value.partition(";")
+	params = {}
+	for key, param in PARAM.findall(";" + rest):
+		param = param.strip()
+		if len(param) > 1 and param[0] == param[-1] == '"':
+			param = param[1:-1].replace('\\\\', '\\').replace('\\"', '"')
+		params[key.lower()] = param
+	return main.strip().lower(), params
+
+class UploadedFile:
+	def __init__(self, name: str, filename: str, content_type: str, file: SpooledTemporaryFile, size: int):
+		self.name = name
+		self.filename = filename
+		self.content_type = content_type
+		self.file = file
+		self.size = size
+
+	def read(self, *args) -> bytes:
+		return self.file.read(*args)
+
+	def seek(self, *args) -> int:
+		return self.file.seek(*args)
+
+	def close(self):
+		self.file.close()
+
+class MultipartParser:
+	def __init__(self, stream: object, boundary: str, content_length: int=None):
+		if not boundary:
+			raise ResponseException(400, "multipart boundary is missing")
+		self._stream = stream
+		self._remaining = content_length
+		self._delimiter = CRLF + b"--" + boundary.encode("latin-1")
+		self._buffer = CRLF
+		self._eof = False
+		self._chunk_size = getattr(settings, "UPLOAD_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+		self._memory_threshold = getattr(settings, "UPLOAD_MEMORY_THRESHOLD", DEFAULT_MEMORY_THRESHOLD)
+		self._max_file_size = getattr(settings, "UPLOAD_MAX_FILE_SIZE", None)
+		self._max_field_size = getattr(settings, "UPLOAD_MAX_FIELD_SIZE", DEFAULT_MAX_FIELD_SIZE)
+		self._max_body_size = getattr(settings, "UPLOAD_MAX_BODY_SIZE", None)
+		self._max_parts = getattr(settings, "UPLOAD_MAX_PARTS", DEFAULT_MAX_PARTS)
+		self._read_size = 0
+
+	def _fill(self) -> bool:
+		if self._eof:
+			return False
+		size = self._chunk_size if self._remaining is None else min(self._chunk_size, self._remaining)
+		chunk = self._stream.read(size) if size else b""
+		if not chunk:
+			self._eof = True
+			return False
+		self._read_size += len(chunk)
+		if self._max_body_size is not None and self._read_size > self._max_body_size:
+			raise ResponseException(413, "request body is too large")
+		if self._remaining is not None:
+			self._remaining -= len(chunk)
+		self._buffer += chunk
+		return True
+
+	def _read_until(self, marker: bytes, limit: int) -> bytes:
+		while True:
+			index = self._buffer.find(marker)
+			if index != -1:
+				data = self._buffer[:index]
+				self._buffer = self._buffer[index + len(marker):]
+				return data
+			if len(self._buffer) > limit:
+				raise ResponseException(400, "malformed multipart body")
+			if not self._fill():
+				raise ResponseException(400, "unexpected end of multipart body")
+
+	def _skip_preamble(self):
+		keep = len(self._delimiter) - 1
+		while self._buffer.find(self._delimiter) == -1:
+			self._buffer = self._buffer[-keep:]
+			if not self._fill():
+				raise ResponseException(400, "multipart boundary not found")
+		self._read_until(self._delimiter, len(self._buffer))
+
+	def _is_last_part(self) -> bool:
+		while len(self._buffer) < 2:
+			if not self._fill():
+				raise ResponseException(400, "unexpected end of multipart body")
+		if self._buffer.startswith(b"--"):
+			return True
+		self._read_until(CRLF, DEFAULT_MAX_HEADER_SIZE)
+		return False
+
+	def _read_headers(self) -> dict:
+		if self._buffer.startswith(CRLF):
+			self._buffer = self._buffer[len(CRLF):]
+			return {}
+		raw_headers = self._read_until(HEADERS_END, DEFAULT_MAX_HEADER_SIZE)
+		headers = {}
+		for line in raw_headers.decode("utf-8", "replace").split("\r\n"):
+			name, separator, value = line.partition(":")
+			if separator:
+				headers[name.strip().lower()] = value.strip()
+		return headers
+
+	def _write_body(self, write, limit: int) -> int:
+		keep = len(self._delimiter) - 1
+		size = 0
+		while True:
+			index = self._buffer.find(self._delimiter)
+			data = self._buffer[:index] if index != -1 else self._buffer[:-keep]
+			size += len(data)
+			if limit is not None and size > limit:
+				raise ResponseException(413, "multipart part is too large")
+			write(data)
+			if index != -1:
+				self._buffer = self._buffer[index + len(self._delimiter):]
+				return size
+			self._buffer = self._buffer[-keep:]
+			if not self._fill():
+				raise ResponseException(400, "unexpected end of multipart body")
+
+	def parse(self) -> Tuple[dict, dict]:
+		fields, files = {}, {}
+		self._skip_preamble()
+		parts = 0
+		try:
+			while not self._is_last_part():
+				parts += 1
+				if parts > self._max_parts:
+					raise ResponseException(413, "too many multipart parts")
+				headers = self._read_headers()
+				disposition, params = parse_header(headers.get("content-disposition", ""))
+				name = params.get("name", None)
+				if disposition != "form-data" or name is None:
+					self._write_body(lambda data: None, None)
+					continue
+				if "filename" in params:
+					file = SpooledTemporaryFile(max_size=self._memory_threshold)
+					size = self._write_body(file.write, self._max_file_size)
+					file.seek(0)
+					content_type = headers.get("content-type", "application/octet-stream")
+					files[name] = UploadedFile(name, params["filename"], content_type, file, size)
+				else:
+					value = bytearray()
+					self._write_body(value.extend, self._max_field_size)
+					_, content_params = parse_header(headers.get("content-type", "text/plain"))
+					fields[name] = value.decode(content_params.get("charset", "utf-8"), "replace")
+		except Exception:
+			for file in files.values():
+				file.close()
+			raise
+		return fields, files
@@ -1,11 +1,45 @@
+from pafmvc.core.multipart import MultipartParser, parse_header
+
+MULTIPART_FORM_DATA = "multipart/form-data"
+
 class Request:
     def __init__(self, environ: dict):
         self.method = environ['REQUEST_METHOD'].lower()
         self.GET = self._get_params(environ['QUERY_STRING'])
-        self.POST = self._post_params(environ['wsgi.input'].read())
+        self._environ = environ
+        self._post = None
+        self._files = None
+
+    @property
+    def POST(self) -> dict:
+        if self._post is None:
+            self._parse_body()
+        return self._post
+
+    @property
+    def FILES(self) -> dict:
+        if self._files is None:
+            self._parse_body()
+        return self._files
+
+    def _get_content_length(self) -> int:
+        try:
+            return int(self._environ.get('CONTENT_LENGTH') or 0) or None
+        except ValueError:
+            return None
+
+    def _parse_body(self):
+        content_type, params = parse_header(self._environ.get('CONTENT_TYPE', ''))
+        if content_type == MULTIPART_FORM_DATA:
+            self._post, self._files = MultipartParser(self._environ['wsgi.input'], params.get('boundary'), self._get_content_length()).parse()
+            return
+        content_length = self._get_content_length()
+        stream = self._environ['wsgi.input']
+        self._post = self._post_params(stream.read(content_length) if content_length else stream.read())
+        self._files = {}
     
     def _get_params(self, qs: str) -> dict:
         return qs
     
     def _post_params(self, raw_bytes: bytes) -> dict:
-        return raw_bytes.decode("utf-8")
\ No newline at end of file
+        return raw_bytes.decode("utf-8")
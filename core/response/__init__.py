@@ -1,5 +1,6 @@
-import os
-from typing import Tuple
+import os, threading
+from typing import Tuple, Iterable, Callable
+from contextvars import Context
 from pafmvc.conf.settings import TEMPLATE_PATH
 
 DEFAULT_HEADERS = {
@@ -25,15 +26,76 @@ class Response:
 	
 	def get_headers(self) -> Tuple[Tuple[str]]:
 		return tuple(self._headers.items())
+
+	def iter_body(self) -> Iterable[bytes]:
+		return [self.body]
+
+class StreamingResponse(Response):
+	def __init__(self, status: str, chunks: Iterable, *, headers = {}):
+		super().__init__(status, b"", headers=headers)
+		del self._headers["Content-Length"]
+		self._chunks = chunks
+
+	def iter_body(self) -> Iterable[bytes]:
+		for chunk in self._chunks:
+			yield chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
 	
+class ResponseIterator:
+	def __init__(self, context: Context, chunks: Iterable[bytes], on_close: Callable):
+		self._context = context
+		self._chunks = iter(chunks)
+		self._on_close = on_close
+		self._closed = False
+
+	def __iter__(self):
+		return self
+
+	def __next__(self) -> bytes:
+		return self._context.run(next, self._chunks)
+
+	def close(self):
+		if self._closed:
+			return
+		self._closed = True
+		try:
+			close = getattr(self._chunks, "close", None)
+			if close is not None:
+				self._context.run(close)
+		finally:
+			self._context.run(self._on_close)
+
 class JsonResponse(Response):
 	def __init__(self, status: str, body: bytes, *, headers = {}):
 		super().__init__(status, body, headers={"Content-Type": "application/json; charset=utf-8"})
 
+class StreamingJsonResponse(StreamingResponse):
+	def __init__(self, status: str, chunks: Iterable, *, headers = {}):
+		super().__init__(status, chunks, headers=dict(headers, **{"Content-Type": "application/json; charset=utf-8"}))
+
+class TemplateCache:
+	def __init__(self):
+		self._templates = {}
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, path: str) -> bytes:
+		mtime = os.stat(path).st_mtime_ns
+		entry = self._templates.get(path, None)
+		if entry is not None and entry[0] == mtime:
+			self.hits += 1
+			return entry[1]
+		with open(path, 'rb') as template_io:
+			template_bytes = template_io.read()
+		with self._lock:
+			self.misses += 1
+			self._templates[path] = (mtime, template_bytes)
+		return template_bytes
+
+template_cache = TemplateCache()
+
 def render(template_url: str, context: dict) -> Response:
-	with open(os.path.join(TEMPLATE_PATH, template_url), 'rb') as template_io:
-		template_bytes = template_io.read()
-		return Response('200', template_bytes)
+	return Response('200', template_cache.get(os.path.join(TEMPLATE_PATH, template_url)))
 
 def redirect(url: str) -> Response:
     return Response('302', "Redirecting...", headers={'Location': url})
\ No newline at end of file
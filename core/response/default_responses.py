@@ -1,5 +1,9 @@
 from . import Response
 
+class BadRequest(Response):
+	def __init__(self):
+		super().__init__("400", "<h1>Bad Request</h1>")
+
 class NotFound(Response):
 	def __init__(self):
 		super().__init__("404", "<h1>Page Not Found</h1>")
@@ -12,10 +16,26 @@ class MethodNotAllowed(Response):
 	def __init__(self):
 		super().__init__("405", "<h1>Method Not Allowed</h1>")
 
+class PayloadTooLarge(Response):
+	def __init__(self):
+		super().__init__("413", "<h1>Payload Too Large</h1>")
+
+class ServiceUnavailable(Response):
+	def __init__(self, retry_after: int=None):
+		super().__init__("503", "<h1>Service Unavailable</h1>", headers={} if retry_after is None else {"Retry-After": retry_after})
+
+class GatewayTimeout(Response):
+	def __init__(self):
+		super().__init__("504", "<h1>Gateway Timeout</h1>")
+
 PAGES = {
+	'400': BadRequest(),
 	'404': NotFound(),
 	'500': ServerError(),
 	'405': MethodNotAllowed(),
+	'413': PayloadTooLarge(),
+	'503': ServiceUnavailable(),
+	'504': GatewayTimeout(),
 }
 
 def get_default_page(code: str=None) -> Response:
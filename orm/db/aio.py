@@ -0,0 +1,60 @@
+import asyncio, threading
+from typing import Tuple
+from functools import partial
+from contextvars import ContextVar, copy_context
+from concurrent.futures import ThreadPoolExecutor
+from pafmvc.conf import settings
+
+DEFAULT_WORKERS = 4
+THREAD_NAME_PREFIX = "pafmvc-db"
+
+_pool = None
+_pinned_pool = ContextVar("pinned_pool", default=None)
+_usage = {"active": 0, "queued": 0}
+_usage_lock = threading.Lock()
+
+def get_pool() -> ThreadPoolExecutor:
+	global _pool
+	if _pool is None:
+		_pool = ThreadPoolExecutor(getattr(settings, "DB_ASYNC_WORKERS", DEFAULT_WORKERS), THREAD_NAME_PREFIX)
+	return _pool
+
+def get_pool_usage() -> Tuple[int, int]:
+	with _usage_lock:
+		return _usage["active"], _usage["queued"]
+
+def _update_usage(active: int, queued: int):
+	with _usage_lock:
+		_usage["active"] += active
+		_usage["queued"] += queued
+
+def _run_tracked(started: list, func, *args, **kwargs) -> any:
+	started.append(True)
+	_update_usage(1, -1)
+	try:
+		return func(*args, **kwargs)
+	finally:
+		_update_usage(-1, 0)
+
+async def run(func, *args, **kwargs) -> any:
+	pool = _pinned_pool.get() or get_pool()
+	started = []
+	_update_usage(0, 1)
+	try:
+		return await asyncio.get_running_loop().run_in_executor(pool, copy_context().run, partial(_run_tracked, started, func, *args, **kwargs))
+	finally:
+		if not started:
+			_update_usage(0, -1)
+
+def pin() -> object:
+	pool = _pinned_pool.get()
+	if pool is not None:
+		return (_pinned_pool.set(pool), False)
+	return (_pinned_pool.set(ThreadPoolExecutor(1, THREAD_NAME_PREFIX)), True)
+
+def unpin(pinned: object):
+	token, owner = pinned
+	pool = _pinned_pool.get()
+	_pinned_pool.reset(token)
+	if owner:
+		pool.shutdown(wait=False)
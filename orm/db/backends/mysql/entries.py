@@ -0,0 +1,21 @@
+from pafmvc.orm.db.entries import DataEngine, Inserter
+from pafmvc.orm.db.entries.operators import OnConflictOperator
+
+class OnDuplicateKeyOperator(OnConflictOperator):
+	CMD = "ON DUPLICATE KEY UPDATE {columns}"
+	COLUMN = "{0}=VALUES({0})"
+	NOTHING_COLUMN = "{0}={0}"
+
+	def to_str(self) -> str:
+		separator = ","
+		if not self._update:
+			return self.CMD.format(columns=self.NOTHING_COLUMN.format(self._conflict[0]))
+		return self.CMD.format(columns=separator.join(self.COLUMN.format(col) for col in self._update))
+
+class MySQLInserter(Inserter):
+	def __operators__(self):
+		super().__operators__()
+		self._operators['conflict'] = OnDuplicateKeyOperator()
+
+class MySQLDataEngine(DataEngine):
+	inserter = MySQLInserter
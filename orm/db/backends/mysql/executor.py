@@ -1,8 +1,10 @@
 from pafmvc.orm.db.executor import BaseExecutor
 from .schema import MySqlSchemaEngine
+from .entries import MySQLDataEngine
 
 class SQLiteExecutor(BaseExecutor):
 	schema_engine = MySqlSchemaEngine
+	data_engine = MySQLDataEngine
 
 	def connect(self):
 		pass
@@ -16,5 +18,5 @@ class SQLiteExecutor(BaseExecutor):
 	def rollback(self):
 		pass
 
-	def __call__(self, query: str, *, script=False):
+	def __call__(self, query: str, params: tuple=(), *, script=False, timeout: float=None):
 		pass
\ No newline at end of file
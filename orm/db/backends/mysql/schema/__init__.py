@@ -54,12 +54,14 @@ class MySQLSchemaEngine(SchemaEngine):
 	primary_key_schema = MySQLPrimaryKeySchema
 	many_to_many_schema = MySQLManyToManySchema
 		
-	def alter_table(self, table: str, fields: Tuple[FieldSchema]) -> MySQLTableSchemaEngine:
-		table_schema_engine = MySQLTableSchemaEngine(self, table, fields)
+	def alter_table(self, table: str, fields: Tuple[FieldSchema], indexes: Tuple[IndexSchema]=()) -> MySQLTableSchemaEngine:
+		table_schema_engine = MySQLTableSchemaEngine(self, table, fields, indexes)
 		self._operators['alter_table'].set(table_schema_engine)
 		return table_schema_engine
 
 	def __operators__(self):
 		self._operators['delete_table'] = DeleteTableOperator()
 		self._operators['create_table'] = CreateTableOperator()
-		self._operators['alter_table'] = ChangeTableOperator()
\ No newline at end of file
+		self._operators['alter_table'] = ChangeTableOperator()
+		self._operators['drop_index'] = DropIndexOperator()
+		self._operators['create_index'] = CreateIndexOperator()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from typing import Tuple
 from pafmvc.orm.db.operator import Operator
-from pafmvc.orm.db.schema import TableSchemaEngine, FieldSchema, ForeignKeySchema, PrimaryKeySchema
+from pafmvc.orm.db.schema import TableSchemaEngine, FieldSchema, ForeignKeySchema, PrimaryKeySchema, IndexSchema
 
 comma = ","
 
@@ -177,4 +177,32 @@ class AddForeignKeyOperator(Operator):
 		return comma.join((self._add_single_fk(field) for field in self._foreign_keys))
 	
 	def __bool__(self) -> bool:
-		return bool(self._foreign_keys)
\ No newline at end of file
+		return bool(self._foreign_keys)
+
+class CreateIndexOperator(Operator):
+	CMD = "CREATE {unique}INDEX {name} ON {table} ({fields});"
+	UNIQUE = "UNIQUE "
+
+	def __init__(self):
+		self._indexes = []
+
+	def set(self, table: str, index: IndexSchema):
+		self._indexes.append((table, index))
+
+	def _create_single_index(self, table: str, index: IndexSchema) -> str:
+		return self.CMD.format(
+			unique = self.UNIQUE if index.unique else "",
+			name = index.name,
+			table = table,
+			fields = comma.join(index.fields),
+		)
+
+	def to_str(self) -> str:
+		separator = "\n"
+		return separator.join(self._create_single_index(table, index) for table, index in self._indexes)
+
+	def __bool__(self) -> bool:
+		return bool(self._indexes)
+
+class DropIndexOperator(CreateIndexOperator):
+	CMD = "DROP INDEX {name} ON {table};"
@@ -1,6 +1,40 @@
-import sqlite3
-from pafmvc.orm.db.executor import BaseExecutor
+import sqlite3, time, random, re
+from pafmvc.orm.db.executor import BaseExecutor, QueryTimeout
 from .schema import SQLiteSchemaEngine
+from .writer import get_writer
+
+EXPLAIN = "EXPLAIN QUERY PLAN {}"
+PRAGMA = "PRAGMA {}={};"
+PRAGMA_VALUE = "PRAGMA {};"
+PROGRESS_STEPS = 1000
+
+DEFAULT_BUSY_TIMEOUT = 5.0
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.05
+DEFAULT_RETRY_MAX_BACKOFF = 1.0
+DEFAULT_GROUP_COMMIT_SIZE = 64
+BUSY_ERRORS = ("database is locked", "database is busy", "database table is locked")
+WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+REPORTED_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout", "foreign_keys")
+
+PROFILES = {
+	"default": {},
+	"read_heavy": {
+		"journal_mode": "WAL",
+		"synchronous": "NORMAL",
+		"cache_size": -64000,
+		"mmap_size": 268435456,
+		"temp_store": "MEMORY",
+		"busy_timeout": 5000,
+	},
+	"durable": {
+		"journal_mode": "WAL",
+		"synchronous": "FULL",
+		"busy_timeout": 5000,
+		"foreign_keys": "ON",
+	},
+}
 
 def connect_only(func):
 	def wrapper(self, *args, **kwargs):
@@ -11,15 +45,79 @@ def connect_only(func):
 
 class SQLiteExecutor(BaseExecutor):
 	schema_engine = SQLiteSchemaEngine
+	integrity_error = sqlite3.IntegrityError
+
+	def get_pragmas(self) -> dict:
+		profile = self._options.get("profile", "default")
+		if profile not in PROFILES:
+			raise Exception(f"unknown sqlite profile {profile}")
+		pragmas = dict(PROFILES[profile])
+		pragmas.update(self._options.get("pragmas", {}))
+		return pragmas
+
+	def _open(self) -> sqlite3.Connection:
+		connection = sqlite3.connect(self._path, timeout=self._options.get("busy_timeout", DEFAULT_BUSY_TIMEOUT))
+		connection.set_progress_handler(self._is_expired, PROGRESS_STEPS)
+		for pragma, value in self.get_pragmas().items():
+			connection.execute(PRAGMA.format(pragma, value))
+		return connection
+
+	def _is_expired(self) -> int:
+		return int(self._deadline is not None and time.monotonic() > self._deadline)
+
+	def _check_timeout(self, err: Exception):
+		if isinstance(err, sqlite3.OperationalError) and self._is_expired():
+			raise QueryTimeout("query exceeded its deadline") from err
+
+	def _should_retry(self, err: Exception, attempt: int) -> bool:
+		if not isinstance(err, sqlite3.OperationalError) or self.in_atomic() or self._is_expired():
+			return False
+		if attempt >= self._options.get("retries", DEFAULT_RETRIES):
+			return False
+		message = str(err).lower()
+		return any(busy_error in message for busy_error in BUSY_ERRORS)
+
+	def _backoff(self, attempt: int):
+		base = self._options.get("retry_backoff", DEFAULT_RETRY_BACKOFF)
+		delay = random.uniform(0, min(self._options.get("retry_max_backoff", DEFAULT_RETRY_MAX_BACKOFF), base * 2 ** attempt))
+		if self._deadline is not None:
+			delay = max(0, min(delay, self._deadline - time.monotonic()))
+		time.sleep(delay)
+
+	def _use_writer(self, query: str, script: bool) -> bool:
+		return self._options.get("single_writer", False) and not script and not self.in_atomic() and bool(WRITE_STATEMENT.match(query))
+
+	def _get_writer(self) -> object:
+		return get_writer(
+			self._path,
+			self._open,
+			batch_size=self._options.get("group_commit_size", DEFAULT_GROUP_COMMIT_SIZE),
+			delay=self._options.get("group_commit_delay", 0),
+		)
 
 	def connect(self):
+		if self.in_atomic():
+			return
 		if getattr(self, '_executor', None):
+			self.flush_instrument()
 			self._executor.close()
-		self._executor = sqlite3.connect(self._path)
+			self._set_open(False)
+		self._executor = self._open()
+		self._set_open(True)
+
+	def pragma_report(self) -> dict:
+		connection = self._open()
+		try:
+			return dict((pragma, connection.execute(PRAGMA_VALUE.format(pragma)).fetchone()[0]) for pragma in REPORTED_PRAGMAS)
+		finally:
+			connection.close()
 	
 	@connect_only
 	def close(self):
-		self._executor.close()
+		self.flush_instrument()
+		if not self.in_atomic():
+			self._executor.close()
+			self._set_open(False)
 
 	@connect_only
 	def commit(self) -> int:
@@ -29,18 +127,67 @@ class SQLiteExecutor(BaseExecutor):
 	def rollback(self):
 		self._executor.rollback()
 
+	@connect_only
+	def interrupt(self):
+		self._executor.interrupt()
+
+	def fetchall(self, cursor: sqlite3.Cursor) -> list:
+		try:
+			return super().fetchall(cursor)
+		except sqlite3.Error as err:
+			self._check_timeout(err)
+			raise err
+
+	def fetchmany(self, cursor: sqlite3.Cursor, size: int) -> list:
+		try:
+			return super().fetchmany(cursor, size)
+		except sqlite3.Error as err:
+			self._check_timeout(err)
+			raise err
+
+	@connect_only
+	def explain(self, query: str, params: tuple=()) -> list:
+		try:
+			return self._executor.execute(EXPLAIN.format(query), params).fetchall()
+		except self._executor.Error:
+			return None
+
 	def _prepare_query(self, query: str) -> str:
 		return "BEGIN;\n" + query
 
-	@connect_only
-	def __call__(self, query: str, *, script=False) -> sqlite3.Cursor:
-		if not query:
-			return
+	def _execute(self, query: str, params: tuple, script: bool) -> sqlite3.Cursor:
+		self.flush_instrument()
 		try:
-			cur = self._executor.executescript(self._prepare_query(query)) if script else self._executor.execute(query)
-			self.commit()
+			start = time.perf_counter()
+			if self._use_writer(query, script):
+				cur = self._get_writer().submit(query, params, self._deadline)
+			else:
+				cur = self._executor.executescript(self._prepare_query(query)) if script else self._executor.execute(query, params)
+			if isinstance(cur, sqlite3.Cursor) and cur.description is not None:
+				self.instrument_rows(cur, query, params, time.perf_counter() - start)
+			else:
+				self.instrument(query, params, time.perf_counter() - start, cur.rowcount, script=script)
+			self.track_writes(query)
+			if not self.in_atomic():
+				self.commit()
 			return cur
-		except self._executor.Error as err:
-			if script:
+		except sqlite3.Error as err:
+			if not self.in_atomic():
 				self.rollback()
-			raise err
\ No newline at end of file
+			raise err
+
+	@connect_only
+	def __call__(self, query: str, params: tuple=(), *, script=False, timeout: float=None) -> sqlite3.Cursor:
+		if not query:
+			return
+		self._deadline = self.get_deadline(timeout)
+		attempt = 0
+		while True:
+			try:
+				return self._execute(query, params, script)
+			except sqlite3.Error as err:
+				if not self._should_retry(err, attempt):
+					self._check_timeout(err)
+					raise err
+			self._backoff(attempt)
+			attempt += 1
\ No newline at end of file
@@ -10,42 +10,66 @@ class SQLitePrimaryKeySchema(PrimaryKeySchema, MySQLFieldSchema):
 		self.data_type = "INTEGER"
 
 class SQLiteTableSchemaEngine(TableSchemaEngine):
-	def __init__(self, schema: SchemaEngine, table: str, fields: Tuple[FieldSchema]):
-		super().__init__(schema, table, fields)
+	def __init__(self, schema: SchemaEngine, table: str, fields: Tuple[FieldSchema], indexes: Tuple[IndexSchema]=()):
+		super().__init__(schema, table, fields, indexes)
 		self._state = dict((f.name, f) for f in self._fields)
 
 	def __operators__(self):
 		self._operators['drop'] = SQLiteDropOperator(self)
 		self._operators['add'] = SQliteAddOperator(self)
+		self._operators['alter'] = SQLiteChangeOperator(self)
 		self._operators['add_fk'] = SQliteAddForeignKeyOperator(self)
 		self._operators['rename_to'] = SQliteRenameOperator(self)
+		self._operators['rebuild'] = SQLiteRebuildOperator(self)
 	
 	@operator_delegating_metod
 	def alter(self, field: FieldSchema):
-		self.drop(self._state[field.name])
-		self.add(field)
+		current = self._state.get(field.name, None)
+		if current == field:
+			return
+		if isinstance(field, ManyToManySchema) or isinstance(current, ManyToManySchema):
+			self.drop(current)
+			self.add(field)
+			return
+		self._operators['alter'].set(field)
 
 	@property
 	def fields(self) -> Tuple[FieldSchema]:
 		return self._fields
 
+	@property
+	def indexes(self) -> Tuple[IndexSchema]:
+		return self._indexes
+
 	def get_schema(self) -> SchemaEngine:
 		return self._schema.__class__()
+
+	def is_online(self) -> bool:
+		return self._schema.is_online()
+
+	def add_rebuild(self, rebuild: object):
+		self._schema.add_rebuild(rebuild)
 	
 	def get_table_name(self) -> str:
 		return self._table
 
+	def get_indexes(self) -> Tuple[IndexSchema]:
+		return tuple(index for index in self._indexes if all(field in self._state for field in index.fields))
+
 	def get_state(self) -> dict:
 		return self._state
 	
 	def to_str(self) -> str:
 		separator = "\n"
-		applied_operators = []
-		for operator in self._operators.values():
-			if operator:
-				operator.mutate_disposer_state()
-				applied_operators.append(operator.to_str())
-		return separator.join(applied_operators)
+		rebuild = self._operators['rebuild']
+		operators = tuple(operator for operator in self._operators.values() if operator and operator is not rebuild)
+		if any(operator.requires_rebuild() for operator in operators):
+			rebuild.set()
+		for operator in operators:
+			operator.mutate_disposer_state()
+		if rebuild:
+			return rebuild.to_str()
+		return separator.join(operator.to_str() for operator in operators)
 
 class SQLiteSchemaEngine(SchemaEngine):
 	field_schema = MySQLFieldSchema
@@ -57,8 +81,10 @@ class SQLiteSchemaEngine(SchemaEngine):
 		self._operators['delete_table'] = SQliteDeleteTableOperation()
 		self._operators['create_table'] = CreateTableOperator()
 		self._operators['alter_table'] = ChangeTableOperator()
+		self._operators['drop_index'] = SQLiteDropIndexOperator()
+		self._operators['create_index'] = SQLiteCreateIndexOperator()
 
-	def alter_table(self, table: str, fields: Tuple[FieldSchema]) -> SQLiteTableSchemaEngine:
-		table_schema_engine = SQLiteTableSchemaEngine(self, table, fields)
+	def alter_table(self, table: str, fields: Tuple[FieldSchema], indexes: Tuple[IndexSchema]=()) -> SQLiteTableSchemaEngine:
+		table_schema_engine = SQLiteTableSchemaEngine(self, table, fields, indexes)
 		self._operators['alter_table'].set(table_schema_engine)
 		return table_schema_engine
\ No newline at end of file
@@ -0,0 +1,78 @@
+import time, logging
+from typing import Callable, Tuple
+from pafmvc.conf import settings
+
+logger = logging.getLogger("pafmvc.orm.migrations")
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCH_PAUSE = 0.05
+
+def log_progress(table: str, copied: int, total: int):
+	logger.info("rebuilding %s: %d/%d rows copied", table, copied, total)
+
+class OnlineRebuild:
+	KEY = "id"
+	COUNT = "SELECT COUNT(*) FROM {};"
+	LAST = "SELECT IFNULL(MAX({key}), 0) FROM {table};"
+	COPY = "INSERT INTO {backup} ({fields}) SELECT {fields} FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?;"
+	CATCH_UP = "INSERT INTO {backup} ({fields}) SELECT {fields} FROM {table} WHERE {key} > (SELECT IFNULL(MAX({key}), 0) FROM {backup});"
+	SYNC_INSERT = (
+		"CREATE TRIGGER IF NOT EXISTS {backup}_sync_insert AFTER INSERT ON {table} "
+		"WHEN NEW.{key} <= (SELECT IFNULL(MAX({key}), 0) FROM {backup}) BEGIN "
+		"INSERT INTO {backup} ({fields}) SELECT {fields} FROM {table} WHERE {key} = NEW.{key}; "
+		"END;"
+	)
+	SYNC_DELETE = (
+		"CREATE TRIGGER IF NOT EXISTS {backup}_sync_delete AFTER DELETE ON {table} BEGIN "
+		"DELETE FROM {backup} WHERE {key} = OLD.{key}; "
+		"END;"
+	)
+	SYNC_UPDATE = (
+		"CREATE TRIGGER IF NOT EXISTS {backup}_sync_update AFTER UPDATE ON {table} "
+		"WHEN EXISTS (SELECT 1 FROM {backup} WHERE {key} = OLD.{key}) BEGIN "
+		"DELETE FROM {backup} WHERE {key} = OLD.{key}; "
+		"INSERT INTO {backup} ({fields}) SELECT {fields} FROM {table} WHERE {key} = NEW.{key}; "
+		"END;"
+	)
+
+	def __init__(self, table: str, backup_table: str, fields: Tuple[str], swap: str):
+		self._table = table
+		self._backup_table = backup_table
+		self._fields = tuple(fields)
+		self._swap = swap
+
+	def _format(self, cmd: str) -> str:
+		return cmd.format(table=self._table, backup=self._backup_table, fields=",".join(self._fields), key=self.KEY)
+
+	def _fetch_value(self, executor: object, query: str) -> any:
+		return executor.fetchall(executor(query))[0][0]
+
+	def prepare(self) -> str:
+		separator = "\n"
+		return separator.join((self._format(self.SYNC_INSERT), self._format(self.SYNC_DELETE), self._format(self.SYNC_UPDATE)))
+
+	def get_swap(self, finish: str="") -> str:
+		separator = "\n"
+		return self._format(self.CATCH_UP) + separator + self._swap + (finish and separator + finish)
+
+	def run(self, executor: object, *, batch_size: int=None, pause: float=None, progress: Callable=None, finish: str=""):
+		batch_size = batch_size or getattr(settings, "DB_MIGRATION_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+		pause = getattr(settings, "DB_MIGRATION_BATCH_PAUSE", DEFAULT_BATCH_PAUSE) if pause is None else pause
+		progress = progress or log_progress
+		executor.connect()
+		try:
+			total = self._fetch_value(executor, self.COUNT.format(self._table))
+			copied = self._fetch_value(executor, self.COUNT.format(self._backup_table))
+			last = self._fetch_value(executor, self.LAST.format(key=self.KEY, table=self._backup_table))
+			progress(self._table, copied, total)
+			while True:
+				rowcount = executor(self._format(self.COPY), (last, batch_size)).rowcount
+				if rowcount <= 0:
+					break
+				copied += rowcount
+				last = self._fetch_value(executor, self.LAST.format(key=self.KEY, table=self._backup_table))
+				progress(self._table, copied, total)
+				time.sleep(pause)
+			executor(self.get_swap(finish), script=True)
+		finally:
+			executor.close()
@@ -1,7 +1,12 @@
 from abc import abstractmethod
+from sqlite3 import sqlite_version_info
 from pafmvc.orm.db.operator import Operator
 from pafmvc.orm.db.entries import DataEngine
-from pafmvc.orm.db.schema import FieldSchema
+from pafmvc.orm.db.schema import FieldSchema, ForeignKeySchema, PrimaryKeySchema, ManyToManySchema
+from pafmvc.orm.db.backends.mysql.schema.operators import CreateIndexOperator
+from .online import OnlineRebuild
+
+NATIVE_DROP_COLUMN_VERSION = (3, 35, 0)
 
 class SQliteDeleteTableOperation(Operator):
 	CMD = "DROP TABLE {};"
@@ -24,6 +29,9 @@ class SQLiteAlterTableOperator(Operator):
 	def mutate_disposer_state(self):
 		raise NotImplementedError()
 
+	def requires_rebuild(self) -> bool:
+		return False
+
 class SQliteAddOperator(SQLiteAlterTableOperator):
 	CMD = "ALTER TABLE {table} ADD {column};"
 
@@ -55,6 +63,8 @@ class SQliteAddOperator(SQLiteAlterTableOperator):
 		return bool(self._cols)
 
 class SQLiteDropOperator(SQLiteAlterTableOperator):
+	CMD = "ALTER TABLE {table} DROP COLUMN {column};"
+
 	def __init__(self, disposer: object):
 		self._disposer = disposer
 		self._cols = []
@@ -70,41 +80,92 @@ class SQLiteDropOperator(SQLiteAlterTableOperator):
 			except KeyError: 
 				raise Exception("unable to drop nonexistent column")
 
+	def requires_rebuild(self) -> bool:
+		if sqlite_version_info < NATIVE_DROP_COLUMN_VERSION:
+			return True
+		state = self._disposer.get_state()
+		indexed = set(field for index in self._disposer.indexes for field in index.fields)
+		for field in self._cols:
+			if field in indexed or isinstance(state.get(field, None), (PrimaryKeySchema, ForeignKeySchema)):
+				return True
+		return False
+
+	def _drop_single_field(self, field: str) -> str:
+		return self.CMD.format(
+			table = self._disposer.get_table_name(),
+			column = field,
+		)
+
+	def to_str(self) -> str:
+		separator = "\n"
+		return separator.join(self._drop_single_field(field) for field in self._cols)
+
+	def __bool__(self) -> bool:
+		return bool(self._cols)
+
+class SQLiteChangeOperator(SQliteAddOperator):
+	def mutate_disposer_state(self):
+		state = self._disposer.get_state()
+		for field in self._cols:
+			if state.get(field.name, None) is None:
+				raise Exception("unable to change nonexistent column")
+			state[field.name] = field
+
+	def requires_rebuild(self) -> bool:
+		return True
+
+class SQliteAddForeignKeyOperator(SQliteAddOperator):
+	def mutate_disposer_state(self):
+		state = self._disposer.get_state()
+		for field in self._cols:
+			state[field.name] = field
+
+	def requires_rebuild(self) -> bool:
+		return True
+
+class SQLiteRebuildOperator(Operator):
+	def __init__(self, disposer: object):
+		self._disposer = disposer
+		self._rebuild = False
+
+	def set(self, rebuild: bool=True):
+		self._rebuild = rebuild
+
 	def to_str(self) -> str:
 		disposer = self._disposer
 
 		table_name = disposer.get_table_name()
 		backup_table_name = table_name + "_backup"
 
-		backup_fields = disposer.get_state()
+		previous_fields = set(field.name for field in disposer.fields if not isinstance(field, ManyToManySchema))
+		backup_fields = tuple(field for field in disposer.get_state().values() if not isinstance(field, ManyToManySchema))
+		copied_fields = tuple(field.name for field in backup_fields if field.name in previous_fields)
 
 		separator = "\n"
+		online = disposer.is_online() and OnlineRebuild.KEY in copied_fields
 
 		schema = disposer.get_schema()
-		query = schema.create_table(backup_table_name, backup_fields.values()).to_str() + separator
+		query = schema.create_table(backup_table_name, backup_fields, if_not_exists=online).to_str() + separator
+		copy_query = DataEngine().insert(backup_table_name).insert_from(table_name, copied_fields).to_str() + separator
 		schema = disposer.get_schema()
-		query += DataEngine().insert(backup_table_name).insert_from(table_name, tuple(backup_fields.keys())).to_str() + separator
-		query += schema.delete_table(table_name, disposer.fields).to_str() + separator
+		swap_query = schema.delete_table(table_name).to_str() + separator
 		schema = disposer.get_schema()
-		query += schema.alter_table(backup_table_name, backup_fields.values()).rename_to(table_name).to_str()
-
-		return query
+		swap_query += schema.alter_table(backup_table_name, backup_fields).rename_to(table_name).to_str()
+		schema = disposer.get_schema()
+		for index in disposer.get_indexes():
+			schema.create_index(table_name, index)
+		index_query = schema.to_str()
+		if index_query:
+			swap_query += separator + index_query
+
+		if online:
+			rebuild = OnlineRebuild(table_name, backup_table_name, copied_fields, swap_query)
+			disposer.add_rebuild(rebuild)
+			return query + rebuild.prepare()
+		return query + copy_query + swap_query
 
 	def __bool__(self) -> bool:
-		return bool(self._cols)
-
-class SQliteAddForeignKeyOperator(SQLiteDropOperator):
-	def __init__(self, disposer: object):
-		self._disposer = disposer
-		self._cols = []
-
-	def set(self, field: FieldSchema):
-		self._cols.append(field)
-
-	def mutate_disposer_state(self):
-		state = self._disposer.get_state()
-		for field in self._cols:
-			state[field.name] = field
+		return self._rebuild
 	
 class SQliteRenameOperator(SQLiteAlterTableOperator):
 	CMD = "ALTER TABLE {} RENAME TO {};"
@@ -123,4 +184,10 @@ class SQliteRenameOperator(SQLiteAlterTableOperator):
 		return self.CMD.format(self._disposer.get_table_name(), self._name)
 
 	def __bool__(self) -> bool:
-		return bool(self._name)
\ No newline at end of file
+		return bool(self._name)
+
+class SQLiteCreateIndexOperator(CreateIndexOperator):
+	CMD = "CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({fields});"
+
+class SQLiteDropIndexOperator(CreateIndexOperator):
+	CMD = "DROP INDEX IF EXISTS {name};"
@@ -0,0 +1,120 @@
+import sqlite3, threading, queue, time
+from typing import Callable
+from concurrent.futures import Future
+
+BEGIN = "BEGIN IMMEDIATE"
+COMMIT = "COMMIT"
+ROLLBACK = "ROLLBACK"
+SAVEPOINT = "SAVEPOINT pafmvc_write"
+RELEASE = "RELEASE pafmvc_write"
+ROLLBACK_TO = "ROLLBACK TO pafmvc_write"
+PROGRESS_STEPS = 1000
+
+class WriteResult:
+	def __init__(self, cursor: sqlite3.Cursor):
+		self.lastrowid = cursor.lastrowid
+		self.rowcount = cursor.rowcount
+		self.description = cursor.description
+		self._rows = cursor.fetchall() if cursor.description else []
+
+	def fetchone(self) -> tuple:
+		return self._rows.pop(0) if self._rows else None
+
+	def fetchall(self) -> list:
+		rows, self._rows = self._rows, []
+		return rows
+
+	def __iter__(self):
+		return iter(self.fetchall())
+
+class SQLiteWriter:
+	def __init__(self, open_connection: Callable, *, batch_size: int, delay: float):
+		self._open_connection = open_connection
+		self._batch_size = batch_size
+		self._delay = delay
+		self._deadline = None
+		self._queue = queue.Queue()
+		self._thread = threading.Thread(target=self._run, name="pafmvc-sqlite-writer", daemon=True)
+		self._thread.start()
+
+	def submit(self, query: str, params: tuple=(), deadline: float=None) -> WriteResult:
+		future = Future()
+		self._queue.put((query, params, deadline, future))
+		return future.result()
+
+	def _is_expired(self) -> int:
+		return int(self._deadline is not None and time.monotonic() > self._deadline)
+
+	def _open(self) -> sqlite3.Connection:
+		connection = self._open_connection()
+		connection.isolation_level = None
+		connection.set_progress_handler(self._is_expired, PROGRESS_STEPS)
+		return connection
+
+	def _get_batch(self) -> list:
+		batch = [self._queue.get()]
+		if self._delay:
+			time.sleep(self._delay)
+		while len(batch) < self._batch_size:
+			try:
+				batch.append(self._queue.get_nowait())
+			except queue.Empty:
+				break
+		return batch
+
+	def _execute(self, connection: sqlite3.Connection, query: str, params: tuple, deadline: float) -> WriteResult:
+		self._deadline = deadline
+		connection.execute(SAVEPOINT)
+		try:
+			result = WriteResult(connection.execute(query, params))
+		except sqlite3.Error:
+			self._deadline = None
+			connection.execute(ROLLBACK_TO)
+			connection.execute(RELEASE)
+			raise
+		self._deadline = None
+		connection.execute(RELEASE)
+		return result
+
+	def _commit_group(self, connection: sqlite3.Connection, batch: list):
+		results = []
+		try:
+			connection.execute(BEGIN)
+			for query, params, deadline, future in batch:
+				try:
+					results.append((future, self._execute(connection, query, params, deadline)))
+				except sqlite3.Error as err:
+					future.set_exception(err)
+			connection.execute(COMMIT)
+		except Exception as err:
+			if connection.in_transaction:
+				connection.execute(ROLLBACK)
+			for *_, future in batch:
+				if not future.done():
+					future.set_exception(err)
+			return
+		for future, result in results:
+			future.set_result(result)
+
+	def _run(self):
+		connection = None
+		while True:
+			batch = self._get_batch()
+			try:
+				connection = connection or self._open()
+			except Exception as err:
+				for *_, future in batch:
+					future.set_exception(err)
+				continue
+			self._commit_group(connection, batch)
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+def get_writer(path: str, open_connection: Callable, *, batch_size: int, delay: float) -> SQLiteWriter:
+	with _writers_lock:
+		writer = _writers.get(path, None)
+		if writer is None:
+			writer = SQLiteWriter(open_connection, batch_size=batch_size, delay=delay)
+			_writers[path] = writer
+		return writer
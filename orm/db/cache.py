@@ -0,0 +1,75 @@
+import re, time, threading
+from typing import Iterable, Tuple
+from collections import OrderedDict
+from pafmvc.conf import settings
+
+DEFAULT_CACHE_SIZE = 1024
+WRITTEN_TABLE = re.compile(r"(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|DROP\s+TABLE|ALTER\s+TABLE)\s+(\w+)", re.IGNORECASE)
+
+def get_written_tables(query: str) -> Tuple[str]:
+	return tuple(set(WRITTEN_TABLE.findall(query)))
+
+class QueryCache:
+	def __init__(self, maxsize: int):
+		self._maxsize = maxsize
+		self._entries = OrderedDict()
+		self._tables = {}
+		self._lock = threading.Lock()
+		self._generations = {}
+		self.active = False
+		self.hits = 0
+		self.misses = 0
+
+	def _discard(self, key: tuple):
+		tables, _, _ = self._entries.pop(key)
+		for table in tables:
+			keys = self._tables.get(table, None)
+			if keys is not None:
+				keys.discard(key)
+
+	def get(self, key: tuple) -> Tuple[bool, any]:
+		with self._lock:
+			entry = self._entries.get(key, None)
+			if entry is not None and entry[1] > time.monotonic():
+				self._entries.move_to_end(key)
+				self.hits += 1
+				return True, entry[2]
+			if entry is not None:
+				self._discard(key)
+			self.misses += 1
+			return False, None
+
+	def get_generation(self, tables: Iterable[str]) -> tuple:
+		self.active = True
+		return tuple(self._generations.get(table, 0) for table in tables)
+
+	def set(self, key: tuple, tables: Iterable[str], value: any, ttl: float, generation: tuple=None):
+		tables = tuple(tables)
+		with self._lock:
+			if generation is not None and self.get_generation(tables) != generation:
+				return
+			if key in self._entries:
+				self._discard(key)
+			self._entries[key] = (tables, time.monotonic() + ttl, value)
+			for table in tables:
+				self._tables.setdefault(table, set()).add(key)
+			while len(self._entries) > self._maxsize:
+				self._discard(next(iter(self._entries)))
+
+	def invalidate(self, *tables):
+		with self._lock:
+			for table in tables:
+				self._generations[table] = self._generations.get(table, 0) + 1
+				for key in tuple(self._tables.pop(table, ())):
+					if key in self._entries:
+						self._discard(key)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self._tables.clear()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+query_cache = QueryCache(getattr(settings, "QUERYSET_CACHE_SIZE", DEFAULT_CACHE_SIZE))
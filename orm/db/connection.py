@@ -1,6 +1,65 @@
+import logging, threading
 from importlib import import_module
 from pafmvc.conf import settings
 
-def connect(path="", db_path="") -> object:
-	executor = getattr(import_module(path or settings.DB_EDITOR_PATH), settings.DB_EDITOR)
-	return executor(db_path or settings.DB_PATH)
\ No newline at end of file
+logger = logging.getLogger("pafmvc.orm.db")
+
+DEFAULT_DB_ALIAS = "default"
+
+def get_databases() -> dict:
+	databases = getattr(settings, "DATABASES", None)
+	if databases is None:
+		return {
+			DEFAULT_DB_ALIAS: {
+				"EDITOR_PATH": settings.DB_EDITOR_PATH,
+				"EDITOR": settings.DB_EDITOR,
+				"PATH": settings.DB_PATH,
+				"OPTIONS": getattr(settings, "DB_OPTIONS", {}),
+			}
+		}
+	return databases
+
+def connect(path="", db_path="", alias=DEFAULT_DB_ALIAS) -> object:
+	database = get_databases().get(alias, None)
+	if database is None:
+		raise Exception(f"{alias} database isn't configured")
+	executor = getattr(import_module(path or database["EDITOR_PATH"]), database["EDITOR"])
+	return executor(db_path or database["PATH"], database.get("OPTIONS", {}))
+
+class ConnectionHandler:
+	def __init__(self):
+		self._local = threading.local()
+		self._reported = set()
+		self._lock = threading.Lock()
+
+	def _get_executors(self) -> dict:
+		executors = getattr(self._local, "executors", None)
+		if executors is None:
+			executors = {}
+			self._local.executors = executors
+		return executors
+
+	def __getitem__(self, alias: str) -> object:
+		executors = self._get_executors()
+		executor = executors.get(alias, None)
+		if executor is None:
+			executor = connect(alias=alias)
+			executors[alias] = executor
+			self._report(alias, executor)
+		return executor
+
+	def _report(self, alias: str, executor: object):
+		if not logger.isEnabledFor(logging.INFO):
+			return
+		with self._lock:
+			if alias in self._reported:
+				return
+			self._reported.add(alias)
+		report = executor.pragma_report()
+		if report:
+			logger.info("%s database settings: %s", alias, ", ".join(f"{pragma}={value}" for pragma, value in report.items()))
+
+	def __iter__(self):
+		return iter(get_databases())
+
+connections = ConnectionHandler()
@@ -15,22 +15,32 @@ class DataOperatorRegistry(OperatorRegistry):
 class Inserter(DataOperatorRegistry):
 	@operator_delegating_metod
 	def insert_from(self, table: str, fields: Tuple[str]=()):
+		self._operators['insert'].set(self._table, fields)
 		self._operators['from'].set(table, fields)
 
 	@operator_delegating_metod
 	def insert(self, field: str, value: any):
 		self._operators['values'].set(field, value)
 
+	@operator_delegating_metod
+	def insert_row(self, row: dict):
+		self._operators['values'].add_row(row)
+
+	@operator_delegating_metod
+	def on_conflict(self, conflict: Tuple[str], update: Tuple[str]=()):
+		self._operators['conflict'].set(conflict, update)
+
 	def __operators__(self):
 		self._operators['insert'] = InsertIntoOperator()
 		self._operators['insert'].set(self._table)
 		self._operators['from'] = SelectOperator()
 		self._operators['values'] = InsertValuesOperator()
+		self._operators['conflict'] = OnConflictOperator()
 
 class Remover(DataOperatorRegistry):
 	@operator_delegating_metod
-	def where(self, *args, **params):
-		self._operators['where'].set(params)
+	def where(self, *conditions, **params):
+		self._operators['where'].set(params, *conditions)
 
 	def __operators__(self):
 		self._operators['delete'] = DeleteFromOperator()
@@ -43,8 +53,8 @@ class Updater(DataOperatorRegistry):
 		self._operators['set'].set(col, value)
 
 	@operator_delegating_metod
-	def where(self, *args, **params):
-		self._operators['where'].set(params)
+	def where(self, *conditions, **params):
+		self._operators['where'].set(params, *conditions)
 
 	def __operators__(self):
 		self._operators['update'] = UpdateOperator()
@@ -53,11 +63,15 @@ class Updater(DataOperatorRegistry):
 		self._operators['where'] = WhereOperator()
 
 class DataEngine:
+	inserter = Inserter
+	remover = Remover
+	updater = Updater
+
 	def insert(self, table: str) -> Inserter:
-		return Inserter(table)
+		return self.inserter(table)
 
 	def remove(self, table: str) -> Remover:
-		return Remover(table)
+		return self.remover(table)
 
 	def update(self, table: str) -> Updater:
-		return Updater(table)
\ No newline at end of file
+		return self.updater(table)
\ No newline at end of file
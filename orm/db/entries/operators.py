@@ -1,40 +1,85 @@
-from typing import Union
 from pafmvc.orm.db.operator import Operator
 
 class InsertIntoOperator(Operator):
 	CMD = "INSERT INTO {}"
+	FIELDS = " ({})"
 
 	def __init__(self):
 		self._table = None
+		self._fields = ()
 
-	def set(self, table: str):
+	def set(self, table: str, fields: tuple=()):
 		self._table = table
+		self._fields = tuple(fields)
 
 	def to_str(self) -> str:
-		return self.CMD.format(self._table)
+		query = self.CMD.format(self._table)
+		if self._fields:
+			query += self.FIELDS.format(",".join(self._fields))
+		return query
 
 	def __bool__(self) -> bool:
 		return bool(self._table)
 
 class InsertValuesOperator(Operator):
-	CMD = "({fields}) VALUES ({values})"
-	VALUE = "\"{}\""
+	CMD = "({fields}) VALUES {rows}"
+	ROW = "({})"
 
 	def __init__(self):
 		self._values = {}
+		self._rows = []
 
 	def set(self, field: str, value: any):
 		self._values[field] = value
 
+	def add_row(self, row: dict):
+		self._rows.append(dict(row))
+
+	def get_rows(self) -> list:
+		return ([self._values] if self._values else []) + self._rows
+
+	def get_fields(self) -> tuple:
+		rows = self.get_rows()
+		return tuple(rows[0]) if rows else ()
+
 	def to_str(self) -> str:
 		separator = ","
+		fields = self.get_fields()
+		row = self.ROW.format(separator.join(self.PLACEHOLDER for _ in fields))
 		return self.CMD.format(
-			fields=separator.join(self._values.keys()), 
-			values=separator.join(map(lambda val: self.VALUE.format(val) if not isinstance(val, int) else val, self._values.values()))
+			fields=separator.join(fields), 
+			rows=separator.join(row for _ in self.get_rows())
 		)
 
+	def get_params(self) -> tuple:
+		fields = self.get_fields()
+		return tuple(row.get(field, None) for row in self.get_rows() for field in fields)
+
+	def __bool__(self) -> bool:
+		return bool(self._values or self._rows)
+
+class OnConflictOperator(Operator):
+	CMD = "ON CONFLICT({conflict}) DO UPDATE SET {columns}"
+	NOTHING = "ON CONFLICT({conflict}) DO NOTHING"
+	COLUMN = "{0}=excluded.{0}"
+
+	def __init__(self):
+		self._conflict = ()
+		self._update = ()
+
+	def set(self, conflict: tuple, update: tuple=()):
+		self._conflict = tuple(conflict)
+		self._update = tuple(update)
+
+	def to_str(self) -> str:
+		separator = ","
+		conflict = separator.join(self._conflict)
+		if not self._update:
+			return self.NOTHING.format(conflict=conflict)
+		return self.CMD.format(conflict=conflict, columns=separator.join(self.COLUMN.format(col) for col in self._update))
+
 	def __bool__(self) -> bool:
-		return bool(self._values)
+		return bool(self._conflict)
 
 class DeleteFromOperator(InsertIntoOperator):
 	CMD = "DELETE FROM {}"
@@ -45,11 +90,7 @@ class UpdateOperator(InsertIntoOperator):
 class SetOperator(InsertValuesOperator):
 	CMD = "SET {}"
 	COLUMN = "{}={}"
-	VALUE = "\"{}\""
-
-	def _prepare_value(self, val: any) -> Union[str, int]:
-		return self.VALUE.format(val) if not isinstance(val, int) else val
 
 	def to_str(self) -> str:
 		separator = ","
-		return self.CMD.format(separator.join(self.COLUMN.format(col, self._prepare_value(val)) for col, val in self._values.items()))
\ No newline at end of file
+		return self.CMD.format(separator.join(self.COLUMN.format(col, self.PLACEHOLDER) for col in self._values))
\ No newline at end of file
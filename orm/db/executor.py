@@ -1,15 +1,136 @@
+import time, threading
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from pafmvc.conf import settings
+from . import instrumentation
+from .cache import query_cache, get_written_tables
 from .schema import SchemaEngine
 from .query import Query
 from .entries import DataEngine
 
+_deadline = ContextVar("pafmvc_query_deadline", default=None)
+_open_connections = {"count": 0}
+_open_connections_lock = threading.Lock()
+
+def get_open_connections() -> int:
+	return _open_connections["count"]
+
+class QueryTimeout(Exception):
+	pass
+
+class query_timeout:
+	def __init__(self, seconds: float=None):
+		self._seconds = seconds
+		self._token = None
+
+	def __enter__(self) -> object:
+		deadline = _deadline.get()
+		if self._seconds is not None:
+			new_deadline = time.monotonic() + self._seconds
+			deadline = new_deadline if deadline is None else min(deadline, new_deadline)
+		self._token = _deadline.set(deadline)
+		return self
+
+	def __exit__(self, exc_type, exc, traceback):
+		_deadline.reset(self._token)
+
 class BaseExecutor(ABC):
 	schema_engine = SchemaEngine
 	query = Query
 	data_engine = DataEngine
+	integrity_error = Exception
 
-	def __init__(self, path: str):
+	def __init__(self, path: str, options: dict=None):
 		self._path = path
+		self._options = options or {}
+		self._atomic_depth = 0
+		self._written_tables = set()
+		self._deadline = None
+		self._is_open = False
+		self._pending_record = None
+
+	def _set_open(self, is_open: bool):
+		if is_open == self._is_open:
+			return
+		self._is_open = is_open
+		with _open_connections_lock:
+			_open_connections["count"] += 1 if is_open else -1
+
+	def in_atomic(self) -> bool:
+		return bool(self._atomic_depth)
+
+	def begin(self):
+		if not self.in_atomic():
+			self.connect()
+		self._atomic_depth += 1
+
+	def end(self, commit=True):
+		self._atomic_depth -= 1
+		if self.in_atomic():
+			return
+		try:
+			self.commit() if commit else self.rollback()
+		finally:
+			self.close()
+			query_cache.invalidate(*self._written_tables)
+			self._written_tables.clear()
+
+	def track_writes(self, query: str):
+		if not query_cache.active:
+			return
+		tables = get_written_tables(query)
+		query_cache.invalidate(*tables)
+		if self.in_atomic():
+			self._written_tables.update(tables)
+
+	def get_timeout(self) -> float:
+		return self._options.get("timeout", getattr(settings, "DB_QUERY_TIMEOUT", None))
+
+	def get_deadline(self, timeout: float=None) -> float:
+		timeout = self.get_timeout() if timeout is None else timeout
+		deadlines = tuple(deadline for deadline in (_deadline.get(), timeout and time.monotonic() + timeout) if deadline)
+		return min(deadlines) if deadlines else None
+
+	def _fetch(self, cursor: object, size: int=None) -> list:
+		pending = self._pending_record
+		if pending is None or pending[0] is not cursor:
+			return cursor.fetchall() if size is None else cursor.fetchmany(size)
+		start = time.perf_counter()
+		rows = ()
+		try:
+			rows = cursor.fetchall() if size is None else cursor.fetchmany(size)
+			return rows
+		finally:
+			pending[3] += time.perf_counter() - start
+			pending[4] += len(rows)
+			if size is None or len(rows) < size:
+				self.flush_instrument()
+
+	def fetchall(self, cursor: object) -> list:
+		return self._fetch(cursor)
+
+	def fetchmany(self, cursor: object, size: int) -> list:
+		return self._fetch(cursor, size)
+
+	def explain(self, query: str, params: tuple=()) -> list:
+		return None
+
+	def pragma_report(self) -> dict:
+		return {}
+
+	def instrument(self, query: str, params: tuple, duration: float, rowcount: int, *, script=False):
+		if instrumentation.is_enabled():
+			instrumentation.record(self, query, params, duration, rowcount, script=script)
+
+	def instrument_rows(self, cursor: object, query: str, params: tuple, duration: float):
+		if instrumentation.is_enabled():
+			self._pending_record = [cursor, query, params, duration, 0]
+
+	def flush_instrument(self):
+		pending, self._pending_record = self._pending_record, None
+		if pending is not None:
+			_, query, params, duration, rowcount = pending
+			instrumentation.record(self, query, params, duration, rowcount)
 
 	@abstractmethod
 	def connect(self):
@@ -28,5 +149,5 @@ class BaseExecutor(ABC):
 		raise NotImplementedError()
 	
 	@abstractmethod
-	def __call__(self, query: str, *args, script=False):
+	def __call__(self, query: str, params: tuple=(), *, script=False, timeout: float=None):
 		raise NotImplementedError()
\ No newline at end of file
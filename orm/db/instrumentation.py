@@ -0,0 +1,95 @@
+import os, sys, logging
+from typing import Callable, List
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pafmvc.conf import settings
+
+logger = logging.getLogger("pafmvc.orm.db")
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FULL_SCAN = "SCAN "
+INDEX_USAGE = " USING "
+CONSTANT_ROW = "CONSTANT ROW"
+
+@dataclass
+class QueryRecord:
+	sql: str
+	params: tuple
+	duration: float
+	rowcount: int
+	caller: str
+	plan: list = field(default=None)
+	full_scans: list = field(default_factory=list)
+
+class QueryLog:
+	def __init__(self):
+		self.records = []
+
+	@property
+	def count(self) -> int:
+		return len(self.records)
+
+	@property
+	def duration(self) -> float:
+		return sum(record.duration for record in self.records)
+
+	def add(self, record: QueryRecord):
+		self.records.append(record)
+
+_hooks = []
+_logs = ContextVar("query_logs", default=())
+
+def add_hook(hook: Callable[[QueryRecord], None]):
+	_hooks.append(hook)
+
+def remove_hook(hook: Callable[[QueryRecord], None]):
+	_hooks.remove(hook)
+
+class capture_queries:
+	def __init__(self):
+		self.log = QueryLog()
+		self._token = None
+
+	def __enter__(self) -> QueryLog:
+		self._token = _logs.set(_logs.get() + (self.log,))
+		return self.log
+
+	def __exit__(self, exc_type, exc, traceback):
+		_logs.reset(self._token)
+
+def get_slow_query_threshold() -> float:
+	return getattr(settings, "DB_SLOW_QUERY_THRESHOLD", None)
+
+def is_enabled() -> bool:
+	return bool(_hooks or _logs.get() or getattr(settings, "DB_QUERY_LOG", False) or get_slow_query_threshold() is not None)
+
+def get_caller() -> str:
+	frame = sys._getframe(1)
+	while frame is not None and frame.f_code.co_filename.startswith(PACKAGE_DIR):
+		frame = frame.f_back
+	if frame is None:
+		return ""
+	return f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+def get_full_scans(plan: List[tuple]) -> List[str]:
+	details = (row[-1] for row in plan)
+	return list(detail for detail in details if detail.startswith(FULL_SCAN) and INDEX_USAGE not in detail and CONSTANT_ROW not in detail)
+
+def record(executor: object, sql: str, params: tuple, duration: float, rowcount: int, *, script=False) -> QueryRecord:
+	query_record = QueryRecord(sql, tuple(params), duration, rowcount, get_caller())
+
+	threshold = get_slow_query_threshold()
+	if threshold is not None and duration >= threshold:
+		if not script:
+			query_record.plan = executor.explain(sql, params)
+			query_record.full_scans = get_full_scans(query_record.plan or ())
+		full_scans = "; ".join(query_record.full_scans)
+		logger.warning("slow query (%.3fs) at %s: %s %r%s", duration, query_record.caller, sql, query_record.params, full_scans and " full table scan: " + full_scans)
+	elif getattr(settings, "DB_QUERY_LOG", False):
+		logger.debug("(%.3fs) %s %r", duration, sql, query_record.params)
+
+	for log in _logs.get():
+		log.add(query_record)
+	for hook in _hooks:
+		hook(query_record)
+	return query_record
@@ -8,6 +8,8 @@ def operator_delegating_metod(func):
 	return wrapper
 
 class Operator(ABC):
+	PLACEHOLDER = "?"
+
 	@abstractmethod
 	def set(self, *params):
 		raise NotImplementedError()
@@ -16,6 +18,9 @@ class Operator(ABC):
 	def to_str(self) -> str:
 		raise NotImplementedError()
 
+	def get_params(self) -> tuple:
+		return ()
+
 	def __bool__(self) -> bool:
 		return False
 
@@ -30,4 +35,7 @@ class OperatorRegistry(ABC):
 
 	def to_str(self) -> str:
 		separator = "\n"
-		return separator.join(operator.to_str() for operator in self._operators.values() if operator)
\ No newline at end of file
+		return separator.join(operator.to_str() for operator in self._operators.values() if operator)
+
+	def get_params(self) -> tuple:
+		return tuple(param for operator in self._operators.values() if operator for param in operator.get_params())
\ No newline at end of file
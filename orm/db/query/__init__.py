@@ -1,6 +1,8 @@
+import copy
 from typing import Tuple
 from pafmvc.orm.db.operator import OperatorRegistry, operator_delegating_metod
 from .operators import *
+from .expressions import Q
 
 class Query(OperatorRegistry):
 	def __init__(self, table: str, *args, fields: Tuple[str] = None):
@@ -8,15 +10,50 @@ class Query(OperatorRegistry):
 			fields = []
 		self._table = table
 		self._fields = fields
+		self._aliases = set()
 		super().__init__()
 
+	def _qualify(self, field: str) -> str:
+		if "." in field or "(" in field or field in self._aliases:
+			return field
+		return self._table + "." + field
+
+	@operator_delegating_metod
+	def filter(self, *conditions, **params):
+		self._operators['where'].set(params, *conditions)
+
+	@operator_delegating_metod
+	def set_fields(self, fields: Tuple[str], aliases: dict=None):
+		aliases = aliases or {}
+		self._aliases.update(aliases.keys())
+		self._operators['select'].set(self._table, tuple(self._qualify(field) for field in fields) + tuple(aliases.values()))
+
+	@operator_delegating_metod
+	def group_by(self, fields: Tuple[str]):
+		self._operators['group_by'].set(tuple(self._qualify(field) for field in fields))
+
 	@operator_delegating_metod
-	def filter(self, *args, **params):
-		self._operators['where'].set(params)
+	def having(self, *conditions, **params):
+		self._operators['having'].set(params, *conditions)
 
 	@operator_delegating_metod
 	def order_by(self, field: str):
-		self._operators['order_by'].set(field)
+		if field.startswith('-'):
+			return self._operators['order_by'].set('-' + self._qualify(field[1:]))
+		self._operators['order_by'].set(self._qualify(field))
+
+	@operator_delegating_metod
+	def join(self, table: str, alias: str, column: str, fields: Tuple[str]):
+		self._operators['select'].join(table, alias, column, fields)
+
+	def is_grouped(self) -> bool:
+		return bool(self._operators['group_by'])
+
+	def clone(self) -> object:
+		return copy.deepcopy(self)
+
+	def get_tables(self) -> Tuple[str]:
+		return self._operators['select'].get_tables()
 
 	@operator_delegating_metod
 	def set_limit(self, limit: int):
@@ -25,7 +62,9 @@ class Query(OperatorRegistry):
 	def __operators__(self):
 		self._operators['select'] = SelectOperator()
 		self._operators['select'].set(self._table, self._fields)
-		self._operators['where'] = WhereOperator()
+		self._operators['where'] = WhereOperator(self._qualify)
+		self._operators['group_by'] = GroupByOperator()
+		self._operators['having'] = HavingOperator()
 		self._operators['order_by'] = OrderOperator()
 		self._operators['limit'] = LimitOperator()
 	
@@ -0,0 +1,29 @@
+class Q:
+	AND = "AND"
+	OR = "OR"
+
+	def __init__(self, *conditions, **params):
+		self.children = list(conditions) + list(params.items())
+		self.connector = self.AND
+		self.negated = False
+
+	def _combine(self, other: object, connector: str) -> object:
+		if not isinstance(other, Q):
+			raise TypeError(f"unable to combine Q with {other.__class__.__name__}")
+		combined = Q(self, other)
+		combined.connector = connector
+		return combined
+
+	def __and__(self, other: object) -> object:
+		return self._combine(other, self.AND)
+
+	def __or__(self, other: object) -> object:
+		return self._combine(other, self.OR)
+
+	def __invert__(self) -> object:
+		inverted = Q(self)
+		inverted.negated = True
+		return inverted
+
+	def __bool__(self) -> bool:
+		return bool(self.children)
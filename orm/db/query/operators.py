@@ -1,44 +1,178 @@
 from typing import Tuple
 from pafmvc.orm.db.operator import Operator
+from .expressions import Q
 
 class SelectOperator(Operator):
 	CMD = "SELECT {fields} FROM {table}"
+	JOIN = "LEFT JOIN {table} AS {alias} ON {alias}.id={source}.{column}"
+	JOINED_FIELD = "{alias}.{field} AS {alias}__{field}"
+	QUALIFIED_FIELD = "{table}.{field}"
 	default = "*"
 
 	def __init__(self):
 		self._table = None
 		self._fields = ()
+		self._joins = []
 
 	def set(self, table: str, fields: Tuple[str]=[]):
 		self._table = table
 		self._fields = fields or tuple(self.default)
 
+	def join(self, table: str, alias: str, column: str, fields: Tuple[str]):
+		self._joins.append((table, alias, column, tuple(fields)))
+
+	def get_tables(self) -> Tuple[str]:
+		return (self._table, *(table for table, _, _, _ in self._joins))
+
+	def _qualify(self, field: str) -> str:
+		if "." in field or "(" in field:
+			return field
+		return self.QUALIFIED_FIELD.format(table=self._table, field=field)
+
+	def _prepare_fields(self) -> Tuple[str]:
+		if not self._joins:
+			return self._fields
+		fields = [self._qualify(field) for field in self._fields]
+		for _, alias, _, joined_fields in self._joins:
+			fields.extend(self.JOINED_FIELD.format(alias=alias, field=field) for field in joined_fields)
+		return fields
+
+	def _prepare_joins(self) -> str:
+		return "".join(" " + self.JOIN.format(table=table, alias=alias, source=self._table, column=column) for table, alias, column, _ in self._joins)
+
 	def to_str(self) -> str:
 		separator = ","
 		return self.CMD.format(
-			fields = separator.join(self._fields),
+			fields = separator.join(self._prepare_fields()),
 			table = self._table
-		) 
+		) + self._prepare_joins()
 
 	def __bool__(self) -> bool:
 		return bool(self._table)
 
+LOOKUP_SEPARATOR = "__"
+
 class WhereOperator(Operator):
 	CMD = "WHERE {}"
-	PARAM = "{}=\"{}\""
 	AND = " AND "
+	NOT = "NOT {}"
+	NOT_NULL = "{} IS NOT NULL"
+	GROUP = "({})"
+	EMPTY = "1=1"
+	NOTHING = "1=0"
+	LIKE_ESCAPE = "\\"
+	LOOKUPS = {
+		"exact": "{} = {}",
+		"ne": "{} <> {}",
+		"gt": "{} > {}",
+		"gte": "{} >= {}",
+		"lt": "{} < {}",
+		"lte": "{} <= {}",
+		"in": "{} IN ({})",
+		"range": "{} BETWEEN {} AND {}",
+		"isnull": "{} IS NULL",
+		"startswith": "{} LIKE {} ESCAPE '\\'",
+		"endswith": "{} LIKE {} ESCAPE '\\'",
+		"contains": "{} LIKE {} ESCAPE '\\'",
+	}
+	LIKE_PATTERNS = {
+		"startswith": "{}%",
+		"endswith": "%{}",
+		"contains": "%{}%",
+	}
+
+	def __init__(self, resolve=None):
+		self._conditions = []
+		self._resolve = resolve or (lambda field: field)
+
+	def set(self, params: dict, *conditions):
+		self._conditions.extend(condition for condition in conditions if condition)
+		self._conditions.extend(params.items())
+
+	@classmethod
+	def split_lookup(cls, key: str) -> Tuple[str]:
+		field, separator, lookup = key.rpartition(LOOKUP_SEPARATOR)
+		if separator and lookup in cls.LOOKUPS:
+			return field, lookup
+		return key, "exact"
+
+	def _escape_like(self, value: str) -> str:
+		for char in (self.LIKE_ESCAPE, "%", "_"):
+			value = value.replace(char, self.LIKE_ESCAPE + char)
+		return value
+
+	def _compile_lookup(self, key: str, value: any) -> Tuple[str, tuple]:
+		separator = ","
+		field, lookup = self.split_lookup(key)
+		field = self._resolve(field)
+		template = self.LOOKUPS[lookup]
+		if lookup == "exact" and value is None:
+			return self.LOOKUPS["isnull"].format(field), ()
+		if lookup == "isnull":
+			return (template if value else self.NOT_NULL).format(field), ()
+		if lookup == "in":
+			values = tuple(value)
+			if not values:
+				return self.NOTHING, ()
+			return template.format(field, separator.join(self.PLACEHOLDER for _ in values)), values
+		if lookup == "range":
+			low, high = value
+			return template.format(field, self.PLACEHOLDER, self.PLACEHOLDER), (low, high)
+		if lookup in self.LIKE_PATTERNS:
+			return template.format(field, self.PLACEHOLDER), (self.LIKE_PATTERNS[lookup].format(self._escape_like(str(value))),)
+		if isinstance(value, (list, tuple, set)):
+			return self._compile_lookup(field + LOOKUP_SEPARATOR + "in", value)
+		return template.format(field, self.PLACEHOLDER), (value,)
+
+	def _compile(self, condition: any) -> Tuple[str, tuple]:
+		if not isinstance(condition, Q):
+			return self._compile_lookup(*condition)
+		connector = " " + condition.connector + " "
+		parts, params = [], []
+		for child in condition.children:
+			sql, child_params = self._compile(child)
+			parts.append(sql)
+			params.extend(child_params)
+		sql = self.GROUP.format(connector.join(parts)) if parts else self.EMPTY
+		if condition.negated:
+			sql = self.NOT.format(sql)
+		return sql, tuple(params)
+
+	def _compile_all(self) -> Tuple[str, tuple]:
+		parts, params = [], []
+		for condition in self._conditions:
+			sql, condition_params = self._compile(condition)
+			parts.append(sql)
+			params.extend(condition_params)
+		return self.AND.join(parts), tuple(params)
+
+	def to_str(self) -> str:
+		return self.CMD.format(self._compile_all()[0])
+
+	def get_params(self) -> tuple:
+		return self._compile_all()[1]
+
+	def __bool__(self) -> bool:
+		return bool(self._conditions)
+
+class GroupByOperator(Operator):
+	CMD = "GROUP BY {}"
 
 	def __init__(self):
-		self._params = []
+		self._fields = []
 
-	def set(self, params: dict):
-		self._params.extend(params.items())
+	def set(self, fields: Tuple[str]):
+		self._fields.extend(field for field in fields if field not in self._fields)
 
 	def to_str(self) -> str:
-		return self.CMD.format(self.AND.join((self.PARAM.format(key, value) for key, value in self._params)))
+		separator = ","
+		return self.CMD.format(separator.join(self._fields))
 
 	def __bool__(self) -> bool:
-		return bool(len(self._params))
+		return bool(self._fields)
+
+class HavingOperator(WhereOperator):
+	CMD = "HAVING {}"
 
 class OrderOperator(Operator):
 	CMD = "ORDER BY {field} {ordering}"
@@ -0,0 +1,31 @@
+import random
+from importlib import import_module
+from pafmvc.conf import settings
+from .connection import DEFAULT_DB_ALIAS, get_databases
+
+DEFAULT_ROUTER = "pafmvc.orm.db.router.PrimaryReplicaRouter"
+
+class BaseRouter:
+	def db_for_read(self, model: type) -> str:
+		return DEFAULT_DB_ALIAS
+
+	def db_for_write(self, model: type) -> str:
+		return DEFAULT_DB_ALIAS
+
+class PrimaryReplicaRouter(BaseRouter):
+	def __init__(self):
+		self._replicas = [alias for alias, database in get_databases().items() if database.get("REPLICA", False)]
+
+	def db_for_read(self, model: type) -> str:
+		if not self._replicas:
+			return DEFAULT_DB_ALIAS
+		return random.choice(self._replicas)
+
+_router = None
+
+def get_router() -> BaseRouter:
+	global _router
+	if _router is None:
+		module, _, cls = getattr(settings, "DB_ROUTER", DEFAULT_ROUTER).rpartition(".")
+		_router = getattr(import_module(module), cls)()
+	return _router
@@ -29,11 +29,18 @@ class PrimaryKeySchema(FieldSchema):
 class ManyToManySchema(FieldSchema):
 	references: str
 
+@dataclass
+class IndexSchema:
+	name: str
+	fields: Tuple[str]
+	unique: bool = False
+
 class TableSchemaEngine(OperatorRegistry):
-	def __init__(self, schema: OperatorRegistry, table: str, fields: Tuple[FieldSchema]):
+	def __init__(self, schema: OperatorRegistry, table: str, fields: Tuple[FieldSchema], indexes: Tuple[IndexSchema]=()):
 		self._schema = schema
 		self._table = table
 		self._fields = tuple(fields)
+		self._indexes = tuple(indexes)
 		super().__init__()
 
 	def __operators__(self):
@@ -66,6 +73,8 @@ class TableSchemaEngine(OperatorRegistry):
 		for f in self._fields:
 			if f.name == field.name and isinstance(f, ManyToManySchema):
 				return self.drop_m2m(f)
+			if f == field:
+				return
 		self._operators['alter'].set(field)
 
 	@operator_delegating_metod
@@ -101,10 +110,17 @@ class SchemaEngine(OperatorRegistry):
 	primary_key_schema = PrimaryKeySchema
 	many_to_many_schema = ManyToManySchema
 
+	def __init__(self, *, online: bool=False):
+		self._online = online
+		self._rebuilds = []
+		super().__init__()
+
 	def __operators__(self):
 		self._operators['delete_table'] = Operator()
 		self._operators['create_table'] = Operator()
 		self._operators['alter_table'] = Operator()
+		self._operators['drop_index'] = Operator()
+		self._operators['create_index'] = Operator()
 
 	@operator_delegating_metod
 	def create_table(self, table: str, fields: Tuple[FieldSchema], **kwargs) -> str:
@@ -127,11 +143,28 @@ class SchemaEngine(OperatorRegistry):
 				alter_schema.drop_m2m(field)
 		self._operators['delete_table'].set(table)
 
-	def alter_table(self, table: str, fields: Tuple[FieldSchema]) -> TableSchemaEngine:
-		table_schema_engine = TableSchemaEngine(self, table, fields)
+	def alter_table(self, table: str, fields: Tuple[FieldSchema], indexes: Tuple[IndexSchema]=()) -> TableSchemaEngine:
+		table_schema_engine = TableSchemaEngine(self, table, fields, indexes)
 		self._operators['alter_table'].set(table_schema_engine)
 		return table_schema_engine
 
+	@operator_delegating_metod
+	def create_index(self, table: str, index: IndexSchema):
+		self._operators['create_index'].set(table, index)
+
+	@operator_delegating_metod
+	def drop_index(self, table: str, index: IndexSchema):
+		self._operators['drop_index'].set(table, index)
+
+	def is_online(self) -> bool:
+		return self._online
+
+	def add_rebuild(self, rebuild: object):
+		self._rebuilds.append(rebuild)
+
+	def get_rebuilds(self) -> Tuple[object]:
+		return tuple(self._rebuilds)
+
 	def get_field(self, field: str, data_type: str, *data) -> FieldSchema:
 		references = search(r'FK\((.+?)\)', data_type)
 		if references:
@@ -0,0 +1,35 @@
+from pafmvc.orm.db import aio
+from pafmvc.orm.db.connection import connections, DEFAULT_DB_ALIAS
+
+class atomic:
+	def __init__(self, using: str=DEFAULT_DB_ALIAS):
+		self._alias = using
+		self._token = None
+
+	def _begin(self):
+		connections[self._alias].begin()
+
+	def _end(self, commit: bool):
+		connections[self._alias].end(commit)
+
+	def __enter__(self) -> object:
+		self._begin()
+		return self
+
+	def __exit__(self, exc_type, exc, traceback):
+		self._end(exc_type is None)
+
+	async def __aenter__(self) -> object:
+		self._token = aio.pin()
+		try:
+			await aio.run(self._begin)
+		except BaseException:
+			aio.unpin(self._token)
+			raise
+		return self
+
+	async def __aexit__(self, exc_type, exc, traceback):
+		try:
+			await aio.run(self._end, exc_type is None)
+		finally:
+			aio.unpin(self._token)
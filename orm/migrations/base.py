@@ -1,12 +1,18 @@
-import os, yaml
-from typing import Iterable, List
-from .state import State
+import os, json, yaml, hashlib
+from typing import Iterable, List, Tuple, Callable
+from .state import State, get_entry_hash
 from .migration import Migration
 from pafmvc.apps.app import App
 from pafmvc.orm.db.executor import BaseExecutor
 from .operations import *
 
 MIGRATION_FOLDER_NAME = "migrations"
+MIGRATION_POSTFIX = ".yaml"
+SNAPSHOT_FILE_NAME = "state.snapshot"
+SNAPSHOT_VERSION = 3
+
+Loader = getattr(yaml, "CLoader", yaml.Loader)
+Dumper = getattr(yaml, "CDumper", yaml.Dumper)
 
 class MigrationFileManager:
 	def __init__(self, app: App):
@@ -15,32 +21,86 @@ class MigrationFileManager:
 			os.mkdir(path)
 		self._folder = path
 
-	def _get_sorted_file_list(self) -> Iterable[str]:
-		return sorted(os.listdir(self._folder), key=lambda f: int(f.rpartition(".")[0]))
+	def _get_index(self, filename: str) -> int:
+		return int(filename.rpartition(".")[0])
+
+	def _get_sorted_file_list(self) -> List[str]:
+		files = (f for f in os.listdir(self._folder) if f.endswith(MIGRATION_POSTFIX) and f.rpartition(".")[0].isdigit())
+		return sorted(files, key=self._get_index)
 
-	def _get_previous_migration_files(self) -> Iterable[str]:
-		return map(lambda filename: os.path.join(self._folder, filename), self._get_sorted_file_list())
+	def _get_previous_migration_files(self, start: int=0, end: int=None) -> Iterable[str]:
+		files = (f for f in self._get_sorted_file_list() if self._get_index(f) > start and (end is None or self._get_index(f) <= end))
+		return map(lambda filename: os.path.join(self._folder, filename), files)
 
-	def _get_previous_migrations(self) -> List[Migration]:
+	def _get_previous_migrations(self, start: int=0, end: int=None) -> List[Migration]:
 		migrations = []
-		for file in self._get_previous_migration_files():
+		for file in self._get_previous_migration_files(start, end):
 			with open(file) as f:
 				file_inner = f.read()
 				if file_inner:
-					migrations.append(Migration.from_entry(yaml.load(file_inner, Loader=yaml.Loader)))
+					migrations.append(Migration.from_entry(yaml.load(file_inner, Loader=Loader)))
 		return migrations
 
+	def get_last_index(self) -> int:
+		files = self._get_sorted_file_list()
+		return self._get_index(files[-1]) if files else 0
+
+	def _get_files_digest(self, last_index: int) -> str:
+		digest = hashlib.sha256()
+		for filename in self._get_sorted_file_list():
+			if self._get_index(filename) > last_index:
+				break
+			with open(os.path.join(self._folder, filename), "rb") as migration_file:
+				digest.update(f"{filename}:{hashlib.sha256(migration_file.read()).hexdigest()};".encode("utf-8"))
+		return digest.hexdigest()
+
+	def load_snapshot(self) -> Tuple[int, State]:
+		try:
+			with open(os.path.join(self._folder, SNAPSHOT_FILE_NAME)) as f:
+				snapshot = json.load(f)
+			if snapshot.get("version") != SNAPSHOT_VERSION or get_entry_hash(snapshot["state"]) != snapshot.get("checksum"):
+				return None
+			if self._get_files_digest(snapshot["migration"]) != snapshot.get("files"):
+				return None
+			return snapshot["migration"], State.from_entry(snapshot["state"])
+		except (OSError, ValueError, KeyError, TypeError, AttributeError):
+			return None
+
+	def save_snapshot(self, state: State):
+		last_index = self.get_last_index()
+		snapshot = {
+			"version": SNAPSHOT_VERSION,
+			"migration": last_index,
+			"files": self._get_files_digest(last_index),
+			"checksum": state.get_hash(),
+			"state": state.deconstruct(),
+		}
+		path = os.path.join(self._folder, SNAPSHOT_FILE_NAME)
+		with open(path + ".tmp", 'w') as snapshot_file:
+			json.dump(snapshot, snapshot_file)
+		os.replace(path + ".tmp", path)
+
+	def _write(self, index: int, migration: Migration):
+		migration_path = os.path.join(self._folder, str(index) + MIGRATION_POSTFIX)
+		with open(migration_path, 'w+') as migration_file:
+			migration_file.write(yaml.dump(migration.deconstruct(), Dumper=Dumper))
+
 	def commit(self, migration: Migration):
 		if migration:
-			postfix = ".yaml"
-			index_pointer = 1
-			try:
-				index_pointer = int(self._get_sorted_file_list()[-1].rpartition(".")[0]) + 1
-			except IndexError:
-				pass
-			migration_path = os.path.join(self._folder, str(index_pointer) + postfix)
-			with open(migration_path, 'w+') as migration_file:
-				migration_file.write(yaml.dump(migration.deconstruct(), Dumper=yaml.Dumper))
+			self._write(self.get_last_index() + 1, migration)
+
+	def replace(self, start: int, end: int, migration: Migration):
+		index_pointer = start + 1 if migration else start
+		for filename in self._get_sorted_file_list():
+			index = self._get_index(filename)
+			path = os.path.join(self._folder, filename)
+			if start <= index <= end:
+				os.remove(path)
+			elif index > end:
+				os.rename(path, os.path.join(self._folder, str(index_pointer) + MIGRATION_POSTFIX))
+				index_pointer += 1
+		if migration:
+			self._write(start, migration)
 
 class MigrationEngine:
 	def __init__(self, app: App):
@@ -51,7 +111,20 @@ class MigrationEngine:
 		return State(app=self._app)
 
 	def _migrate_state(self) -> State:
-		return State(migrations=self.file_manager._get_previous_migrations())
+		snapshot = self.file_manager.load_snapshot()
+		if snapshot is None:
+			return State(migrations=self.file_manager._get_previous_migrations())
+		last_index, state = snapshot
+		for migration in self.file_manager._get_previous_migrations(last_index):
+			migration.apply_to_state(state)
+		return state
+
+	def _is_unchanged(self, state: State) -> bool:
+		snapshot = self.file_manager.load_snapshot()
+		if snapshot is None:
+			return False
+		last_index, snapshot_state = snapshot
+		return last_index == self.file_manager.get_last_index() and snapshot_state.get_hash() == state.get_hash()
 
 	def _field_compare(self, get_operation, field: str, from_field: FieldState, to_field: FieldState):
 		if from_field != to_field:
@@ -67,7 +140,7 @@ class MigrationEngine:
 		def get_alter_table_operation() -> AlterTableOperation:
 			nonlocal alter_operation, migration
 			if alter_operation is None:
-				alter_operation = migration.add_change_table_operation(table, from_fields)
+				alter_operation = migration.add_change_table_operation(table, from_fields, indexes=from_meta.indexes)
 			return alter_operation
 
 		for field, field_meta in to_fields.items():
@@ -81,6 +154,15 @@ class MigrationEngine:
 			get_alter_table_operation().add_delete_field_suboperation(field, field_meta)
 		return migration
 
+	def _index_compare(self, migration: Migration, table: str, from_indexes: dict, to_indexes: dict) -> Migration:
+		for index, index_meta in from_indexes.items():
+			if to_indexes.get(index, None) != index_meta:
+				migration.add_drop_index_operation(table, index, index_meta)
+		for index, index_meta in to_indexes.items():
+			if from_indexes.get(index, None) != index_meta:
+				migration.add_create_index_operation(table, index, index_meta)
+		return migration
+
 	def _base_compare(self, migration: Migration, from_state: dict, to_state: dict) -> Migration:
 		old_state_copy = from_state.copy()
 		for table, meta in to_state.items():
@@ -88,21 +170,49 @@ class MigrationEngine:
 				del old_state_copy[table]
 			except KeyError:
 				migration.add_create_table_operation(table, meta.fields)
+				self._index_compare(migration, table, {}, meta.indexes)
 			else:
 				old_meta = from_state[table]
 				self._deep_compare(migration, table, old_meta, meta)
+				self._index_compare(migration, table, old_meta.indexes, meta.indexes)
 		for table, meta in old_state_copy.items():
 			migration.add_delete_table_operation(table, meta.fields)
 		return migration
 
+	def squash(self, start: int=1, end: int=None) -> Migration:
+		end = end or self.file_manager.get_last_index()
+		if start >= end:
+			raise Exception(f"nothing to squash between {start} and {end}")
+		from_state = State(migrations=self.file_manager._get_previous_migrations(0, start - 1))
+		to_state = State(migrations=self.file_manager._get_previous_migrations(0, end))
+		full_state = State(migrations=self.file_manager._get_previous_migrations())
+		squashed = self._base_compare(Migration(), from_state.models, to_state.models)
+
+		state = State(migrations=self.file_manager._get_previous_migrations(0, start - 1))
+		squashed.apply_to_state(state)
+		if state.get_hash() != to_state.get_hash():
+			raise Exception(f"squashed migration {start}-{end} does not reproduce the original state")
+		for migration in self.file_manager._get_previous_migrations(end):
+			migration.apply_to_state(state)
+		if state.get_hash() != full_state.get_hash():
+			raise Exception(f"migrations after {end} do not apply on top of the squashed migration")
+
+		self.file_manager.replace(start, end, squashed)
+		self.file_manager.save_snapshot(full_state)
+		return squashed
+
 	def get_changes(self) -> Migration:
-		prev_state = self._migrate_state()
 		state = self._build_state()
+		if self._is_unchanged(state):
+			return Migration()
+		prev_state = self._migrate_state()
 
 		return self._base_compare(Migration(), prev_state.models, state.models)
 		
-	def migrate(self, executor: BaseExecutor):
+	def migrate(self, executor: BaseExecutor, *, online: bool=False, progress: Callable=None):
 		new_migraton = self.get_changes()
-		new_migraton.apply(executor)
+		new_migraton.apply(executor, online=online, progress=progress)
 
-		self.file_manager.commit(new_migraton)
\ No newline at end of file
+		self.file_manager.commit(new_migraton)
+		if new_migraton or self.file_manager.load_snapshot() is None:
+			self.file_manager.save_snapshot(self._migrate_state())
\ No newline at end of file
@@ -1,13 +1,22 @@
-from typing import List
+import hashlib
+from typing import List, Callable
 from pafmvc.orm.migrations.operations.base import Operation
 from pafmvc.orm.migrations import operations
+from pafmvc.orm.migrations.state import IndexState
 
 #Преставляет собой одну миграцию. Содержит информацию обо все примененных в ней операциях
 OPERATION_CLS = {
 	"CREATE_TABLE": operations.CreateTableOperation,
 	"DELETE_TABLE": operations.DeleteTableOperation,
 	"CHANGE_TABLE": operations.AlterTableOperation,
+	"DROP_INDEX": operations.DropIndexOperation,
+	"CREATE_INDEX": operations.CreateIndexOperation,
 }
+INDEX_OPERATIONS = ("DROP_INDEX", "CREATE_INDEX")
+PROGRESS_TABLE = "CREATE TABLE IF NOT EXISTS pafmvc_migration_progress (step VARCHAR(64) PRIMARY KEY);"
+PROGRESS_STEPS = "SELECT step FROM pafmvc_migration_progress;"
+PROGRESS_MARK = "INSERT INTO pafmvc_migration_progress (step) VALUES ('{}');"
+PROGRESS_CLEAR = "DELETE FROM pafmvc_migration_progress;"
 
 class Migration:
 	def __init__(self):
@@ -45,7 +54,15 @@ class Migration:
 
 	def add_change_table_operation(self, table: str, fields: dict, **data) -> Operation:
 		cls = OPERATION_CLS["CHANGE_TABLE"]
-		return self._add_operation("CHANGE_TABLE", cls(table, fields))
+		return self._add_operation("CHANGE_TABLE", cls(table, fields, data.get("indexes", None)))
+
+	def add_create_index_operation(self, table: str, index: str, state: IndexState) -> Operation:
+		cls = OPERATION_CLS["CREATE_INDEX"]
+		return self._add_operation("CREATE_INDEX", cls(table, name=index, fields=state.fields, unique=state.unique))
+
+	def add_drop_index_operation(self, table: str, index: str, state: IndexState) -> Operation:
+		cls = OPERATION_CLS["DROP_INDEX"]
+		return self._add_operation("DROP_INDEX", cls(table, name=index, fields=state.fields, unique=state.unique))
 
 	def deconstruct(self) -> dict:
 		deconstructed_migration = {}
@@ -55,18 +72,58 @@ class Migration:
 				deconstructed_migration[operation_type] = operations_list
 		return deconstructed_migration
 
-	def apply(self, executor: object):
+	def _execute(self, executor: object, schema: object):
+		executor.connect()
+		executor(schema.to_str(), script=True)
+		executor.close()
+
+	def apply(self, executor: object, *, online: bool=False, progress: Callable=None):
+		if online:
+			return self._apply_online(executor, progress)
 		schema = executor.schema_engine()
 		for operation_list in self._operations.values():
 			for operation in operation_list:
 				operation.apply(schema)
+		self._execute(executor, schema)
+
+	def _get_finished_steps(self, executor: object) -> set:
 		executor.connect()
-		executor(schema.to_str(), script=True)
+		try:
+			executor(PROGRESS_TABLE, script=True)
+			return set(row[0] for row in executor.fetchall(executor(PROGRESS_STEPS)))
+		finally:
+			executor.close()
+
+	def _apply_online(self, executor: object, progress: Callable=None):
+		finished = self._get_finished_steps(executor)
+		for operation_type in OPERATION_CLS:
+			for operation in self._operations.get(operation_type, ()):
+				schema = executor.schema_engine(online=operation_type not in INDEX_OPERATIONS)
+				operation.apply(schema)
+				query = schema.to_str()
+				step = hashlib.sha256(query.encode("utf-8")).hexdigest()
+				if not query or step in finished:
+					continue
+				mark = PROGRESS_MARK.format(step)
+				rebuilds = schema.get_rebuilds()
+				if not rebuilds:
+					executor.connect()
+					executor(query + "\n" + mark, script=True)
+					executor.close()
+					continue
+				executor.connect()
+				executor(query, script=True)
+				executor.close()
+				for rebuild in rebuilds[:-1]:
+					rebuild.run(executor, progress=progress)
+				rebuilds[-1].run(executor, progress=progress, finish=mark)
+		executor.connect()
+		executor(PROGRESS_CLEAR, script=True)
 		executor.close()
 
 	def apply_to_state(self, state: object):
-		for operation_list in self._operations.values():
-			for operation in operation_list:
+		for operation_type in OPERATION_CLS:
+			for operation in self._operations.get(operation_type, ()):
 				operation.apply_to_state(state)
 
 	def __bool__(self) -> bool:
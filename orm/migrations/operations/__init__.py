@@ -1,12 +1,13 @@
 from typing import List
 from pafmvc.orm.migrations.operations.base import Operation
-from pafmvc.orm.db.schema import SchemaEngine, TableSchemaEngine
-from ..state import FieldState, ModelState
+from pafmvc.orm.db.schema import SchemaEngine, TableSchemaEngine, IndexSchema
+from ..state import FieldState, ModelState, IndexState
 
 class BaseOperation(Operation):
-	def __init__(self, table: str, fields: dict=None, **meta):
+	def __init__(self, table: str, fields: dict=None, indexes: dict=None, **meta):
 		super().__init__(table, **meta)
 		self._fields = fields or {}
+		self._indexes = indexes or {}
 
 class CreateTableOperation(BaseOperation):
 	@classmethod
@@ -15,7 +16,7 @@ class CreateTableOperation(BaseOperation):
 		return cls(entry.pop('table'), fields, **entry)
 
 	def apply(self, schema: SchemaEngine):
-		fields = tuple(map(lambda e: schema.get_field(e[0], *e[1].deconstruct()), self._fields.items()))
+		fields = tuple(map(lambda e: schema.get_field(e[0], *e[1].get_column()), self._fields.items()))
 		schema.create_table(self._table, fields)
 
 	def apply_to_state(self, state: object):
@@ -31,7 +32,7 @@ class CreateTableOperation(BaseOperation):
 
 class DeleteTableOperation(BaseOperation):
 	def apply(self, schema: SchemaEngine):
-		fields =  tuple(map(lambda e: schema.get_field(e[0], *e[1].deconstruct()), self._fields.items()))
+		fields =  tuple(map(lambda e: schema.get_field(e[0], *e[1].get_column()), self._fields.items()))
 		schema.delete_table(self._table, fields)
 
 	def apply_to_state(self, state: object):
@@ -63,7 +64,7 @@ class CreateFieldSubOperation(SubOperation):
 		return cls(entry.pop("field"), FieldState(*entry.pop("data")), **entry)
 
 	def apply(self, schema: TableSchemaEngine):
-		field = schema.get_field(self._field, *self._data.deconstruct())
+		field = schema.get_field(self._field, *self._data.get_column())
 		schema.add(field)
 
 	def apply_to_state(self, state: object):
@@ -76,7 +77,7 @@ class CreateFieldSubOperation(SubOperation):
 
 class DeleteFieldSubOperation(SubOperation):
 	def apply(self, schema: TableSchemaEngine):
-		field = schema.get_field(self._field, *self._data.deconstruct())
+		field = schema.get_field(self._field, *self._data.get_column())
 		schema.drop(field)
 
 	def apply_to_state(self, state: object):
@@ -84,7 +85,7 @@ class DeleteFieldSubOperation(SubOperation):
 
 class ChangeFieldSubOperation(CreateFieldSubOperation):
 	def apply(self, schema: TableSchemaEngine):
-		field = schema.get_field(self._field, *self._data.deconstruct())
+		field = schema.get_field(self._field, *self._data.get_column())
 		schema.alter(field)
 
 SUBOPERATION_CLS = {
@@ -133,8 +134,9 @@ class AlterTableOperation(BaseOperation):
 		return self._add_suboperation("CHANGE_FIELD", cls(field, data, **kwargs))
 
 	def apply(self, schema: SchemaEngine):
-		fields =  tuple(map(lambda e: schema.get_field(e[0], *e[1].deconstruct()), self._fields.items()))
-		schema = schema.alter_table(self._table, fields)
+		fields =  tuple(map(lambda e: schema.get_field(e[0], *e[1].get_column()), self._fields.items()))
+		indexes = tuple(IndexSchema(name, tuple(index.fields), index.unique) for name, index in self._indexes.items())
+		schema = schema.alter_table(self._table, fields, indexes)
 		for suboperations in self._suboperations.values():
 			for suboperation in suboperations:
 				suboperation.apply(schema)
@@ -153,4 +155,24 @@ class AlterTableOperation(BaseOperation):
 		return data
 
 	def __bool__(self) -> bool:
-		return bool(self._suboperations)
\ No newline at end of file
+		return bool(self._suboperations)
+
+class CreateIndexOperation(Operation):
+	def __init__(self, table: str, *, name: str, fields: list, unique: bool=False, **meta):
+		super().__init__(table, name=name, fields=list(fields), unique=unique, **meta)
+
+	def get_index_schema(self) -> IndexSchema:
+		return IndexSchema(self._meta['name'], tuple(self._meta['fields']), self._meta['unique'])
+
+	def apply(self, schema: SchemaEngine):
+		schema.create_index(self._table, self.get_index_schema())
+
+	def apply_to_state(self, state: object):
+		state.models[self._table].set_index(self._meta['name'], IndexState(list(self._meta['fields']), self._meta['unique']))
+
+class DropIndexOperation(CreateIndexOperation):
+	def apply(self, schema: SchemaEngine):
+		schema.drop_index(self._table, self.get_index_schema())
+
+	def apply_to_state(self, state: object):
+		state.models[self._table].del_index(self._meta['name'])
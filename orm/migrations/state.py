@@ -1,22 +1,83 @@
-from dataclasses import dataclass, field, astuple
+import json, hashlib, decimal, datetime
+from dataclasses import dataclass, field, astuple, asdict
 from typing import Iterable
 from pafmvc.apps.app import App
 
-@dataclass	
+TYPE_KEY = "__type__"
+separator = "."
+DECODABLE_TYPES = dict((separator.join((cls.__module__, cls.__qualname__)), cls) for cls in (tuple, decimal.Decimal, datetime.date, datetime.datetime, datetime.time))
+
+def get_type_path(value: any) -> str:
+	return separator.join((type(value).__module__, type(value).__qualname__))
+
+def get_entry_hash(entry: any) -> str:
+	return hashlib.sha256(json.dumps(entry, sort_keys=True).encode("utf-8")).hexdigest()
+
+def encode_value(value: any) -> any:
+	if value is None or isinstance(value, (str, int, float, bool)):
+		return value
+	if isinstance(value, list):
+		return list(map(encode_value, value))
+	if isinstance(value, dict):
+		return dict((key, encode_value(item)) for key, item in value.items())
+	if type(value) is tuple:
+		return {TYPE_KEY: get_type_path(value), "args": [list(map(encode_value, value))]}
+	if get_type_path(value) not in DECODABLE_TYPES:
+		return str(value)
+	isoformat = getattr(value, "isoformat", None)
+	if isoformat is not None:
+		return {TYPE_KEY: get_type_path(value), "isoformat": isoformat()}
+	return {TYPE_KEY: get_type_path(value), "args": [str(value)]}
+
+def decode_value(value: any) -> any:
+	if isinstance(value, list):
+		return list(map(decode_value, value))
+	if not isinstance(value, dict):
+		return value
+	if TYPE_KEY not in value:
+		return dict((key, decode_value(item)) for key, item in value.items())
+	cls = DECODABLE_TYPES.get(value[TYPE_KEY], None)
+	if cls is None:
+		raise ValueError(f"{value[TYPE_KEY]} values can't be decoded")
+	if "isoformat" in value:
+		return cls.fromisoformat(value["isoformat"])
+	return cls(*decode_value(value["args"]))
+
+@dataclass
 class FieldState:
 	data_type: str
 	default: any = field(default=None)
 	null: bool = field(default=False)
+	db_index: bool = field(default=False)
+	unique: bool = field(default=False)
+
+	def __post_init__(self):
+		self.default = decode_value(self.default)
 
 	def deconstruct(self) -> list:
-		return list(astuple(self))
+		data = list(astuple(self))
+		data[1] = encode_value(self.default)
+		return data
+
+	def get_column(self) -> list:
+		return [self.data_type, self.default, self.null]
+
+@dataclass
+class IndexState:
+	fields: list
+	unique: bool = field(default=False)
+
+	def deconstruct(self) -> dict:
+		return asdict(self)
 
 @dataclass
 class ModelState:
 	fields: dict = field(init=False, default=None)
+	indexes: dict = field(init=False, default=None)
 
 	def __post_init__(self):
 		self.fields = {}
+		self.indexes = {}
 
 	def set_field(self, field: str, state: FieldState):
 		self.fields[field] = state
@@ -24,6 +85,27 @@ class ModelState:
 	def del_field(self, field: str):
 		del self.fields[field]
 
+	def set_index(self, index: str, state: IndexState):
+		self.indexes[index] = state
+
+	def del_index(self, index: str):
+		del self.indexes[index]
+
+	@classmethod
+	def from_entry(cls, entry: dict) -> object:
+		instance = cls()
+		for field_name, data in entry["fields"].items():
+			instance.set_field(field_name, FieldState(*data))
+		for index, data in entry["indexes"].items():
+			instance.set_index(index, IndexState(**data))
+		return instance
+
+	def deconstruct(self) -> dict:
+		return {
+			"fields": dict((field_name, state.deconstruct()) for field_name, state in self.fields.items()),
+			"indexes": dict((index, state.deconstruct()) for index, state in self.indexes.items()),
+		}
+
 class State:
 	def __init__(self, *, migrations: Iterable[object]=(), app: App=None):
 		self.models = {}
@@ -36,7 +118,22 @@ class State:
 				model_state = ModelState()
 				self.set_model(model.meta.name, model_state)
 				for field in model.meta.fields:
-					model_state.set_field(field.name, FieldState(field.data_type, field.default, field.null))
+					model_state.set_field(field.name, FieldState(field.data_type, field.default, field.null, field.db_index, field.unique))
+				for index in model.meta.get_indexes():
+					model_state.set_index(index.get_name(model.meta.name), IndexState(list(index.fields), index.unique))
+
+	@classmethod
+	def from_entry(cls, entry: dict) -> object:
+		instance = cls()
+		for model, data in entry.items():
+			instance.set_model(model, ModelState.from_entry(data))
+		return instance
+
+	def deconstruct(self) -> dict:
+		return dict((model, state.deconstruct()) for model, state in self.models.items())
+
+	def get_hash(self) -> str:
+		return get_entry_hash(self.deconstruct())
 
 	def set_model(self, model: str, state: ModelState):
 		self.models[model] = state
@@ -1,14 +1,31 @@
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Tuple, Iterable
 from inspect import getmembers
-from .fields import PrimaryKeyField
+from .fields import PrimaryKeyField, ManyToManyField
 from .manager import Manager
-from pafmvc.orm.model.fields.base import Field
+from .indexes import Index
+from pafmvc.orm.model.fields.base import Field, RELATED_CACHE
+from pafmvc.orm.db import aio
 
 @dataclass
 class ModelMeta:
 	name: str
 	fields: Tuple[Field]
+	indexes: Tuple[Index] = ()
+
+	@property
+	def columns(self) -> Tuple[Field]:
+		return tuple(field for field in self.fields if not isinstance(field, ManyToManyField))
+
+	def get_field(self, name: str) -> Field:
+		for field in self.fields:
+			if field.name == name:
+				return field
+		raise Exception(f"{self.name} has no field {name}")
+
+	def get_indexes(self) -> Tuple[Index]:
+		field_indexes = tuple(Index((field.name,), field.unique) for field in self.columns if field.db_index or field.unique)
+		return field_indexes + tuple(self.indexes)
 
 class ModelBase(type):
 	def __new__(mcs, name, parents, attributes) -> object:
@@ -17,35 +34,49 @@ class ModelBase(type):
 		setattr(new_cls, "manager", Manager(new_cls))
 
 		fields = tuple(map(lambda i: i[1], getmembers(new_cls, lambda m: isinstance(m, Field))))
-		setattr(new_cls, "meta", ModelMeta(name.lower(), fields))
+		setattr(new_cls, "meta", ModelMeta(name.lower(), fields, tuple(getattr(new_cls, "indexes", ()))))
 
 		return new_cls
 
 class Model(metaclass=ModelBase):
 	id = PrimaryKeyField()
+	indexes = ()
 
 	def __init__(self, **fields):
-		self._state = {}
+		self._dirty_fields = set()
 
-		for field in self.__class__.meta.fields:
-			val = fields.get(field.name, None)
-			if val is None and not field.null:
+		for field in self.__class__.meta.columns:
+			val = fields.get(field.name, field.default)
+			if val is None and not field.null and not field.autoincrement:
 				raise Exception(f"{field.name} field is reqired")
 			setattr(self, field.name, val)
-			self._state[field.name] = val
-
-	def save(self):
-		cols = {}
-		for field in self.__class__.meta.fields:
-			val = getattr(self, field.name)
-			if val != self._state[field.name]:
-				cols[field.name] = val
-		if cols:
-			self._state.update(cols)
-			self.__class__.manager.update(cols, id=self.id)
-	
-	def __operators__(self):
-		self.__dict__.update(self._state)
+		self._dirty_fields.clear()
+
+	def save(self, update_fields: Iterable[str]=None):
+		manager = self.__class__.manager
+		if self.id is None:
+			cols = dict((field.name, getattr(self, field.name)) for field in self.__class__.meta.columns if not field.autoincrement)
+			self.id = manager._insert(cols)
+			self._dirty_fields.clear()
+			return
+		fields = set(self._dirty_fields if update_fields is None else update_fields)
+		if fields:
+			manager.update(dict((field, getattr(self, field)) for field in fields), id=self.id)
+			self._dirty_fields.difference_update(fields)
+
+	def get_related(self, field: str) -> object:
+		cache = self.__dict__.setdefault(RELATED_CACHE, {})
+		if field not in cache:
+			related_id = getattr(self, field)
+			related_model = self.__class__.meta.get_field(field).get_related_model()
+			cache[field] = None if related_id is None else related_model.manager.load(related_id)
+		return cache[field]
 
 	def remove(self):
-		self.__class__.manager.remove(id=self.id)
\ No newline at end of file
+		self.__class__.manager.remove(id=self.id)
+
+	async def asave(self, update_fields: Iterable[str]=None):
+		await aio.run(self.save, update_fields)
+
+	async def aremove(self):
+		await aio.run(self.remove)
\ No newline at end of file
@@ -0,0 +1,37 @@
+class Aggregate:
+	function = None
+	template = "{function}({distinct}{field}) AS {alias}"
+
+	def __init__(self, field: str, *, distinct=False):
+		self.field = field
+		self.distinct = distinct
+		self.alias = None
+
+	def get_alias(self) -> str:
+		return self.alias or self.field.replace("*", "all") + "__" + self.function.lower()
+
+	def to_sql(self, table: str) -> str:
+		field = self.field
+		if field != "*" and "." not in field:
+			field = table + "." + field
+		return self.template.format(
+			function = self.function,
+			distinct = "DISTINCT " if self.distinct else "",
+			field = field,
+			alias = self.get_alias(),
+		)
+
+class Count(Aggregate):
+	function = "COUNT"
+
+class Sum(Aggregate):
+	function = "SUM"
+
+class Avg(Aggregate):
+	function = "AVG"
+
+class Min(Aggregate):
+	function = "MIN"
+
+class Max(Aggregate):
+	function = "MAX"
@@ -1,4 +1,6 @@
-from .base import Field, ReadOnlyFieldMixin
+from typing import Tuple
+from .base import Field, ReadOnlyFieldMixin, RELATED_CACHE
+from ..related import ManyToManyManager
 
 class TextField(Field):
 	data_type = "TEXT"
@@ -26,8 +28,16 @@ class ForeignKey(Field):
 		if not isinstance(model, object):
 			raise Exception("argument must be an Model class instance")
 		self._related_model = model.meta.name
+		self._related_model_cls = model
 		self.data_type = self.data_type.format(self._related_model)
 
+	def get_related_model(self) -> type:
+		return self._related_model_cls
+
+	def __set__(self, instance, value):
+		super().__set__(instance, value)
+		instance.__dict__.get(RELATED_CACHE, {}).pop(self.name, None)
+
 class PrimaryKeyField(ReadOnlyFieldMixin, Field):
 	data_type = "PK"
 	autoincrement = True
@@ -35,6 +45,16 @@ class PrimaryKeyField(ReadOnlyFieldMixin, Field):
 	def __init__(self):
 		self.default = None
 		self.null = False
+		self.db_index = False
+		self.unique = False
 
 class ManyToManyField(ReadOnlyFieldMixin, ForeignKey):
-	data_type = "M2M({})"
\ No newline at end of file
+	data_type = "M2M({})"
+
+	def get_join_table(self, table: str) -> Tuple[str]:
+		return (table + "_" + self._related_model, table + "_id", self._related_model + "_id")
+
+	def __get__(self, instance, owner):
+		if instance is None:
+			return self
+		return ManyToManyManager(instance, self)
\ No newline at end of file
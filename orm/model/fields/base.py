@@ -1,16 +1,23 @@
+DIRTY_FIELDS = "_dirty_fields"
+RELATED_CACHE = "_related_cache"
+
 class Field:
 	data_type = None
 	autoincrement = False
 
-	def __init__(self, *, default=None, null=False):
+	def __init__(self, *, default=None, null=False, db_index=False, unique=False):
 		self.default = default
 		self.null = not default and null
+		self.db_index = db_index
+		self.unique = unique
 	
 	@property
 	def meta(self) -> dict:
 		return {}
 
 	def __set__(self, instance, value):
+		if instance.__dict__.get(self.name, None) != value:
+			instance.__dict__.setdefault(DIRTY_FIELDS, set()).add(self.name)
 		instance.__dict__[self.name] = value
 
 	def __get__(self, instance, owner):
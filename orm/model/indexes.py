@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+@dataclass
+class Index:
+	fields: Tuple[str]
+	unique: bool = False
+	name: str = None
+
+	def get_name(self, table: str) -> str:
+		if self.name:
+			return self.name
+		postfix = "uniq" if self.unique else "idx"
+		return "_".join((table, *self.fields, postfix))
@@ -0,0 +1,83 @@
+from typing import Iterable
+from contextvars import ContextVar
+
+_loader = ContextVar("pafmvc_batch_loader", default=None)
+
+class DoesNotExist(Exception):
+	pass
+
+class LazyModel:
+	def __init__(self, loader: object, model_cls: type, id: int):
+		self.__dict__["_loader"] = loader
+		self.__dict__["_model_cls"] = model_cls
+		self.__dict__["id"] = id
+
+	def resolve(self) -> object:
+		return self._loader.resolve(self._model_cls, self.id)
+
+	def get_instance(self) -> object:
+		instance = self.resolve()
+		if instance is None:
+			raise DoesNotExist(f"{self._model_cls.__name__} with id {self.id} does not exist")
+		return instance
+
+	@property
+	def __class__(self) -> type:
+		return self._model_cls
+
+	def __bool__(self) -> bool:
+		return self.resolve() is not None
+
+	def __getattr__(self, name: str) -> any:
+		return getattr(self.get_instance(), name)
+
+	def __setattr__(self, name: str, value: any):
+		setattr(self.get_instance(), name, value)
+
+	def __eq__(self, other: object) -> bool:
+		return self.resolve() == (other.resolve() if isinstance(other, LazyModel) else other)
+
+	def __hash__(self) -> int:
+		return hash((self._model_cls, self.id))
+
+	def __repr__(self) -> str:
+		return f"<lazy {self._model_cls.__name__} {self.id}>"
+
+class BatchLoader:
+	def __init__(self):
+		self._pending = {}
+		self._loaded = {}
+
+	def load(self, model_cls: type, id: int) -> object:
+		loaded = self._loaded.get(model_cls, {})
+		if id in loaded:
+			return loaded[id]
+		self._pending.setdefault(model_cls, set()).add(id)
+		return LazyModel(self, model_cls, id)
+
+	def load_many(self, model_cls: type, ids: Iterable[int]) -> list:
+		return list(self.load(model_cls, id) for id in ids)
+
+	def resolve(self, model_cls: type, id: int) -> object:
+		loaded = self._loaded.setdefault(model_cls, {})
+		if id not in loaded:
+			ids = self._pending.pop(model_cls, set())
+			ids.add(id)
+			found = model_cls.manager.in_bulk(ids.difference(loaded))
+			loaded.update(dict((pending_id, found.get(pending_id, None)) for pending_id in ids))
+		return loaded[id]
+
+def get_loader() -> BatchLoader:
+	return _loader.get()
+
+class batch_loading:
+	def __init__(self):
+		self.loader = BatchLoader()
+		self._token = None
+
+	def __enter__(self) -> BatchLoader:
+		self._token = _loader.set(self.loader)
+		return self.loader
+
+	def __exit__(self, exc_type, exc, traceback):
+		_loader.reset(self._token)
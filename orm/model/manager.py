@@ -1,54 +1,207 @@
-from pafmvc.orm.db.connection import connect
+from typing import Iterable, Tuple
+from pafmvc.orm.db.connection import connections
+from pafmvc.orm.db.transaction import atomic
+from pafmvc.orm.db.router import get_router
+from pafmvc.orm.db.query import WhereOperator
 from pafmvc.orm.model.query_set import QuerySet
+from pafmvc.orm.model.loader import get_loader
+from pafmvc.orm.db import aio
+
+MAX_QUERY_PARAMS = 999
 
 class Manager:
 	def __init__(self, model_cls: type):
 		self._model = model_cls
 
-		self._executor = connect()
-		self._data_engine = self._executor.data_engine()
+	def db_for_read(self) -> str:
+		return get_router().db_for_read(self._model)
+
+	def db_for_write(self) -> str:
+		return get_router().db_for_write(self._model)
+
+	def get_executor(self, *, write=False, alias: str=None) -> object:
+		if alias is None:
+			alias = self.db_for_write() if write else self.db_for_read()
+		return connections[alias]
 	
-	def _execute(self, query: str) -> iter:
-		self._executor.connect()
-		return self._executor(query)
+	def _execute(self, operator: object) -> object:
+		executor = self.get_executor(write=True)
+		executor.connect()
+		try:
+			return executor(operator.to_str(), operator.get_params())
+		finally:
+			executor.close()
+
+	def get_queryset(self, alias: str=None):
+		return QuerySet(self._model, alias or self.db_for_read())
 
-	def get_queryset(self):
-		return QuerySet(self._model, self._executor)
+	def using(self, alias: str) -> QuerySet:
+		return self.get_queryset(alias)
 
 	def all(self) -> QuerySet:
 		return self.get_queryset()
 
-	def filter(self, **params) -> QuerySet:
-		return self.get_queryset().filter(**params)
+	def filter(self, *conditions, **params) -> QuerySet:
+		return self.get_queryset().filter(*conditions, **params)
 
-	def get(self, **params) -> object:
-		model = self.get_queryset().get(**params)
+	def exclude(self, *conditions, **params) -> QuerySet:
+		return self.get_queryset().exclude(*conditions, **params)
+
+	def get(self, *conditions, **params) -> object:
+		model = self.get_queryset().get(*conditions, **params)
 		return model
 
-	def _create_entry(self, query: str) -> int:
-		cur = self._execute(query)
-		last_id = cur.lastrowid
-		self._executor.close()
-		return last_id
+	def in_bulk(self, ids: Iterable[int], *, alias: str=None) -> dict:
+		ids = list(set(ids))
+		if not ids:
+			return {}
+		alias = alias or self.db_for_read()
+		chunks = list(ids[start:start + MAX_QUERY_PARAMS] for start in range(0, len(ids), MAX_QUERY_PARAMS))
+		if len(chunks) == 1:
+			return dict((model.id, model) for model in self.get_queryset(alias).filter(id__in=chunks[0]))
+		with atomic(alias):
+			return dict((model.id, model) for chunk in chunks for model in self.get_queryset(alias).filter(id__in=chunk))
+
+	def load(self, id: int) -> object:
+		loader = get_loader()
+		if loader is None:
+			return self.get(id=id)
+		return loader.load(self._model, id)
+
+	def _insert(self, cols: dict) -> int:
+		inserter = self.get_executor(write=True).data_engine().insert(self._model.meta.name)
+		for col, val in cols.items():
+			if val is not None:
+				inserter.insert(col, val)
+		return self._execute(inserter).lastrowid
 	
 	def create(self, **cols):
-		inserter = self._data_engine.insert(self._model.meta.name)
-		for field in self._model.meta.fields:
+		values = {}
+		for field in self._model.meta.columns:
 			if not field.autoincrement:
 				val = cols.get(field.name, None)
 				if val is None:
 					raise Exception(f"{field.name} field is reqired")
-				inserter.insert(field.name, val)	
-		lastrowid = self._create_entry(inserter.to_str())
-		return self.get(id=lastrowid)
+				values[field.name] = val
+		lastrowid = self._insert(values)
+		return self.get_queryset(self.db_for_write()).get(id=lastrowid)
+
+	def _get_update_fields(self, fields: Iterable[str], conflict: Iterable[str], update: Iterable[str]=None) -> Tuple[str]:
+		if update is not None:
+			return tuple(update)
+		return tuple(field for field in fields if field not in conflict)
+
+	def upsert(self, cols: dict, conflict: Iterable[str]=("id",), update: Iterable[str]=None):
+		conflict = tuple(conflict)
+		inserter = self.get_executor(write=True).data_engine().insert(self._model.meta.name)
+		for col, val in cols.items():
+			inserter.insert(col, val)
+		inserter.on_conflict(conflict, self._get_update_fields(cols, conflict, update))
+		self._execute(inserter)
+
+	def bulk_upsert(self, rows: Iterable[dict], conflict: Iterable[str]=("id",), update: Iterable[str]=None, batch_size: int=None):
+		groups = {}
+		for row in rows:
+			groups.setdefault(frozenset(row), []).append(row)
+		if not groups:
+			return
+		conflict = tuple(conflict)
+		with atomic(self.db_for_write()):
+			for group in groups.values():
+				fields = tuple(group[0])
+				group_update = self._get_update_fields(fields, conflict, update)
+				group_size = batch_size or max(1, MAX_QUERY_PARAMS // len(fields))
+				for start in range(0, len(group), group_size):
+					inserter = self.get_executor(write=True).data_engine().insert(self._model.meta.name)
+					for row in group[start:start + group_size]:
+						inserter.insert_row(dict((field, row[field]) for field in fields))
+					inserter.on_conflict(conflict, group_update)
+					self._execute(inserter)
+
+	def _is_unique(self, fields: Iterable[str]) -> bool:
+		fields = set(fields)
+		if fields == {"id"}:
+			return True
+		return any(index.unique and set(index.fields) == fields for index in self._model.meta.get_indexes())
+
+	def _get_lookup_values(self, lookup: dict) -> dict:
+		columns = set(field.name for field in self._model.meta.columns)
+		values = {}
+		for key, value in lookup.items():
+			field, operator = WhereOperator.split_lookup(key)
+			if operator == "exact" and field in columns:
+				values[field] = value
+		return values
 
-	def remove(self, **params):
-		self._execute(self._data_engine.remove(self._model.meta.name).where(**params).to_str())
-		self._executor.close()
+	def get_or_create(self, defaults: dict=None, **lookup) -> Tuple[object, bool]:
+		values = self._get_lookup_values(lookup)
+		values.update(defaults or {})
+		for field in self._model.meta.columns:
+			if not field.autoincrement and values.get(field.name, None) is None and field.default is not None:
+				values[field.name] = field.default
+		if not self._is_unique(lookup):
+			return self._get_or_insert(values, lookup)
+		inserter = self.get_executor(write=True).data_engine().insert(self._model.meta.name)
+		for col, val in values.items():
+			if val is not None:
+				inserter.insert(col, val)
+		inserter.on_conflict(tuple(lookup), ())
+		cursor = self._execute(inserter)
+		if cursor.rowcount != 1:
+			return self.get_queryset(self.db_for_write()).get(**lookup), False
+		return self._build_created(values, cursor.lastrowid), True
 
-	def update(self, cols: dict, **params):
-		updater = self._data_engine.update(self._model.meta.name).where(**params)
+	def _get_or_insert(self, values: dict, lookup: dict) -> Tuple[object, bool]:
+		alias = self.db_for_write()
+		try:
+			with atomic(alias):
+				model = self.get_queryset(alias).get(**lookup)
+				if model is not None:
+					return model, False
+				return self._build_created(values, self._insert(values)), True
+		except self.get_executor(write=True).integrity_error:
+			return self.get_queryset(alias).get(**lookup), False
+
+	def _build_created(self, values: dict, id: int) -> object:
+		model = self._model(**values)
+		model.id = id
+		model._dirty_fields.clear()
+		return model
+
+	def remove(self, *conditions, **params):
+		remover = self.get_executor(write=True).data_engine().remove(self._model.meta.name).where(*conditions, **params)
+		self._execute(remover)
+
+	def update(self, cols: dict, *conditions, **params):
+		updater = self.get_executor(write=True).data_engine().update(self._model.meta.name).where(*conditions, **params)
 		for col, val in cols.items():
 			updater.set(col, val)
-		self._execute(updater.to_str())
-		self._executor.close()
\ No newline at end of file
+		self._execute(updater)
+
+
+	async def aget(self, *conditions, **params) -> object:
+		return await aio.run(self.get, *conditions, **params)
+
+	async def acreate(self, **cols) -> object:
+		return await aio.run(self.create, **cols)
+
+	async def aupdate(self, cols: dict, *conditions, **params):
+		return await aio.run(self.update, cols, *conditions, **params)
+
+	async def ain_bulk(self, ids: Iterable[int], *, alias: str=None) -> dict:
+		return await aio.run(self.in_bulk, ids, alias=alias)
+
+	async def aupsert(self, cols: dict, conflict: Iterable[str]=("id",), update: Iterable[str]=None):
+		return await aio.run(self.upsert, cols, conflict, update)
+
+	async def abulk_upsert(self, rows: Iterable[dict], conflict: Iterable[str]=("id",), update: Iterable[str]=None, batch_size: int=None):
+		return await aio.run(self.bulk_upsert, rows, conflict, update, batch_size)
+
+	async def aget_or_create(self, defaults: dict=None, **lookup) -> Tuple[object, bool]:
+		return await aio.run(self.get_or_create, defaults, **lookup)
+
+	async def aremove(self, *conditions, **params):
+		return await aio.run(self.remove, *conditions, **params)
+
+	async def acount(self) -> int:
+		return await aio.run(self.get_queryset().count)
\ No newline at end of file
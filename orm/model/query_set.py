@@ -1,36 +1,129 @@
-from typing import List
+import copy
+from typing import List, Tuple
+from pafmvc.orm.model.fields import ForeignKey, ManyToManyField
+from pafmvc.orm.model.fields.base import RELATED_CACHE
+from pafmvc.orm.model.related import prefetch_many_to_many
+from pafmvc.orm.model.aggregates import Aggregate, Count
+from pafmvc.orm.db.query import Q, WhereOperator
+from pafmvc.orm.db.connection import connections, connect
+from pafmvc.orm.db import aio
+from pafmvc.orm.db.cache import query_cache
 
 TABLE_INFO = "PRAGMA table_info(%s);"
+RELATED_SEPARATOR = "__"
+DEFAULT_CACHE_TTL = 60
+DEFAULT_CHUNK_SIZE = 500
+COUNT_GROUPED = "SELECT COUNT(*) FROM ({query}) AS grouped;"
 
 class QuerySet:
-	def __init__(self, model_cls: type, executor: object):
-		self._executor = executor
+	def __init__(self, model_cls: type, alias: str):
+		self._alias = alias
 		self._model = model_cls
 		self._query = self._executor.query(self._model.meta.name)
+		self._related = {}
+		self._prefetch = []
+		self._values = None
+		self._annotations = {}
+		self._cache_ttl = None
+		self._timeout = None
+
+	@property
+	def _executor(self) -> object:
+		return connections[self._alias]
+
+	def _get_field(self, name: str) -> object:
+		return self._model.meta.get_field(name)
+
+	def _zip_related(self, model: object, related: dict):
+		cache = model.__dict__.setdefault(RELATED_CACHE, {})
+		for name, fields in related.items():
+			if fields.get("id", None) is not None:
+				cache[name] = self._related[name](**fields)
 	
 	def _zip_model(self, cols: iter, row: iter) -> object:
-		fields = dict(zip(cols, row))
-		return self._model(**fields)
+		fields = {}
+		related = dict((name, {}) for name in self._related)
+		for col, val in zip(cols, row):
+			name, separator, related_col = col.partition(RELATED_SEPARATOR)
+			if separator and name in related:
+				related[name][related_col] = val
+			else:
+				fields[col] = val
+		model = self._model(**fields)
+		for alias in self._annotations:
+			setattr(model, alias, fields.get(alias, None))
+		self._zip_related(model, related)
+		return model
+
+	def _fetch_rows(self, query: str=None, params: tuple=None) -> Tuple[Tuple[str], List[tuple]]:
+		query = self._query.to_str() if query is None else query
+		params = self._query.get_params() if params is None else params
+		if self._cache_ttl is None:
+			return self._execute_rows(query, params)
+		key = (self._alias, query, params)
+		hit, result = query_cache.get(key)
+		if not hit:
+			tables = self._query.get_tables()
+			generation = query_cache.get_generation(tables)
+			result = self._execute_rows(query, params)
+			query_cache.set(key, tables, result, self._cache_ttl, generation)
+		return result
+
+	def _execute_rows(self, query: str, params: tuple) -> Tuple[Tuple[str], List[tuple]]:
+		executor = self._executor
+		executor.connect()
+		try:
+			cur = executor(query, params, timeout=self._timeout)
+			columns = tuple(map(lambda x: x[0], cur.description))
+			rows = executor.fetchall(cur)
+		finally:
+			executor.close()
+		return columns, rows
 		
 	def _fetch(self) -> List[object]:
-		model_list = []
-		self._executor.connect()
-		cur = self._executor(self._query.to_str())
-		columns = tuple(map(lambda x: x[0], cur.description))
-		for row in cur:
-			model_list.append(self._zip_model(columns, row))
-		self._executor.close()
+		columns, rows = self._fetch_rows()
+		if self._values is not None:
+			return list(dict(zip(columns, row)) for row in rows)
+		model_list = list(self._zip_model(columns, row) for row in rows)
+		for field in self._prefetch:
+			prefetch_many_to_many(model_list, field, self._alias)
 		return model_list
 
+	def _clone(self) -> object:
+		clone = copy.copy(self)
+		clone._query = self._query.clone()
+		clone._related = dict(self._related)
+		clone._prefetch = list(self._prefetch)
+		clone._annotations = dict(self._annotations)
+		return clone
+
 	def all(self):
 		return self
 
-	def filter(self, **params):
-		self._query.filter(**params)
+	def cache(self, ttl: float=DEFAULT_CACHE_TTL):
+		self._cache_ttl = ttl
+		return self
+
+	def timeout(self, seconds: float):
+		self._timeout = seconds
 		return self
 
-	def get(self, **params) -> object:
-		self.filter(**params)
+	def using(self, alias: str):
+		self._alias = alias
+		return self
+
+	def filter(self, *conditions, **params):
+		having = dict((key, value) for key, value in params.items() if WhereOperator.split_lookup(key)[0] in self._annotations)
+		if having:
+			self._query.having(**having)
+		self._query.filter(*conditions, **dict((key, value) for key, value in params.items() if key not in having))
+		return self
+
+	def exclude(self, *conditions, **params):
+		return self.filter(~Q(*conditions, **params))
+
+	def get(self, *conditions, **params) -> object:
+		self.filter(*conditions, **params)
 		self._query.set_limit(1)
 		models = self._fetch()
 		return None if not models else models[0]
@@ -38,7 +131,91 @@ class QuerySet:
 	def order_by(self, field: str):
 		self._query.order_by(field)
 		return self
+
+	def _get_aggregates(self, aggregates: Tuple[Aggregate], named: dict) -> dict:
+		for alias, aggregate in named.items():
+			aggregate.alias = alias
+		return dict((aggregate.get_alias(), aggregate.to_sql(self._model.meta.name)) for aggregate in (*aggregates, *named.values()))
+
+	def values(self, *fields):
+		self._values = fields or tuple(field.name for field in self._model.meta.columns)
+		self._query.set_fields(self._values, self._annotations)
+		return self
+
+	def annotate(self, *aggregates, **named):
+		self._annotations.update(self._get_aggregates(aggregates, named))
+		if self._values is not None:
+			self._query.group_by(self._values).set_fields(self._values, self._annotations)
+		else:
+			self._query.group_by(("id",)).set_fields(("*",), self._annotations)
+		return self
+
+	def aggregate(self, *aggregates, **named) -> dict:
+		clone = self._clone()
+		clone._query.set_fields((), clone._get_aggregates(aggregates, named))
+		columns, rows = clone._fetch_rows()
+		return dict(zip(columns, rows[0]))
+
+	def count(self) -> int:
+		if not self._query.is_grouped():
+			return self.aggregate(Count("*"))["all__count"]
+		_, rows = self._fetch_rows(COUNT_GROUPED.format(query=self._query.to_str().rstrip(";")), self._query.get_params())
+		return rows[0][0]
+
+	def select_related(self, *fields):
+		for name in fields:
+			field = self._get_field(name)
+			if not isinstance(field, ForeignKey) or isinstance(field, ManyToManyField):
+				raise Exception(f"{name} field isn't a foreign key")
+			if name in self._related:
+				continue
+			related_model = field.get_related_model()
+			columns = tuple(f.name for f in related_model.meta.columns)
+			self._query.join(related_model.meta.name, name, name, columns)
+			self._related[name] = related_model
+		return self
+
+	def prefetch_related(self, *fields):
+		for name in fields:
+			field = self._get_field(name)
+			if not isinstance(field, ManyToManyField):
+				raise Exception(f"{name} field isn't a many to many field")
+			if field not in self._prefetch:
+				self._prefetch.append(field)
+		return self
 		
+	async def aget(self, *conditions, **params) -> object:
+		return await aio.run(self.get, *conditions, **params)
+
+	async def aaggregate(self, *aggregates, **named) -> dict:
+		return await aio.run(self.aggregate, *aggregates, **named)
+
+	async def acount(self) -> int:
+		return await aio.run(self.count)
+
+	def stream_values(self, chunk_size: int=DEFAULT_CHUNK_SIZE):
+		if self._values is None:
+			self.values()
+		executor = connect(alias=self._alias)
+		executor.connect()
+		try:
+			cur = executor(self._query.to_str(), self._query.get_params(), timeout=self._timeout)
+			columns = tuple(map(lambda x: x[0], cur.description))
+			while True:
+				rows = executor.fetchmany(cur, chunk_size)
+				if not rows:
+					break
+				yield list(dict(zip(columns, row)) for row in rows)
+		finally:
+			executor.close()
+
+	async def _aiter(self):
+		for obj in await aio.run(self._fetch):
+			yield obj
+
 	def __iter__(self):
 		for obj in self._fetch():
-			yield obj
\ No newline at end of file
+			yield obj
+
+	def __aiter__(self):
+		return self._aiter()
@@ -0,0 +1,79 @@
+from typing import List, Tuple
+from pafmvc.orm.model.fields.base import RELATED_CACHE
+
+class ManyToManyManager:
+	def __init__(self, instance: object, field: object):
+		self._instance = instance
+		self._field = field
+		self._model = field.get_related_model()
+		self._join_table, self._source, self._target = field.get_join_table(instance.__class__.meta.name)
+
+	def _get_executor(self, *, write=False) -> object:
+		return self._instance.__class__.manager.get_executor(write=write)
+
+	def _get_ids(self, objs: Tuple[object]) -> List[int]:
+		return list(obj if isinstance(obj, int) else obj.id for obj in objs)
+
+	def _execute(self, operator: object):
+		self._instance.__class__.manager._execute(operator)
+		self._instance.__dict__.get(RELATED_CACHE, {}).pop(self._field.name, None)
+
+	def _fetch_target_ids(self) -> List[int]:
+		executor = self._get_executor()
+		query = executor.query(self._join_table, fields=(self._target,)).filter(**{self._source: self._instance.id})
+		executor.connect()
+		try:
+			ids = list(row[0] for row in executor.fetchall(executor(query.to_str(), query.get_params())))
+		finally:
+			executor.close()
+		return ids
+
+	def all(self) -> List[object]:
+		cache = self._instance.__dict__.setdefault(RELATED_CACHE, {})
+		if self._field.name not in cache:
+			ids = self._fetch_target_ids()
+			cache[self._field.name] = list(self._model.manager.filter(id__in=ids)) if ids else []
+		return cache[self._field.name]
+
+	def add(self, *objs):
+		data_engine = self._get_executor(write=True).data_engine()
+		for related_id in self._get_ids(objs):
+			self._execute(data_engine.insert(self._join_table).insert(self._source, self._instance.id).insert(self._target, related_id))
+
+	def remove(self, *objs):
+		ids = self._get_ids(objs)
+		if ids:
+			self._execute(self._get_executor(write=True).data_engine().remove(self._join_table).where(**{self._source: self._instance.id, self._target + "__in": ids}))
+
+	def clear(self):
+		self._execute(self._get_executor(write=True).data_engine().remove(self._join_table).where(**{self._source: self._instance.id}))
+
+	def __iter__(self):
+		return iter(self.all())
+
+def prefetch_many_to_many(models: List[object], field: object, alias: str):
+	if not models:
+		return
+	model_cls = models[0].__class__
+	executor = model_cls.manager.get_executor(alias=alias)
+	join_table, source, target = field.get_join_table(model_cls.meta.name)
+
+	query = executor.query(join_table, fields=(source, target)).filter(**{source + "__in": list(model.id for model in models)})
+	executor.connect()
+	try:
+		rows = executor.fetchall(executor(query.to_str(), query.get_params()))
+	finally:
+		executor.close()
+
+	target_ids = set(row[1] for row in rows)
+	related = {}
+	if target_ids:
+		related_queryset = field.get_related_model().manager.using(alias)
+		related = dict((obj.id, obj) for obj in related_queryset.filter(id__in=target_ids))
+
+	grouped = dict((model.id, []) for model in models)
+	for source_id, target_id in rows:
+		if source_id in grouped and target_id in related:
+			grouped[source_id].append(related[target_id])
+	for model in models:
+		model.__dict__.setdefault(RELATED_CACHE, {})[field.name] = grouped[model.id]
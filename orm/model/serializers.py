@@ -0,0 +1,38 @@
+import json
+from typing import Callable, Iterable
+from importlib import import_module
+from pafmvc.conf import settings
+from .query_set import QuerySet, DEFAULT_CHUNK_SIZE
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+def default_encoder(obj: any) -> str:
+	return _json_encoder.encode(obj)
+
+def get_encoder() -> Callable:
+	path = getattr(settings, "JSON_ENCODER", None)
+	if path is None:
+		return default_encoder
+	module, _, name = path.rpartition(".")
+	return getattr(import_module(module), name)
+
+class JsonStreamSerializer:
+	def __init__(self, queryset: QuerySet, fields: Iterable[str]=(), *, encoder: Callable=None, chunk_size: int=DEFAULT_CHUNK_SIZE):
+		self._queryset = queryset
+		self._fields = tuple(fields)
+		self._encoder = encoder or get_encoder()
+		self._chunk_size = chunk_size
+
+	def _encode(self, chunk: list) -> bytes:
+		data = self._encoder(chunk)
+		if not isinstance(data, bytes):
+			data = data.encode("utf-8")
+		return data.strip()[1:-1]
+
+	def __iter__(self):
+		yield b"["
+		separator = b""
+		for chunk in self._queryset.values(*self._fields).stream_values(self._chunk_size):
+			yield separator + self._encode(chunk)
+			separator = b","
+		yield b"]"
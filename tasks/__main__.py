@@ -0,0 +1,33 @@
+import argparse
+from pafmvc.apps.registry import apps
+from pafmvc.orm.db.connection import connections
+from pafmvc.orm.migrations.base import MigrationEngine
+from .queue import get_alias
+from .models import QueuedTask
+from .worker import run_workers
+from .apps import TasksApp
+
+def migrate():
+	app = apps.registered_apps.get(TasksApp.app_name, None)
+	if app is None or QueuedTask not in app.get_models():
+		raise Exception("pafmvc.tasks isn't in REGISTERED_APPS")
+	executor = connections[get_alias()]
+	MigrationEngine(app).migrate(executor)
+
+def main():
+	parser = argparse.ArgumentParser(prog="python -m pafmvc.tasks")
+	commands = parser.add_subparsers(dest="command", required=True)
+	commands.add_parser("migrate")
+	worker = commands.add_parser("worker")
+	worker.add_argument("--processes", type=int, default=1)
+	worker.add_argument("--threads", type=int, default=1)
+	worker.add_argument("--batch-size", type=int, default=None)
+	worker.add_argument("--poll-interval", type=float, default=None)
+	arguments = parser.parse_args()
+	if arguments.command == "migrate":
+		migrate()
+		return
+	run_workers(arguments.processes, arguments.threads, batch_size=arguments.batch_size, poll_interval=arguments.poll_interval)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,4 @@
+from pafmvc.apps.app import App
+
+class TasksApp(App):
+	app_name = "tasks"
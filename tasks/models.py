@@ -0,0 +1,19 @@
+from pafmvc.orm.model import Model, Index
+from pafmvc.orm.model.fields import CharField, TextField, IntegerField
+
+PENDING = "pending"
+RUNNING = "running"
+FAILED = "failed"
+
+class QueuedTask(Model):
+	name = CharField(max_length=255)
+	payload = TextField()
+	status = CharField(max_length=16, default=PENDING)
+	attempts = IntegerField(default=0)
+	max_retries = IntegerField(default=0)
+	run_at = IntegerField(default=0)
+	locked_until = IntegerField(default=0)
+	claim = CharField(max_length=32, null=True)
+	error = TextField(null=True)
+
+	indexes = (Index(("status", "run_at")),)
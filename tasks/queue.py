@@ -0,0 +1,117 @@
+import json, time, uuid, random
+from importlib import import_module
+from pafmvc.conf import settings
+from pafmvc.apps.app import base_dir_in_path
+from pafmvc.apps.registry import apps
+from pafmvc.orm.db.connection import connections
+from pafmvc.orm.db.transaction import atomic
+from .models import QueuedTask, PENDING, RUNNING, FAILED
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 1.0
+DEFAULT_RETRY_MAX_BACKOFF = 300.0
+DEFAULT_LEASE = 300.0
+TASKS_MODULE = "tasks"
+separator = "."
+
+HAS_WORK = "SELECT 1 FROM {table} WHERE (status = ? AND run_at <= ?) OR (status = ? AND locked_until <= ?) LIMIT 1;"
+EXPIRE = "UPDATE {table} SET status = ?, error = ? WHERE status = ? AND locked_until <= ? AND attempts > max_retries;"
+DEQUEUE = (
+	"UPDATE {table} SET status = ?, attempts = attempts + 1, locked_until = ?, claim = ? "
+	"WHERE id IN (SELECT id FROM {table} WHERE (status = ? AND run_at <= ?) OR (status = ? AND locked_until <= ?) ORDER BY run_at, id LIMIT ?) "
+	"RETURNING id, name, payload, attempts, max_retries, claim;"
+)
+LEASE_EXPIRED = "lease expired while the task was running"
+
+_tasks = {}
+
+def now_ms() -> int:
+	return int(time.time() * 1000)
+
+def get_backoff(attempt: int) -> float:
+	base = getattr(settings, "TASK_RETRY_BACKOFF", DEFAULT_RETRY_BACKOFF)
+	delay = min(getattr(settings, "TASK_RETRY_MAX_BACKOFF", DEFAULT_RETRY_MAX_BACKOFF), base * 2 ** max(0, attempt - 1))
+	return random.uniform(delay / 2, delay)
+
+class Task:
+	def __init__(self, func, name: str=None, max_retries: int=None):
+		self.func = func
+		self.name = name or separator.join((func.__module__, func.__qualname__))
+		self.max_retries = getattr(settings, "TASK_MAX_RETRIES", DEFAULT_MAX_RETRIES) if max_retries is None else max_retries
+
+	def delay(self, *args, **kwargs) -> int:
+		return self.apply_async(args, kwargs)
+
+	def apply_async(self, args: tuple=(), kwargs: dict=None, *, countdown: float=0) -> int:
+		record = QueuedTask(
+			name=self.name,
+			payload=json.dumps({"args": list(args), "kwargs": kwargs or {}}),
+			max_retries=self.max_retries,
+			run_at=now_ms() + int(countdown * 1000),
+		)
+		record.save()
+		return record.id
+
+	def __call__(self, *args, **kwargs):
+		return self.func(*args, **kwargs)
+
+def task(func=None, *, name: str=None, max_retries: int=None):
+	def decorator(func) -> Task:
+		registered = Task(func, name, max_retries)
+		_tasks[registered.name] = registered
+		return registered
+	return decorator(func) if func is not None else decorator
+
+def autodiscover():
+	with base_dir_in_path():
+		for app in apps.registered_apps.values():
+			module = separator.join((app.get_module_name(), TASKS_MODULE))
+			try:
+				import_module(module)
+			except ModuleNotFoundError as err:
+				if err.name != module:
+					raise err
+
+def get_task(name: str) -> Task:
+	if name not in _tasks:
+		module = name.rpartition(separator)[0]
+		if module:
+			with base_dir_in_path():
+				import_module(module)
+	registered = _tasks.get(name, None)
+	if registered is None:
+		raise Exception(f"task {name} isn't registered")
+	return registered
+
+def get_alias() -> str:
+	return QueuedTask.manager.db_for_write()
+
+def has_work(alias: str, now: int) -> bool:
+	executor = connections[alias]
+	executor.connect()
+	try:
+		cursor = executor(HAS_WORK.format(table=QueuedTask.meta.name), (PENDING, now, RUNNING, now))
+		return bool(executor.fetchall(cursor))
+	finally:
+		executor.close()
+
+def dequeue(batch_size: int, lease: float=DEFAULT_LEASE) -> list:
+	alias = get_alias()
+	now = now_ms()
+	table = QueuedTask.meta.name
+	if not has_work(alias, now):
+		return []
+	with atomic(alias):
+		executor = connections[alias]
+		executor(EXPIRE.format(table=table), (FAILED, LEASE_EXPIRED, RUNNING, now))
+		cursor = executor(DEQUEUE.format(table=table), (RUNNING, now + int(lease * 1000), uuid.uuid4().hex, PENDING, now, RUNNING, now, batch_size))
+		return executor.fetchall(cursor)
+
+def complete(task_id: int, claim: str):
+	QueuedTask.manager.remove(id=task_id, claim=claim)
+
+def fail(task_id: int, claim: str, attempts: int, max_retries: int, error: str):
+	if attempts <= max_retries:
+		QueuedTask.manager.update({"status": PENDING, "run_at": now_ms() + int(get_backoff(attempts) * 1000), "error": error}, id=task_id, claim=claim)
+	else:
+		QueuedTask.manager.update({"status": FAILED, "error": error}, id=task_id, claim=claim)
@@ -0,0 +1,83 @@
+import os, json, signal, logging, threading, traceback
+from concurrent.futures import ThreadPoolExecutor
+from pafmvc.conf import settings
+from .queue import get_task, autodiscover, dequeue, complete, fail, DEFAULT_LEASE
+
+logger = logging.getLogger("pafmvc.tasks")
+
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_POLL_INTERVAL = 1.0
+THREAD_NAME_PREFIX = "pafmvc-task"
+
+class Worker:
+	def __init__(self, threads: int=1, *, batch_size: int=None, poll_interval: float=None, lease: float=None):
+		self._threads = threads
+		self._batch_size = batch_size or getattr(settings, "TASK_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+		self._poll_interval = getattr(settings, "TASK_POLL_INTERVAL", DEFAULT_POLL_INTERVAL) if poll_interval is None else poll_interval
+		self._lease = lease or getattr(settings, "TASK_LEASE", DEFAULT_LEASE)
+		self._stopped = threading.Event()
+		self._pool = None
+
+	def run_task(self, row: tuple):
+		task_id, name, payload, attempts, max_retries, claim = row
+		try:
+			payload = json.loads(payload)
+			get_task(name)(*payload["args"], **payload["kwargs"])
+		except Exception:
+			error = traceback.format_exc()
+			logger.warning("task %s (%s) failed on attempt %d:\n%s", task_id, name, attempts, error)
+			fail(task_id, claim, attempts, max_retries, error)
+			return
+		complete(task_id, claim)
+
+	def run_once(self) -> int:
+		rows = dequeue(self._batch_size, self._lease)
+		if self._pool is None:
+			for row in rows:
+				self.run_task(row)
+		else:
+			list(self._pool.map(self.run_task, rows))
+		return len(rows)
+
+	def run(self):
+		autodiscover()
+		if self._threads > 1:
+			self._pool = ThreadPoolExecutor(self._threads, THREAD_NAME_PREFIX)
+		try:
+			while not self._stopped.is_set():
+				if not self.run_once():
+					self._stopped.wait(self._poll_interval)
+		finally:
+			if self._pool is not None:
+				self._pool.shutdown()
+				self._pool = None
+
+	def stop(self, *args):
+		self._stopped.set()
+
+def run_workers(processes: int=1, threads: int=1, **options):
+	if processes <= 1:
+		worker = Worker(threads, **options)
+		signal.signal(signal.SIGTERM, worker.stop)
+		signal.signal(signal.SIGINT, worker.stop)
+		worker.run()
+		return
+	children = []
+	for _ in range(processes):
+		pid = os.fork()
+		if pid == 0:
+			try:
+				run_workers(1, threads, **options)
+			finally:
+				os._exit(0)
+		children.append(pid)
+	def forward(signum, frame):
+		for pid in children:
+			try:
+				os.kill(pid, signal.SIGTERM)
+			except ProcessLookupError:
+				pass
+	signal.signal(signal.SIGTERM, forward)
+	signal.signal(signal.SIGINT, forward)
+	for pid in children:
+		os.waitpid(pid, 0)
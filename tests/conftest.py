@@ -0,0 +1,70 @@
+import os, sys, shutil, atexit, tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGES = ("apps", "controller", "core", "orm", "view")
+COPIED_PACKAGES = ("tasks",)
+TEST_APP = "testapp"
+IGNORED = shutil.ignore_patterns("__pycache__", "migrations")
+
+SETTINGS = """BASE_DIR = {base_dir!r}
+DEBUG = False
+REGISTERED_APPS = ("{test_app}", "pafmvc.tasks")
+TEMPLATE_PATH = {template_path!r}
+DB_PATH = {db_path!r}
+DB_EDITOR_PATH = "pafmvc.orm.db.backends.sqlite.executor"
+DB_EDITOR = "SQLiteExecutor"
+TASK_RETRY_BACKOFF = 0.01
+"""
+
+def build_project(base_dir: str):
+	package = os.path.join(base_dir, "pafmvc")
+	os.makedirs(os.path.join(package, "conf"))
+	os.makedirs(os.path.join(base_dir, "templates"))
+	for name in PACKAGES:
+		os.symlink(os.path.join(ROOT, name), os.path.join(package, name))
+	for name in COPIED_PACKAGES:
+		shutil.copytree(os.path.join(ROOT, name), os.path.join(package, name), ignore=IGNORED)
+	shutil.copytree(os.path.join(TESTS_DIR, TEST_APP), os.path.join(base_dir, TEST_APP), ignore=IGNORED)
+	with open(os.path.join(package, "conf", "settings.py"), "w") as settings_io:
+		settings_io.write(SETTINGS.format(
+			base_dir = base_dir,
+			test_app = TEST_APP,
+			template_path = os.path.join(base_dir, "templates"),
+			db_path = os.path.join(base_dir, "db.sqlite3"),
+		))
+
+BASE_DIR = tempfile.mkdtemp(prefix="pafmvc-tests-")
+atexit.register(shutil.rmtree, BASE_DIR, True)
+build_project(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+
+@pytest.fixture
+def tmp_app(tmp_path):
+	from pafmvc.apps.app import App
+	class DirectoryApp(App):
+		def get_app_path(self) -> str:
+			return str(tmp_path)
+	return DirectoryApp("tmpapp")
+
+@pytest.fixture(scope="session")
+def migrated():
+	from pafmvc.apps.registry import apps
+	from pafmvc.orm.db.connection import connections
+	from pafmvc.orm.migrations.base import MigrationEngine
+	for app in apps.registered_apps.values():
+		MigrationEngine(app).migrate(connections["default"])
+	return apps
+
+@pytest.fixture
+def db(migrated):
+	from pafmvc.orm.db.connection import connections
+	from pafmvc.orm.db.transaction import atomic
+	from pafmvc.orm.db.cache import query_cache
+	yield connections["default"]
+	with atomic():
+		for app in migrated.registered_apps.values():
+			for model in app.get_models():
+				connections["default"](f"DELETE FROM {model.meta.name};")
+	query_cache.clear()
@@ -0,0 +1,50 @@
+import threading
+from pafmvc.core.admission import AdmissionGroup, AdmissionController
+
+def test_limit_without_queue():
+	group = AdmissionGroup("default", limit=2)
+	assert group.acquire() and group.acquire()
+	assert not group.acquire()
+	group.release()
+	assert group.acquire()
+
+def test_queued_request_waits_for_slot():
+	group = AdmissionGroup("default", limit=1, queue=1, timeout=5)
+	assert group.acquire()
+	acquired = []
+	waiter = threading.Thread(target=lambda: acquired.append(group.acquire()))
+	waiter.start()
+	while not group._waiting:
+		pass
+	assert not group.acquire()
+	group.release()
+	waiter.join()
+	assert acquired == [True]
+
+def test_queue_timeout():
+	group = AdmissionGroup("default", limit=1, queue=1, timeout=0.01)
+	assert group.acquire()
+	assert not group.acquire()
+	assert group._waiting == 0
+
+def test_rejection():
+	group = AdmissionGroup("default", limit=1, retry_after=3)
+	assert group.rejection.status == "503"
+	assert ("Retry-After", "3") in group.rejection.get_headers()
+
+def test_get_group():
+	controller = AdmissionController({
+		"default": {"limit": 10},
+		"api": {"limit": 2, "prefix": "/api"},
+		"uploads": {"limit": 1, "prefix": "/api/uploads"},
+	})
+	assert controller.get_group("/").name == "default"
+	assert controller.get_group("/api/items").name == "api"
+	assert controller.get_group("/api/uploads/1").name == "uploads"
+	assert controller.get_group("/health") is None
+	assert controller.get_group("/health/db") is None
+	assert controller.get_group("/healthz").name == "default"
+
+def test_no_default_group():
+	controller = AdmissionController({"api": {"limit": 1, "prefix": "/api"}}, exempt=())
+	assert controller.get_group("/") is None
@@ -0,0 +1,41 @@
+from pafmvc.orm.model.aggregates import Count, Sum, Max
+
+def create_items():
+	from testapp.models import Item
+	for name, kind, qty in (("a", "x", 1), ("b", "x", 2), ("c", "y", 5)):
+		Item.manager.create(name=name, kind=kind, qty=qty)
+	return Item
+
+def test_aggregate_sql():
+	assert Sum("qty").to_sql("item") == "SUM(item.qty) AS qty__sum"
+	assert Count("*").to_sql("item") == "COUNT(*) AS all__count"
+	assert Count("kind", distinct=True).to_sql("item") == "COUNT(DISTINCT item.kind) AS kind__count"
+
+def test_aggregate(db):
+	Item = create_items()
+	assert Item.manager.all().aggregate(Sum("qty"), top=Max("qty")) == {"qty__sum": 8, "top": 5}
+
+def test_aggregate_keeps_queryset(db):
+	Item = create_items()
+	query_set = Item.manager.filter(kind="x")
+	assert query_set.aggregate(Sum("qty")) == {"qty__sum": 3}
+	assert sorted(item.name for item in query_set) == ["a", "b"]
+
+def test_values_annotate(db):
+	Item = create_items()
+	rows = Item.manager.all().values("kind").annotate(total=Sum("qty")).order_by("kind")
+	assert list(rows) == [{"kind": "x", "total": 3}, {"kind": "y", "total": 5}]
+
+def test_annotate_having(db):
+	Item = create_items()
+	rows = Item.manager.all().values("kind").annotate(total=Sum("qty")).filter(total__gt=4)
+	assert list(rows) == [{"kind": "y", "total": 5}]
+
+def test_count(db):
+	Item = create_items()
+	assert Item.manager.all().count() == 3
+	assert Item.manager.filter(kind="x").count() == 2
+
+def test_count_grouped(db):
+	Item = create_items()
+	assert Item.manager.all().values("kind").annotate(Count("id")).count() == 2
@@ -0,0 +1,81 @@
+import os, sys, uuid
+import pytest
+from pafmvc.apps import app as app_module, registry
+from pafmvc.apps.app import App
+from pafmvc.apps.manifest import DiscoveryManifest, get_fingerprint
+from tests.conftest import BASE_DIR
+
+MODELS = """from pafmvc.orm.model import Model
+from pafmvc.orm.model.fields import CharField
+
+class {name}(Model):
+	title = CharField(max_length=50)
+"""
+
+@pytest.fixture
+def module():
+	module = f"lazyapp_{uuid.uuid4().hex}"
+	path = os.path.join(BASE_DIR, module)
+	os.makedirs(path)
+	for file_name, source in (("__init__.py", ""), ("apps.py", ""), ("models.py", MODELS.format(name="Note")), ("urls.py", "urlpatterns = (\"home\",)\n")):
+		with open(os.path.join(path, file_name), "w") as source_io:
+			source_io.write(source)
+	yield module
+	for name in tuple(sys.modules):
+		if name == module or name.startswith(module + "."):
+			del sys.modules[name]
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch) -> DiscoveryManifest:
+	manifest = DiscoveryManifest(str(tmp_path / "manifest.json"))
+	monkeypatch.setattr(app_module, "manifest", manifest)
+	monkeypatch.setattr(registry, "manifest", manifest)
+	return manifest
+
+def test_registry_imports_lazily(module, manifest, monkeypatch):
+	monkeypatch.setattr(registry, "REGISTERED_APPS", (module,))
+	apps = registry.AppRegistry()
+	app = apps.registered_apps[module]
+	assert module + ".models" not in sys.modules and module + ".urls" not in sys.modules
+	assert [model.__name__ for model in app.get_models()] == ["Note"]
+	assert module + ".urls" not in sys.modules
+	assert app.get_urlpatterns() == ("home",)
+
+def test_manifest_reused_on_warm_start(module, manifest, monkeypatch, tmp_path):
+	App(module).get_models()
+	App(module).get_urlpatterns()
+	warm = DiscoveryManifest(manifest._path)
+	monkeypatch.setattr(app_module, "manifest", warm)
+	monkeypatch.setattr(app_module.inspect, "getmembers", lambda *args: pytest.fail("models were rediscovered"))
+	assert [model.__name__ for model in App(module).get_models()] == ["Note"]
+	assert warm.get(module, App(module).get_app_path(), "urls") is True
+
+def test_manifest_invalidated_by_edit(module, manifest):
+	app = App(module)
+	app.get_models()
+	path = app.get_app_path()
+	assert manifest.get(module, path, "models") == ["Note"]
+	with open(os.path.join(path, "models.py"), "a") as source_io:
+		source_io.write(MODELS.format(name="Draft").split("\n\n", 1)[1])
+	assert manifest.get(module, path, "models") is None
+	del sys.modules[module + ".models"]
+	assert sorted(model.__name__ for model in App(module).get_models()) == ["Draft", "Note"]
+	assert manifest.get(module, path, "models") == ["Draft", "Note"]
+
+def test_fingerprint_tracks_packages(module):
+	path = os.path.join(BASE_DIR, module)
+	before = get_fingerprint(path)
+	os.remove(os.path.join(path, "models.py"))
+	os.makedirs(os.path.join(path, "models"))
+	with open(os.path.join(path, "models", "__init__.py"), "w") as source_io:
+		source_io.write("")
+	changed = get_fingerprint(path)
+	assert changed != before
+	with open(os.path.join(path, "models", "notes.py"), "w") as source_io:
+		source_io.write(MODELS.format(name="Note"))
+	assert get_fingerprint(path) != changed
+
+def test_stale_manifest_version_is_ignored(tmp_path):
+	path = tmp_path / "manifest.json"
+	path.write_text('{"version": 1, "apps": {"x": {"fingerprint": null, "data": {"models": []}}}}')
+	assert DiscoveryManifest(str(path))._load() == {}
@@ -0,0 +1,70 @@
+import asyncio, threading
+import pytest
+from pafmvc.orm.db import aio, instrumentation
+from pafmvc.orm.db.connection import connections
+from pafmvc.orm.db.transaction import atomic
+
+@pytest.fixture
+def query_threads():
+	threads = []
+	hook = lambda record: threads.append((threading.get_ident(), id(connections["default"])))
+	instrumentation.add_hook(hook)
+	yield threads
+	instrumentation.remove_hook(hook)
+
+def test_thread_local_executors():
+	executors = []
+	thread = threading.Thread(target=lambda: executors.append(connections["default"]))
+	thread.start()
+	thread.join()
+	assert executors[0] is not connections["default"]
+	assert connections["default"] is connections["default"]
+
+def test_wrappers(db):
+	from testapp.models import Item
+	async def main():
+		created = await Item.manager.acreate(name="a", kind="x", qty=1)
+		await Item.manager.aupdate({"qty": 2}, id=created.id)
+		fetched = await Item.manager.aget(id=created.id)
+		names = [item.name async for item in Item.manager.filter(kind="x")]
+		return created, fetched, names, await Item.manager.acount()
+	created, fetched, names, count = asyncio.run(main())
+	assert (fetched.id, fetched.qty) == (created.id, 2)
+	assert names == ["a"] and count == 1
+	assert aio.get_pool_usage() == (0, 0)
+
+def test_atomic_pins_one_thread(db, query_threads):
+	from testapp.models import Item
+	async def main():
+		async with atomic():
+			await Item.manager.acreate(name="a", kind="x", qty=1)
+			await Item.manager.aupdate({"qty": 2}, name="a")
+			await Item.manager.acount()
+	asyncio.run(main())
+	assert len(query_threads) >= 3
+	assert len(set(query_threads)) == 1
+	assert query_threads[0][0] != threading.get_ident()
+	assert Item.manager.get(name="a").qty == 2
+
+def test_atomic_rolls_back(db):
+	from testapp.models import Item
+	async def main():
+		async with atomic():
+			await Item.manager.acreate(name="a", kind="x", qty=1)
+			raise ValueError("abort")
+	with pytest.raises(ValueError):
+		asyncio.run(main())
+	assert Item.manager.all().count() == 0
+
+def test_concurrent_transactions_are_isolated(db, query_threads):
+	from testapp.models import Item
+	async def write(name: str):
+		async with atomic():
+			await Item.manager.acreate(name=name, kind="x", qty=1)
+			await asyncio.sleep(0.01)
+			await Item.manager.aupdate({"qty": 2}, name=name)
+	async def main():
+		await asyncio.gather(write("a"), write("b"))
+	asyncio.run(main())
+	assert len(set(query_threads)) == 2
+	assert sorted((item.name, item.qty) for item in Item.manager.all()) == [("a", 2), ("b", 2)]
@@ -0,0 +1,44 @@
+import pytest
+from pafmvc.orm.model import manager
+from pafmvc.orm.model.loader import batch_loading, DoesNotExist
+from pafmvc.orm.db.instrumentation import capture_queries
+
+def create_authors(*names) -> list:
+	from testapp.models import Author
+	return list(Author.manager.create(name=name) for name in names)
+
+def test_in_bulk(db):
+	from testapp.models import Author
+	first, second = create_authors("a", "b")
+	found = Author.manager.in_bulk([first.id, second.id, first.id, 999])
+	assert sorted(found) == [first.id, second.id]
+	assert found[second.id].name == "b"
+	assert Author.manager.in_bulk([]) == {}
+
+def test_in_bulk_chunks(db, monkeypatch):
+	from testapp.models import Author
+	monkeypatch.setattr(manager, "MAX_QUERY_PARAMS", 2)
+	authors = create_authors("a", "b", "c", "d", "e")
+	with capture_queries() as log:
+		found = Author.manager.in_bulk(author.id for author in authors)
+	assert sorted(found) == sorted(author.id for author in authors)
+	assert log.count == 3
+
+def test_load_without_loader(db):
+	from testapp.models import Author
+	author, = create_authors("a")
+	assert Author.manager.load(author.id).name == "a"
+
+def test_batch_loading(db):
+	from testapp.models import Author, Book
+	first, second = create_authors("a", "b")
+	for author in (first.id, second.id, first.id, 999):
+		Book(title="t", author=author).save()
+	with batch_loading(), capture_queries() as log:
+		authors = list(book.get_related("author") for book in Book.manager.all())
+		assert [author.name for author in authors[:3]] == ["a", "b", "a"]
+	assert log.count == 2
+	missing = authors[3]
+	assert isinstance(missing, Author) and not missing
+	with pytest.raises(DoesNotExist):
+		missing.name
@@ -0,0 +1,37 @@
+from pafmvc.orm.db.instrumentation import capture_queries
+
+def test_new_instance_is_clean():
+	from testapp.models import Item
+	item = Item(name="a", kind="x")
+	assert item._dirty_fields == set()
+	item.qty = 3
+	assert item._dirty_fields == {"qty"}
+
+def test_save_inserts_then_updates_dirty_fields(db):
+	from testapp.models import Item
+	item = Item(name="a", kind="x")
+	item.save()
+	assert item.id is not None and item._dirty_fields == set()
+	item.qty = 4
+	with capture_queries() as log:
+		item.save()
+	update, = log.records
+	assert update.sql.startswith("UPDATE item") and update.params == (4, item.id)
+	assert Item.manager.get(id=item.id).qty == 4
+
+def test_save_without_changes(db):
+	from testapp.models import Item
+	item = Item.manager.create(name="a", kind="x", qty=1)
+	with capture_queries() as log:
+		item.save()
+	assert log.count == 0
+
+def test_save_update_fields(db):
+	from testapp.models import Item
+	item = Item.manager.create(name="a", kind="x", qty=1)
+	item.name = "b"
+	item.qty = 2
+	item.save(update_fields=("qty",))
+	assert item._dirty_fields == {"name"}
+	stored = Item.manager.get(id=item.id)
+	assert (stored.name, stored.qty) == ("a", 2)
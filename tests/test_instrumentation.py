@@ -0,0 +1,106 @@
+import time, logging
+import pytest
+from pafmvc.conf import settings
+from pafmvc.orm.db import instrumentation
+from pafmvc.orm.db.instrumentation import capture_queries, get_full_scans
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor
+
+ROWS = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?) SELECT i FROM n;"
+
+@pytest.fixture
+def executor(tmp_path):
+	executor = SQLiteExecutor(str(tmp_path / "db.sqlite3"))
+	executor.connect()
+	executor("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT);")
+	yield executor
+	executor.close()
+
+def test_get_full_scans():
+	plan = [
+		(2, 0, 0, "SCAN item"),
+		(3, 0, 0, "SCAN tag USING INDEX tag_slug"),
+		(4, 0, 0, "SEARCH book USING INTEGER PRIMARY KEY (rowid=?)"),
+		(5, 0, 0, "SCAN CONSTANT ROW"),
+	]
+	assert get_full_scans(plan) == ["SCAN item"]
+
+def test_write_is_recorded_on_execute(executor):
+	with capture_queries() as log:
+		executor("INSERT INTO item (name) VALUES (?);", ("a",))
+	record, = log.records
+	assert (record.sql, record.params, record.rowcount) == ("INSERT INTO item (name) VALUES (?);", ("a",), 1)
+	assert record.caller.startswith(__file__)
+
+def test_select_is_recorded_after_fetch(executor):
+	with capture_queries() as log:
+		started = time.perf_counter()
+		cursor = executor(ROWS, (200000,))
+		assert log.count == 0
+		fetch_started = time.perf_counter()
+		rows = executor.fetchall(cursor)
+		fetched = time.perf_counter()
+	record, = log.records
+	assert record.rowcount == len(rows) == 200000
+	assert fetched - started >= record.duration >= (fetched - fetch_started) / 2
+
+def test_fetchmany_is_recorded_when_exhausted(executor):
+	with capture_queries() as log:
+		cursor = executor(ROWS, (5,))
+		assert len(executor.fetchmany(cursor, 2)) == 2
+		assert len(executor.fetchmany(cursor, 2)) == 2
+		assert log.count == 0
+		assert len(executor.fetchmany(cursor, 2)) == 1
+	assert log.records[0].rowcount == 5
+
+def test_unfetched_select_is_recorded_on_close(executor):
+	with capture_queries() as log:
+		executor(ROWS, (5,))
+		executor.close()
+	assert log.records[0].rowcount == 0
+
+def test_records_keep_execution_order(executor):
+	with capture_queries() as log:
+		executor("SELECT * FROM item;")
+		executor("INSERT INTO item (name) VALUES (?);", ("a",))
+	assert [record.sql.split()[0] for record in log.records] == ["SELECT", "INSERT"]
+
+def test_stream_values_is_recorded(db):
+	from testapp.models import Item
+	for name in "abc":
+		Item.manager.create(name=name, kind="x", qty=0)
+	with capture_queries() as log:
+		chunks = list(Item.manager.all().stream_values(2))
+	assert [len(chunk) for chunk in chunks] == [2, 1]
+	assert log.records[0].rowcount == 3
+	with capture_queries() as log:
+		stream = Item.manager.all().stream_values(2)
+		next(stream)
+		stream.close()
+	assert log.records[0].rowcount == 2
+
+def test_slow_query_plan(db, monkeypatch, caplog):
+	from testapp.models import Item
+	monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD", 0, raising=False)
+	with capture_queries() as log, caplog.at_level(logging.WARNING, logger="pafmvc.orm.db"):
+		list(Item.manager.filter(kind="x"))
+		list(Item.manager.filter(id=1))
+	scan, search = log.records
+	assert scan.full_scans == ["SCAN item"] and scan.plan
+	assert search.full_scans == [] and search.plan
+	assert "full table scan: SCAN item" in caplog.records[0].getMessage()
+
+def test_query_log_setting(executor, monkeypatch, caplog):
+	monkeypatch.setattr(settings, "DB_QUERY_LOG", True, raising=False)
+	with caplog.at_level(logging.DEBUG, logger="pafmvc.orm.db"):
+		executor.fetchall(executor("SELECT * FROM item;"))
+	assert caplog.records[0].getMessage().endswith("SELECT * FROM item; ()")
+
+def test_hooks(executor):
+	records = []
+	instrumentation.add_hook(records.append)
+	try:
+		executor.fetchall(executor("SELECT * FROM item;"))
+	finally:
+		instrumentation.remove_hook(records.append)
+	executor.fetchall(executor("SELECT * FROM item;"))
+	assert len(records) == 1
@@ -0,0 +1,54 @@
+import pytest
+from pafmvc.orm.db.query import Query, Q, WhereOperator
+
+def compile_filter(*conditions, **params) -> tuple:
+	query = Query("item")
+	query.filter(*conditions, **params)
+	return query.to_str().partition("WHERE ")[2].rstrip(";"), query.get_params()
+
+@pytest.mark.parametrize("key, expected", [
+	("name", ("name", "exact")),
+	("qty__gte", ("qty", "gte")),
+	("author__name", ("author__name", "exact")),
+	("author__name__in", ("author__name", "in")),
+])
+def test_split_lookup(key, expected):
+	assert WhereOperator.split_lookup(key) == expected
+
+@pytest.mark.parametrize("params, sql, values", [
+	({"qty__gt": 3}, "item.qty > ?", (3,)),
+	({"qty__ne": 3}, "item.qty <> ?", (3,)),
+	({"kind__in": ["x", "y"]}, "item.kind IN (?,?)", ("x", "y")),
+	({"kind": ["x", "y"]}, "item.kind IN (?,?)", ("x", "y")),
+	({"kind__in": []}, "1=0", ()),
+	({"qty__range": (1, 2)}, "item.qty BETWEEN ? AND ?", (1, 2)),
+	({"kind": None}, "item.kind IS NULL", ()),
+	({"kind__isnull": False}, "item.kind IS NOT NULL", ()),
+	({"name__startswith": "a"}, "item.name LIKE ? ESCAPE '\\'", ("a%",)),
+	({"name__contains": "5%_"}, "item.name LIKE ? ESCAPE '\\'", ("%5\\%\\_%",)),
+])
+def test_lookup_sql(params, sql, values):
+	assert compile_filter(**params) == (sql, values)
+
+def test_q_expressions():
+	sql, values = compile_filter(Q(name="a") | ~Q(qty__gt=3), kind="x")
+	assert sql == "((item.name = ?) OR NOT ((item.qty > ?))) AND item.kind = ?"
+	assert values == ("a", 3, "x")
+
+def test_empty_q():
+	query = Query("item")
+	query.filter(Q())
+	assert query.to_str() == "SELECT * FROM item;"
+	assert compile_filter(~Q()) == ("NOT (1=1)", ())
+
+def test_q_combines_only_q():
+	with pytest.raises(TypeError):
+		Q(name="a") | {"name": "b"}
+
+def test_filter_and_exclude(db):
+	from testapp.models import Item
+	for name, kind, qty in (("a", "x", 1), ("b_1", "x", 2), ("b%2", "y", 5)):
+		Item.manager.create(name=name, kind=kind, qty=qty)
+	assert sorted(item.name for item in Item.manager.filter(Q(qty__lt=2) | Q(kind="y"))) == ["a", "b%2"]
+	assert [item.name for item in Item.manager.filter(name__contains="%")] == ["b%2"]
+	assert [item.name for item in Item.manager.exclude(kind="x")] == ["b%2"]
@@ -0,0 +1,61 @@
+import os, json
+from pafmvc.core.metrics import MetricsRegistry, MetricsView, format_labels
+from pafmvc.core.response import template_cache
+from pafmvc.orm.db.cache import query_cache
+from pafmvc.orm.db.instrumentation import QueryLog
+
+def test_format_labels():
+	assert format_labels(()) == ""
+	assert format_labels((("route", 'a"b\\c\n'),), ("le", "+Inf")) == '{route="a\\"b\\\\c\\n",le="+Inf"}'
+
+def test_render_counters_and_histograms():
+	registry = MetricsRegistry()
+	registry.inc("requests_total", (("route", "home"),))
+	registry.inc("requests_total", (("route", "home"),), 2)
+	registry.observe("latency_seconds", 0.2, buckets=(0.1, 0.5))
+	registry.observe("latency_seconds", 1, buckets=(0.1, 0.5))
+	lines = registry.render().splitlines()
+	assert 'requests_total{route="home"} 3' in lines
+	assert lines.index("# TYPE latency_seconds histogram") < lines.index('latency_seconds_bucket{le="0.1"} 0')
+	assert 'latency_seconds_bucket{le="0.5"} 1' in lines
+	assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+	assert "latency_seconds_sum 1.2" in lines
+	assert "latency_seconds_count 2" in lines
+	assert "# TYPE pafmvc_db_open_connections gauge" in lines
+
+def test_record_request():
+	registry = MetricsRegistry()
+	registry.record_request("home", "GET", "200", 0.01, QueryLog())
+	output = registry.render()
+	assert 'pafmvc_http_requests_total{route="home",method="GET",status="200"} 1' in output
+	assert 'pafmvc_db_queries_per_request_bucket{route="home",le="0.0"} 1' in output
+
+def test_merge_process_snapshots(tmp_path):
+	registry = MetricsRegistry(str(tmp_path))
+	registry.inc("requests_total")
+	dead = {"pid": 2 ** 22 + 1, "counters": [["requests_total", [], 4]], "histograms": [], "gauges": [["pafmvc_db_async_active", [], 7]]}
+	with open(os.path.join(tmp_path, f"metrics-{dead['pid']}.json"), "w") as snapshot_io:
+		json.dump(dead, snapshot_io)
+	lines = registry.render().splitlines()
+	assert "requests_total 5" in lines
+	assert "pafmvc_db_async_active 0" in lines
+
+def test_view():
+	registry = MetricsRegistry()
+	response = MetricsView(registry).get(None)
+	assert response.status == "200"
+	assert dict(response.get_headers())["Content-Type"].startswith("text/plain; version=0.0.4")
+
+def test_reset_after_fork_clears_cache_counters(monkeypatch):
+	registry = MetricsRegistry()
+	registry.inc("requests_total")
+	monkeypatch.setattr(query_cache, "hits", 4)
+	monkeypatch.setattr(query_cache, "misses", 2)
+	monkeypatch.setattr(template_cache, "hits", 3)
+	monkeypatch.setattr(template_cache, "misses", 1)
+	assert "pafmvc_query_cache_hits_total 4" in registry.render().splitlines()
+	registry.reset()
+	lines = registry.render().splitlines()
+	assert "requests_total 1" not in lines
+	for name in ("query_cache_hits", "query_cache_misses", "template_cache_hits", "template_cache_misses"):
+		assert "pafmvc_%s_total 0" % name in lines
@@ -0,0 +1,97 @@
+import os, json, datetime, decimal
+import pytest
+from pafmvc.orm.migrations.state import FieldState, encode_value, decode_value
+
+@pytest.mark.parametrize("value", [
+	None, "text", 3, 1.5, True,
+	[1, "a"], {"a": [1, 2]}, (1, "a"),
+	decimal.Decimal("1.10"),
+	datetime.date(2024, 1, 2),
+	datetime.datetime(2024, 1, 2, 3, 4, 5),
+])
+def test_encode_roundtrip(value):
+	decoded = decode_value(encode_value(value))
+	assert decoded == value and type(decoded) is type(value)
+
+def test_field_state_roundtrip():
+	state = FieldState("decimal", decimal.Decimal("0.50"), True)
+	restored = FieldState(*state.deconstruct())
+	assert restored == state
+	assert restored.default == decimal.Decimal("0.50")
+
+def test_field_state_hash_is_stable():
+	state = FieldState("date", datetime.date(2024, 1, 2))
+	assert FieldState(*state.deconstruct()).deconstruct() == state.deconstruct()
+
+def test_snapshot_after_migrate(migrated):
+	from pafmvc.orm.migrations.base import MigrationEngine
+	engine = MigrationEngine(migrated.registered_apps["testapp"])
+	last_index, state = engine.file_manager.load_snapshot()
+	assert last_index == engine.file_manager.get_last_index() == 1
+	assert state.get_hash() == engine._build_state().get_hash()
+	assert not engine.get_changes()
+
+def test_unknown_types_encode_as_text():
+	class Color:
+		def __str__(self) -> str:
+			return "red"
+		def deconstruct(self) -> list:
+			return []
+	assert encode_value(Color()) == "red"
+
+@pytest.mark.parametrize("value", [
+	{"__type__": "os.system", "args": ["true"]},
+	{"__type__": "builtins.eval", "args": ["1"]},
+	{"__type__": "subprocess.Popen", "isoformat": "true"},
+])
+def test_decode_rejects_other_types(value):
+	with pytest.raises(ValueError):
+		decode_value(value)
+
+def build_snapshot(tmp_app) -> tuple:
+	from pafmvc.orm.migrations.base import MigrationFileManager
+	from pafmvc.orm.migrations.state import State
+	file_manager = MigrationFileManager(tmp_app)
+	with open(os.path.join(file_manager._folder, "1.yaml"), "w") as migration_file:
+		migration_file.write("{}\n")
+	state = State.from_entry({"item": {"fields": {"price": ["decimal", encode_value(decimal.Decimal("1.50")), False, False, False]}, "indexes": {}}})
+	file_manager.save_snapshot(state)
+	return file_manager, os.path.join(file_manager._folder, "state.snapshot")
+
+def test_snapshot_roundtrip(tmp_app):
+	file_manager, _ = build_snapshot(tmp_app)
+	last_index, state = file_manager.load_snapshot()
+	assert last_index == 1
+	assert state.models["item"].fields["price"].default == decimal.Decimal("1.50")
+
+def test_tampered_snapshot_is_not_decoded(tmp_app, monkeypatch):
+	from pafmvc.orm.migrations import state
+	file_manager, path = build_snapshot(tmp_app)
+	with open(path) as snapshot_file:
+		snapshot = json.load(snapshot_file)
+	snapshot["state"]["item"]["fields"]["price"][1] = {"__type__": "os.system", "args": ["touch pwned"]}
+	with open(path, "w") as snapshot_file:
+		json.dump(snapshot, snapshot_file)
+	monkeypatch.setattr(state, "decode_value", lambda value: pytest.fail("decoded a snapshot with a bad checksum"))
+	assert file_manager.load_snapshot() is None
+
+def test_forged_checksum_still_rejects_types(tmp_app):
+	from pafmvc.orm.migrations.state import get_entry_hash
+	file_manager, path = build_snapshot(tmp_app)
+	with open(path) as snapshot_file:
+		snapshot = json.load(snapshot_file)
+	snapshot["state"]["item"]["fields"]["price"][1] = {"__type__": "os.system", "args": ["touch pwned"]}
+	snapshot["checksum"] = get_entry_hash(snapshot["state"])
+	with open(path, "w") as snapshot_file:
+		json.dump(snapshot, snapshot_file)
+	assert file_manager.load_snapshot() is None
+
+def test_edited_migration_invalidates_snapshot(tmp_app):
+	file_manager, _ = build_snapshot(tmp_app)
+	path = os.path.join(file_manager._folder, "1.yaml")
+	stat = os.stat(path)
+	with open(path, "w") as migration_file:
+		migration_file.write("[]\n")
+	os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+	assert os.stat(path).st_size == stat.st_size
+	assert file_manager.load_snapshot() is None
@@ -0,0 +1,65 @@
+import io
+import pytest
+from pafmvc.conf import settings
+from pafmvc.core.multipart import MultipartParser, parse_header
+from pafmvc.core.response.exceptions import ResponseException
+
+BOUNDARY = "xYzBoundary"
+
+def build_body(*parts) -> bytes:
+	body = b"preamble\r\n"
+	for headers, content in parts:
+		body += b"--" + BOUNDARY.encode() + b"\r\n" + headers.encode() + b"\r\n\r\n" + content + b"\r\n"
+	return body + b"--" + BOUNDARY.encode() + b"--\r\nepilogue"
+
+def parse(body: bytes) -> tuple:
+	return MultipartParser(io.BytesIO(body), BOUNDARY, len(body)).parse()
+
+FILE_CONTENT = b"line\r\n--xYzBoundar\r\n" * 50
+BODY = build_body(
+	('Content-Disposition: form-data; name="title"', "héllo".encode()),
+	('Content-Disposition: form-data; name="empty"', b""),
+	('Content-Disposition: form-data; name="upload"; filename="a \\"b\\".txt"\r\nContent-Type: text/plain', FILE_CONTENT),
+)
+
+def test_parse_header():
+	assert parse_header('form-data; name="a;b"; filename=x.txt') == ("form-data", {"name": "a;b", "filename": "x.txt"})
+	assert parse_header("Text/Plain; Charset=latin-1") == ("text/plain", {"charset": "latin-1"})
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 64 * 1024])
+def test_parse(monkeypatch, chunk_size):
+	monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", chunk_size, raising=False)
+	fields, files = parse(BODY)
+	assert fields == {"title": "héllo", "empty": ""}
+	upload = files["upload"]
+	assert (upload.filename, upload.content_type, upload.size) == ('a "b".txt', "text/plain", len(FILE_CONTENT))
+	assert upload.read() == FILE_CONTENT
+	upload.close()
+
+def test_spools_to_disk(monkeypatch):
+	monkeypatch.setattr(settings, "UPLOAD_MEMORY_THRESHOLD", 16, raising=False)
+	_, files = parse(BODY)
+	assert files["upload"].file._rolled
+	assert files["upload"].read() == FILE_CONTENT
+
+@pytest.mark.parametrize("setting, value", [
+	("UPLOAD_MAX_FILE_SIZE", 100),
+	("UPLOAD_MAX_FIELD_SIZE", 2),
+	("UPLOAD_MAX_BODY_SIZE", 100),
+	("UPLOAD_MAX_PARTS", 2),
+])
+def test_limits(monkeypatch, setting, value):
+	monkeypatch.setattr(settings, setting, value, raising=False)
+	with pytest.raises(ResponseException) as error:
+		parse(BODY)
+	assert error.value.code == "413"
+
+@pytest.mark.parametrize("body", [b"", b"no boundary here", BODY[:-40]])
+def test_malformed(body):
+	with pytest.raises(ResponseException) as error:
+		parse(body)
+	assert error.value.code == "400"
+
+def test_missing_boundary():
+	with pytest.raises(ResponseException):
+		MultipartParser(io.BytesIO(BODY), "")
@@ -0,0 +1,111 @@
+import sqlite3
+import pytest
+from pafmvc.conf import settings
+from pafmvc.orm.migrations.migration import Migration
+from pafmvc.orm.migrations.state import FieldState, IndexState
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor
+
+FIELDS = {"id": FieldState("PK"), "name": FieldState("VARCHAR(50)"), "qty": FieldState("INTEGER", 0)}
+INDEXES = {"item_name": IndexState(["name"])}
+
+class Interrupted(Exception):
+	pass
+
+@pytest.fixture
+def executor(tmp_path, monkeypatch):
+	monkeypatch.setattr(settings, "DB_MIGRATION_BATCH_SIZE", 3, raising=False)
+	monkeypatch.setattr(settings, "DB_MIGRATION_BATCH_PAUSE", 0, raising=False)
+	executor = SQLiteExecutor(str(tmp_path / "db.sqlite3"))
+	create = Migration()
+	create.add_create_table_operation("item", FIELDS)
+	create.add_create_index_operation("item", "item_name", INDEXES["item_name"])
+	create.apply(executor)
+	with connect(executor) as connection:
+		connection.executemany("INSERT INTO item (id, name, qty) VALUES (?, ?, ?);", ((id, f"n{id}", id) for id in range(10, 110, 10)))
+	return executor
+
+def connect(executor: SQLiteExecutor) -> sqlite3.Connection:
+	return sqlite3.connect(executor._path, isolation_level=None)
+
+def read(executor: SQLiteExecutor, query: str) -> list:
+	connection = connect(executor)
+	try:
+		return connection.execute(query).fetchall()
+	finally:
+		connection.close()
+
+def widen_name() -> Migration:
+	migration = Migration()
+	operation = migration.add_change_table_operation("item", FIELDS, indexes=INDEXES)
+	operation.add_change_field_suboperation("name", FieldState("VARCHAR(100)"))
+	return migration
+
+def test_batched_copy_keeps_concurrent_writes(executor):
+	writes = iter((
+		"INSERT INTO item (id, name, qty) VALUES (5, 'low', 5);",
+		"UPDATE item SET qty = -20 WHERE id = 20;",
+		"DELETE FROM item WHERE id = 30;",
+		"INSERT INTO item (id, name, qty) VALUES (15, 'gap', 15);",
+		"UPDATE item SET qty = -90 WHERE id = 90;",
+		"INSERT INTO item (id, name, qty) VALUES (200, 'high', 200);",
+		"DELETE FROM item WHERE id = 100;",
+	))
+	batches = []
+	def progress(table: str, copied: int, total: int):
+		batches.append(copied)
+		with connect(executor) as connection:
+			for write in (next(writes, None), next(writes, None)):
+				if write:
+					connection.execute(write)
+	widen_name().apply(executor, online=True, progress=progress)
+	assert len(batches) > 2
+	expected = [(5, "low", 5), (10, "n10", 10), (15, "gap", 15), (20, "n20", -20)] + list((id, f"n{id}", id) for id in range(40, 90, 10)) + [(90, "n90", -90), (200, "high", 200)]
+	assert read(executor, "SELECT id, name, qty FROM item ORDER BY id;") == expected
+	assert "VARCHAR(100)" in read(executor, "SELECT sql FROM sqlite_master WHERE name = 'item';")[0][0]
+
+def test_swap_keeps_indexes_and_drops_helpers(executor):
+	widen_name().apply(executor, online=True, progress=lambda *args: None)
+	names = set(row[0] for row in read(executor, "SELECT name FROM sqlite_master;"))
+	assert "item_name" in names
+	assert not any(name.startswith("item_backup") for name in names)
+	assert read(executor, "SELECT COUNT(*) FROM pafmvc_migration_progress;") == [(0,)]
+
+def test_resume_after_interruption(executor):
+	calls = []
+	def interrupt(table: str, copied: int, total: int):
+		calls.append(copied)
+		if len(calls) == 3:
+			raise Interrupted()
+	with pytest.raises(Interrupted):
+		widen_name().apply(executor, online=True, progress=interrupt)
+	assert read(executor, "SELECT COUNT(*) FROM item_backup;") == [(6,)]
+	assert read(executor, "SELECT COUNT(*) FROM pafmvc_migration_progress;") == [(0,)]
+	with connect(executor) as connection:
+		connection.execute("INSERT INTO item (id, name, qty) VALUES (1, 'during', 1);")
+
+	resumed = []
+	widen_name().apply(executor, online=True, progress=lambda table, copied, total: resumed.append(copied))
+	assert resumed[0] == 7
+	assert read(executor, "SELECT COUNT(*) FROM item;") == [(11,)]
+	assert read(executor, "SELECT name FROM item WHERE id = 1;") == [("during",)]
+	assert read(executor, "SELECT COUNT(*) FROM pafmvc_migration_progress;") == [(0,)]
+
+def test_finished_steps_are_skipped(executor, monkeypatch):
+	migration = widen_name()
+	migration.add_create_index_operation("item", "item_qty", IndexState(["qty"]))
+	run = SQLiteExecutor.__call__
+	def fail_index(self, query: str, *args, **kwargs):
+		if "item_qty" in query:
+			raise Interrupted()
+		return run(self, query, *args, **kwargs)
+	with monkeypatch.context() as patch:
+		patch.setattr(SQLiteExecutor, "__call__", fail_index)
+		with pytest.raises(Interrupted):
+			migration.apply(executor, online=True, progress=lambda *args: None)
+	assert read(executor, "SELECT COUNT(*) FROM pafmvc_migration_progress;") == [(1,)]
+	copies = []
+	migration.apply(executor, online=True, progress=lambda *args: copies.append(args))
+	assert copies == []
+	names = set(row[0] for row in read(executor, "SELECT name FROM sqlite_master;"))
+	assert {"item_name", "item_qty"} <= names
+	assert read(executor, "SELECT COUNT(*) FROM pafmvc_migration_progress;") == [(0,)]
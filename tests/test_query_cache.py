@@ -0,0 +1,40 @@
+from pafmvc.orm.db.cache import QueryCache, get_written_tables
+from pafmvc.orm.db.instrumentation import capture_queries
+
+def test_get_written_tables():
+	assert get_written_tables("INSERT INTO item (name) VALUES (?);") == ("item",)
+	assert get_written_tables("update tag SET label=?;") == ("tag",)
+	assert get_written_tables("SELECT * FROM item;") == ()
+
+def test_invalidate():
+	cache = QueryCache(10)
+	cache.set("a", ("item",), 1, 60)
+	cache.set("b", ("tag",), 2, 60)
+	cache.invalidate("item")
+	assert cache.get("a") == (False, None)
+	assert cache.get("b") == (True, 2)
+
+def test_skip_stale_result():
+	cache = QueryCache(10)
+	generation = cache.get_generation(("item",))
+	cache.invalidate("item")
+	cache.set("a", ("item",), 1, 60, generation)
+	assert cache.get("a") == (False, None)
+
+def test_expiry_and_size():
+	cache = QueryCache(2)
+	cache.set("a", ("item",), 1, -1)
+	assert cache.get("a") == (False, None)
+	for key in "bcd":
+		cache.set(key, ("item",), key, 60)
+	assert len(cache) == 2 and cache.get("b") == (False, None)
+
+def test_queryset_cache(db):
+	from testapp.models import Item
+	Item.manager.create(name="a", kind="x", qty=1)
+	with capture_queries() as log:
+		assert [item.name for item in Item.manager.filter(kind="x").cache()] == ["a"]
+		assert [item.name for item in Item.manager.filter(kind="x").cache()] == ["a"]
+	assert log.count == 1
+	Item.manager.create(name="b", kind="x", qty=2)
+	assert sorted(item.name for item in Item.manager.filter(kind="x").cache()) == ["a", "b"]
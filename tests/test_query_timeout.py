@@ -0,0 +1,43 @@
+import time
+import pytest
+from pafmvc.orm.db.executor import QueryTimeout, query_timeout, _deadline
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor
+
+SLOW_QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n;"
+
+@pytest.fixture
+def executor(tmp_path):
+	executor = SQLiteExecutor(str(tmp_path / "db.sqlite3"))
+	executor.connect()
+	yield executor
+	executor.close()
+
+def test_timeout_argument(executor):
+	started = time.monotonic()
+	with pytest.raises(QueryTimeout):
+		executor(SLOW_QUERY, timeout=0.05)
+	assert time.monotonic() - started < 2
+	assert executor("SELECT 1;").fetchall() == [(1,)]
+
+def test_timeout_option(tmp_path):
+	executor = SQLiteExecutor(str(tmp_path / "db.sqlite3"), {"timeout": 0.05})
+	executor.connect()
+	try:
+		with pytest.raises(QueryTimeout):
+			executor(SLOW_QUERY)
+	finally:
+		executor.close()
+
+def test_query_timeout_scope(executor):
+	with query_timeout(0.05):
+		with pytest.raises(QueryTimeout):
+			executor(SLOW_QUERY, timeout=60)
+
+def test_nested_scope_keeps_earliest_deadline():
+	with query_timeout(1):
+		outer = _deadline.get()
+		with query_timeout(60):
+			assert _deadline.get() == outer
+		with query_timeout():
+			assert _deadline.get() == outer
+	assert _deadline.get() is None
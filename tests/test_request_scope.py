@@ -0,0 +1,48 @@
+import os, sys, importlib
+import pytest
+from pafmvc.core.response import Response
+
+@pytest.fixture
+def main(monkeypatch):
+	monkeypatch.syspath_prepend(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core"))
+	return importlib.import_module("main")
+
+@pytest.fixture
+def scope(main, monkeypatch):
+	events = []
+	class BatchLoading:
+		def __enter__(self):
+			events.append("enter")
+
+		def __exit__(self, *exc_info):
+			events.append("exit")
+	monkeypatch.setattr(main, "batch_loading", BatchLoading)
+	monkeypatch.setattr(main, "metrics", None)
+	monkeypatch.setattr(main, "admission", None)
+	monkeypatch.setattr(main.PyMVC, "_find_url", lambda self, url: None)
+	monkeypatch.setattr(main.PyMVC, "_get_response", lambda self, request, url, urlpattern: Response("200 OK", b"ok"))
+	return events
+
+ENVIRON = {"PATH_INFO": "/", "REQUEST_METHOD": "GET", "QUERY_STRING": "", "wsgi.input": None}
+
+def test_scope_closed_after_body(main, scope):
+	body = main.PyMVC()(ENVIRON, lambda status, headers: None)
+	assert scope == ["enter"]
+	list(body)
+	body.close()
+	assert scope == ["enter", "exit"]
+
+def test_scope_closed_when_start_response_fails(main, scope):
+	def start_response(status, headers):
+		raise RuntimeError("client went away")
+	with pytest.raises(RuntimeError):
+		main.PyMVC()(ENVIRON, start_response)
+	assert scope == ["enter", "exit"]
+
+def test_scope_closed_when_body_fails(main, scope, monkeypatch):
+	def iter_body(self):
+		raise RuntimeError("body failed")
+	monkeypatch.setattr(Response, "iter_body", iter_body)
+	with pytest.raises(RuntimeError):
+		main.PyMVC()(ENVIRON, lambda status, headers: None)
+	assert scope == ["enter", "exit"]
@@ -0,0 +1,75 @@
+import sqlite3
+import pytest
+from pafmvc.conf import settings
+from pafmvc.orm.db import router
+from pafmvc.orm.db.connection import get_databases, connect, connections, DEFAULT_DB_ALIAS
+from pafmvc.orm.db.router import BaseRouter, PrimaryReplicaRouter, get_router
+
+EDITOR = {"EDITOR_PATH": "pafmvc.orm.db.backends.sqlite.executor", "EDITOR": "SQLiteExecutor"}
+
+@pytest.fixture
+def replica(db, tmp_path, monkeypatch) -> str:
+	path = str(tmp_path / "replica.sqlite3")
+	source, target = sqlite3.connect(settings.DB_PATH), sqlite3.connect(path)
+	source.backup(target)
+	source.close()
+	target.close()
+	monkeypatch.setattr(settings, "DATABASES", {
+		DEFAULT_DB_ALIAS: dict(EDITOR, PATH=settings.DB_PATH),
+		"replica": dict(EDITOR, PATH=path, REPLICA=True),
+	}, raising=False)
+	monkeypatch.setattr(router, "_router", None)
+	connections._get_executors().pop("replica", None)
+	yield path
+	connections._get_executors().pop("replica", None)
+
+def test_legacy_settings():
+	databases = get_databases()
+	assert list(databases) == [DEFAULT_DB_ALIAS]
+	assert databases[DEFAULT_DB_ALIAS]["PATH"] == settings.DB_PATH
+	assert databases[DEFAULT_DB_ALIAS]["EDITOR"] == settings.DB_EDITOR
+
+def test_databases_setting(tmp_path, monkeypatch):
+	databases = {DEFAULT_DB_ALIAS: dict(EDITOR, PATH=str(tmp_path / "a.sqlite3"), OPTIONS={"retries": 1})}
+	monkeypatch.setattr(settings, "DATABASES", databases, raising=False)
+	assert get_databases() is databases
+	executor = connect()
+	assert executor._path == str(tmp_path / "a.sqlite3") and executor._options == {"retries": 1}
+	with pytest.raises(Exception):
+		connect(alias="missing")
+
+def test_router_setting(monkeypatch):
+	monkeypatch.setattr(settings, "DB_ROUTER", "pafmvc.orm.db.router.BaseRouter", raising=False)
+	monkeypatch.setattr(router, "_router", None)
+	assert type(get_router()) is BaseRouter
+
+def test_primary_replica_router(replica):
+	from testapp.models import Item
+	assert isinstance(get_router(), PrimaryReplicaRouter)
+	assert Item.manager.db_for_read() == "replica"
+	assert Item.manager.db_for_write() == DEFAULT_DB_ALIAS
+
+def test_no_replicas_reads_primary():
+	assert PrimaryReplicaRouter().db_for_read(None) == DEFAULT_DB_ALIAS
+
+def test_writes_go_to_primary(replica):
+	from testapp.models import Item
+	created = Item.manager.create(name="a", kind="x", qty=0)
+	assert created.id is not None
+	Item.manager.update({"qty": 5}, id=created.id)
+	assert sqlite3.connect(replica).execute("SELECT COUNT(*) FROM item;").fetchone() == (0,)
+	assert sqlite3.connect(settings.DB_PATH).execute("SELECT qty FROM item;").fetchall() == [(5,)]
+
+def test_reads_go_to_replica(replica):
+	from testapp.models import Item
+	Item.manager.create(name="a", kind="x", qty=0)
+	assert list(Item.manager.all()) == []
+	assert Item.manager.all().count() == 0
+	assert [item.name for item in Item.manager.using(DEFAULT_DB_ALIAS)] == ["a"]
+	assert [item.name for item in Item.manager.all().using(DEFAULT_DB_ALIAS).filter(kind="x")] == ["a"]
+
+def test_get_or_create_reads_primary(replica):
+	from testapp.models import Tag
+	tag, created = Tag.manager.get_or_create(slug="a", defaults={"label": "A"})
+	again, created_again = Tag.manager.get_or_create(slug="a", defaults={"label": "B"})
+	assert created and not created_again and again.id == tag.id
@@ -0,0 +1,30 @@
+import pytest
+from pafmvc.orm.db.query import Query
+from pafmvc.orm.db.instrumentation import capture_queries
+
+def test_join_sql():
+	query = Query("book")
+	query.join("author", "author", "author", ("id", "name"))
+	query.filter(title="t")
+	assert query.to_str() == (
+		"SELECT book.*,author.id AS author__id,author.name AS author__name FROM book "
+		"LEFT JOIN author AS author ON author.id=book.author\nWHERE book.title = ?;"
+	)
+
+def test_select_related(db):
+	from testapp.models import Author, Book
+	author = Author.manager.create(name="a")
+	Book(title="first", author=author.id).save()
+	Book(title="orphan").save()
+	with capture_queries() as log:
+		books = list(Book.manager.all().select_related("author").order_by("id"))
+		assert books[0].get_related("author").name == "a"
+		assert books[1].get_related("author") is None
+	assert log.count == 1
+
+def test_select_related_rejects_other_fields(db):
+	from testapp.models import Book
+	with pytest.raises(Exception):
+		Book.manager.all().select_related("title")
+	with pytest.raises(Exception):
+		Book.manager.all().select_related("missing")
@@ -0,0 +1,67 @@
+import logging, threading
+import pytest
+from pafmvc.conf import settings
+from pafmvc.orm.db.connection import ConnectionHandler
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor, PROFILES
+
+EDITOR = {"EDITOR_PATH": "pafmvc.orm.db.backends.sqlite.executor", "EDITOR": "SQLiteExecutor"}
+
+def read_pragmas(path: str, options: dict) -> dict:
+	executor = SQLiteExecutor(path, options)
+	executor.connect()
+	try:
+		return dict((pragma, executor(f"PRAGMA {pragma};").fetchall()[0][0]) for pragma in ("journal_mode", "synchronous", "foreign_keys", "busy_timeout", "temp_store", "cache_size"))
+	finally:
+		executor.close()
+
+def test_default_profile(tmp_path):
+	pragmas = read_pragmas(str(tmp_path / "db.sqlite3"), {})
+	assert (pragmas["journal_mode"], pragmas["synchronous"], pragmas["foreign_keys"]) == ("delete", 2, 0)
+
+def test_read_heavy_profile(tmp_path):
+	pragmas = read_pragmas(str(tmp_path / "db.sqlite3"), {"profile": "read_heavy"})
+	assert pragmas == {"journal_mode": "wal", "synchronous": 1, "foreign_keys": 0, "busy_timeout": 5000, "temp_store": 2, "cache_size": -64000}
+
+def test_durable_profile(tmp_path):
+	pragmas = read_pragmas(str(tmp_path / "db.sqlite3"), {"profile": "durable"})
+	assert (pragmas["journal_mode"], pragmas["synchronous"], pragmas["foreign_keys"], pragmas["busy_timeout"]) == ("wal", 2, 1, 5000)
+
+def test_overrides(tmp_path):
+	pragmas = read_pragmas(str(tmp_path / "db.sqlite3"), {"profile": "durable", "pragmas": {"synchronous": "OFF", "foreign_keys": "OFF", "cache_size": -2000}})
+	assert (pragmas["journal_mode"], pragmas["synchronous"], pragmas["foreign_keys"], pragmas["cache_size"]) == ("wal", 0, 0, -2000)
+
+def test_unknown_profile(tmp_path):
+	with pytest.raises(Exception):
+		SQLiteExecutor(str(tmp_path / "db.sqlite3"), {"profile": "fast"}).connect()
+
+def test_pragma_report(tmp_path):
+	report = SQLiteExecutor(str(tmp_path / "db.sqlite3"), {"profile": "read_heavy"}).pragma_report()
+	assert report["journal_mode"] == "wal"
+	assert report["busy_timeout"] == PROFILES["read_heavy"]["busy_timeout"]
+
+def test_report_logged_once_per_alias(tmp_path, monkeypatch, caplog):
+	monkeypatch.setattr(settings, "DATABASES", {
+		"default": dict(EDITOR, PATH=str(tmp_path / "default.sqlite3"), OPTIONS={"profile": "durable"}),
+		"replica": dict(EDITOR, PATH=str(tmp_path / "replica.sqlite3")),
+	}, raising=False)
+	handler = ConnectionHandler()
+	with caplog.at_level(logging.INFO, logger="pafmvc.orm.db"):
+		handler["default"]
+		handler["default"]
+		thread = threading.Thread(target=lambda: handler["default"])
+		thread.start()
+		thread.join()
+		handler["replica"]
+	messages = list(record.getMessage() for record in caplog.records)
+	assert len(messages) == 2
+	assert messages[0].startswith("default database settings: ") and "foreign_keys=1" in messages[0]
+	assert messages[1].startswith("replica database settings: ")
+
+def test_report_skipped_without_info(tmp_path, monkeypatch):
+	monkeypatch.setattr(settings, "DATABASES", {"default": dict(EDITOR, PATH=str(tmp_path / "db.sqlite3"))}, raising=False)
+	monkeypatch.setattr(SQLiteExecutor, "pragma_report", lambda self: pytest.fail("pragma report without INFO logging"))
+	logging.getLogger("pafmvc.orm.db").setLevel(logging.WARNING)
+	try:
+		ConnectionHandler()["default"]
+	finally:
+		logging.getLogger("pafmvc.orm.db").setLevel(logging.NOTSET)
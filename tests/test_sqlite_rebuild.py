@@ -0,0 +1,93 @@
+import sqlite3
+import pytest
+from pafmvc.orm.migrations.migration import Migration
+from pafmvc.orm.migrations.state import FieldState, IndexState
+from pafmvc.orm.db.backends.sqlite.schema import operators
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor
+
+FIELDS = {
+	"id": FieldState("PK"),
+	"name": FieldState("VARCHAR(50)"),
+	"kind": FieldState("VARCHAR(50)"),
+	"qty": FieldState("INTEGER", 0),
+	"author": FieldState("FK(author)", None, True),
+}
+INDEXES = {"item_kind": IndexState(["kind"])}
+
+def change_table(*, create: dict={}, change: dict={}, delete: tuple=()) -> Migration:
+	migration = Migration()
+	operation = migration.add_change_table_operation("item", FIELDS, indexes=INDEXES)
+	for name, state in create.items():
+		operation.add_create_field_suboperation(name, state)
+	for name, state in change.items():
+		operation.add_change_field_suboperation(name, state)
+	for name in delete:
+		operation.add_delete_field_suboperation(name, FIELDS[name])
+	return migration
+
+def plan(migration: Migration) -> str:
+	schema = SQLiteExecutor(":memory:").schema_engine()
+	for operations in migration._operations.values():
+		for operation in operations:
+			operation.apply(schema)
+	return schema.to_str()
+
+@pytest.fixture
+def executor(tmp_path):
+	executor = SQLiteExecutor(str(tmp_path / "db.sqlite3"))
+	create = Migration()
+	create.add_create_table_operation("author", {"id": FieldState("PK")})
+	create.add_create_table_operation("item", FIELDS)
+	create.add_create_index_operation("item", "item_kind", INDEXES["item_kind"])
+	create.apply(executor)
+	connection = sqlite3.connect(executor._path)
+	connection.execute("INSERT INTO author (id) VALUES (1);")
+	connection.executemany("INSERT INTO item (name, kind, qty, author) VALUES (?, ?, ?, ?);", (("a", "x", 1, 1), ("b", "y", 2, None)))
+	connection.commit()
+	connection.close()
+	return executor
+
+def read(executor: SQLiteExecutor, query: str) -> list:
+	connection = sqlite3.connect(executor._path)
+	try:
+		return connection.execute(query).fetchall()
+	finally:
+		connection.close()
+
+def test_batched_changes_copy_once():
+	query = plan(change_table(create={"note": FieldState("TEXT", None, True)}, change={"name": FieldState("VARCHAR(100)")}, delete=("qty",)))
+	assert query.count("INSERT INTO item_backup") == 1
+	assert query.count("SELECT id,name,kind,author FROM item;") == 1
+	assert query.count("DROP TABLE item;") == 1
+	assert "ALTER TABLE item ADD" not in query and "DROP COLUMN" not in query
+	assert "CREATE INDEX IF NOT EXISTS item_kind ON item (kind);" in query
+
+def test_add_column_is_native():
+	query = plan(change_table(create={"note": FieldState("TEXT", None, True)}))
+	assert query == "ALTER TABLE item ADD note TEXT NULL;"
+
+@pytest.mark.skipif(sqlite3.sqlite_version_info < operators.NATIVE_DROP_COLUMN_VERSION, reason="sqlite has no DROP COLUMN")
+def test_drop_column_is_native():
+	assert plan(change_table(delete=("qty",))) == "ALTER TABLE item DROP COLUMN qty;"
+
+@pytest.mark.parametrize("column", ["kind", "id", "author"])
+def test_drop_column_falls_back_to_rebuild(column):
+	query = plan(change_table(delete=(column,)))
+	assert "DROP COLUMN" not in query
+	assert query.count("INSERT INTO item_backup") == 1
+
+def test_old_sqlite_drop_column_rebuilds(monkeypatch):
+	monkeypatch.setattr(operators, "sqlite_version_info", (3, 34, 0))
+	assert plan(change_table(delete=("qty",))).count("INSERT INTO item_backup") == 1
+
+def test_rebuild_keeps_data(executor):
+	change_table(create={"note": FieldState("TEXT", None, True)}, change={"name": FieldState("VARCHAR(100)"), "kind": FieldState("VARCHAR(20)")}, delete=("qty",)).apply(executor)
+	assert read(executor, "SELECT id, name, kind, author, note FROM item ORDER BY id;") == [(1, "a", "x", 1, None), (2, "b", "y", None, None)]
+	columns = list(row[1] for row in read(executor, "PRAGMA table_info(item);"))
+	assert columns == ["id", "name", "kind", "author", "note"]
+	assert read(executor, "PRAGMA index_list(item);")[0][1] == "item_kind"
+	assert read(executor, "SELECT name FROM sqlite_master WHERE name = 'item_backup';") == []
+
+def test_native_changes_keep_data(executor):
+	change_table(create={"note": FieldState("TEXT", "n")}).apply(executor)
+	assert read(executor, "SELECT name, note FROM item ORDER BY id;") == [("a", "n"), ("b", "n")]
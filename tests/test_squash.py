@@ -0,0 +1,87 @@
+import os, yaml
+import pytest
+from pafmvc.orm.migrations.base import MigrationEngine, Migration
+from pafmvc.orm.migrations.state import State, FieldState
+
+def create_table(table: str, **fields) -> Migration:
+	migration = Migration()
+	migration.add_create_table_operation(table, dict((name, FieldState(*data)) for name, data in fields.items()))
+	return migration
+
+def delete_table(table: str, **fields) -> Migration:
+	migration = Migration()
+	migration.add_delete_table_operation(table, dict((name, FieldState(*data)) for name, data in fields.items()))
+	return migration
+
+def change_table(table: str, fields: dict, *, create: dict={}, change: dict={}) -> Migration:
+	migration = Migration()
+	operation = migration.add_change_table_operation(table, dict((name, FieldState(*data)) for name, data in fields.items()))
+	for name, data in create.items():
+		operation.add_create_field_suboperation(name, FieldState(*data))
+	for name, data in change.items():
+		operation.add_change_field_suboperation(name, FieldState(*data))
+	return migration
+
+@pytest.fixture
+def engine(tmp_app) -> MigrationEngine:
+	engine = MigrationEngine(tmp_app)
+	item = {"id": ["PK"], "name": ["VARCHAR(50)"]}
+	for migration in (
+		create_table("item", **item),
+		create_table("scratch", id=["PK"]),
+		delete_table("scratch", id=["PK"]),
+		change_table("item", item, change={"name": ["VARCHAR(100)"]}),
+		change_table("item", dict(item, name=["VARCHAR(100)"]), change={"name": ["VARCHAR(200)"]}, create={"qty": ["INTEGER", 0]}),
+		change_table("item", dict(item, name=["VARCHAR(200)"], qty=["INTEGER", 0]), create={"note": ["TEXT", None, True]}),
+	):
+		engine.file_manager.commit(migration)
+	return engine
+
+def read_files(engine: MigrationEngine) -> dict:
+	folder = engine.file_manager._folder
+	return dict((name, open(os.path.join(folder, name)).read()) for name in sorted(os.listdir(folder)))
+
+def replay(engine: MigrationEngine) -> State:
+	return State(migrations=engine.file_manager._get_previous_migrations())
+
+def test_create_then_delete_cancels_out(engine):
+	before = replay(engine).get_hash()
+	files = read_files(engine)
+	squashed = engine.squash(2, 3)
+	assert not squashed
+	assert sorted(read_files(engine)) == ["1.yaml", "2.yaml", "3.yaml", "4.yaml", "state.snapshot"]
+	assert read_files(engine)["2.yaml"] == files["4.yaml"]
+	assert read_files(engine)["4.yaml"] == files["6.yaml"]
+	assert replay(engine).get_hash() == before
+	assert "scratch" not in replay(engine).models
+
+def test_repeated_changes_collapse(engine):
+	before = replay(engine).get_hash()
+	files = read_files(engine)
+	engine.squash(4, 5)
+	after = read_files(engine)
+	assert sorted(after) == ["1.yaml", "2.yaml", "3.yaml", "4.yaml", "5.yaml", "state.snapshot"]
+	assert after["5.yaml"] == files["6.yaml"]
+	squashed = yaml.safe_load(after["4.yaml"])
+	operation, = squashed["CHANGE_TABLE"]
+	assert [change["field"] for change in operation["CHANGE_FIELD"]] == ["name"]
+	assert operation["CHANGE_FIELD"][0]["data"][0] == "VARCHAR(200)"
+	assert [create["field"] for create in operation["CREATE_FIELD"]] == ["qty"]
+	assert replay(engine).get_hash() == before
+
+def test_snapshot_matches_replay(engine):
+	engine.squash(2, 5)
+	last_index, state = engine.file_manager.load_snapshot()
+	assert last_index == engine.file_manager.get_last_index() == 3
+	assert state.get_hash() == replay(engine).get_hash()
+
+def test_failed_verification_writes_nothing(engine, monkeypatch):
+	files = read_files(engine)
+	monkeypatch.setattr(MigrationEngine, "_base_compare", lambda self, migration, from_state, to_state: migration)
+	with pytest.raises(Exception):
+		engine.squash(4, 5)
+	assert read_files(engine) == files
+
+def test_empty_range(engine):
+	with pytest.raises(Exception):
+		engine.squash(3, 3)
@@ -0,0 +1,43 @@
+import json, contextvars
+from pafmvc.orm.model.serializers import JsonStreamSerializer
+from pafmvc.core.response import StreamingJsonResponse, ResponseIterator
+
+def create_items(count: int):
+	from testapp.models import Item
+	for index in range(count):
+		Item.manager.create(name=f"é{index}", kind="x", qty=index)
+	return Item
+
+def test_serializer_chunks(db):
+	Item = create_items(5)
+	chunks = list(JsonStreamSerializer(Item.manager.all().order_by("id"), ("name", "qty"), chunk_size=2))
+	assert len(chunks) == 5
+	assert json.loads(b"".join(chunks)) == list({"name": f"é{index}", "qty": index} for index in range(5))
+
+def test_serializer_empty(db):
+	Item = create_items(0)
+	assert b"".join(JsonStreamSerializer(Item.manager.all())) == b"[]"
+
+def test_streaming_response(db):
+	Item = create_items(2)
+	response = StreamingJsonResponse("200", JsonStreamSerializer(Item.manager.all(), ("qty",)))
+	headers = dict(response.get_headers())
+	assert "Content-Length" not in headers
+	assert headers["Content-Type"] == "application/json; charset=utf-8"
+	assert json.loads(b"".join(response.iter_body())) == [{"qty": 0}, {"qty": 1}]
+
+def test_response_iterator_runs_in_context():
+	variable = contextvars.ContextVar("variable", default=None)
+	def chunks():
+		try:
+			yield variable.get()
+		finally:
+			closed.append(variable.get())
+	closed, finished = [], []
+	context = contextvars.copy_context()
+	context.run(variable.set, b"scoped")
+	iterator = ResponseIterator(context, chunks(), lambda: finished.append(variable.get()))
+	assert next(iterator) == b"scoped"
+	iterator.close()
+	iterator.close()
+	assert closed == [b"scoped"] and finished == [b"scoped"]
@@ -0,0 +1,95 @@
+import pytest
+from pafmvc.orm.db.instrumentation import capture_queries
+from pafmvc.tasks.models import QueuedTask, PENDING, RUNNING, FAILED
+from pafmvc.tasks.queue import task, get_task, get_alias, has_work, dequeue, complete, fail, now_ms, LEASE_EXPIRED
+from pafmvc.tasks.worker import Worker
+
+calls = []
+
+@task
+def record(value: int):
+	calls.append(value)
+
+@task(name="tests.explode", max_retries=1)
+def explode():
+	raise ValueError("boom")
+
+@pytest.fixture
+def queue(db):
+	calls.clear()
+	yield QueuedTask.manager
+	calls.clear()
+
+def test_registration():
+	assert record.name == "tests.test_tasks.record"
+	assert get_task("tests.explode") is explode
+	with pytest.raises(Exception):
+		get_task("tests.missing")
+
+def test_delay(queue):
+	task_id = record.delay(1)
+	queued = queue.get(id=task_id)
+	assert (queued.name, queued.status, queued.attempts) == (record.name, PENDING, 0)
+	assert queued.payload == '{"args": [1], "kwargs": {}}'
+
+def test_dequeue_claims_due_tasks(queue):
+	first = record.delay(1)
+	record.apply_async((2,), countdown=60)
+	assert has_work(get_alias(), now_ms())
+	rows = dequeue(10)
+	assert [row[:4] for row in rows] == [(first, record.name, '{"args": [1], "kwargs": {}}', 1)]
+	claimed = queue.get(id=first)
+	assert claimed.status == RUNNING and claimed.claim == rows[0][5]
+	assert dequeue(10) == []
+
+def test_dequeue_batch_size(queue):
+	for value in range(3):
+		record.delay(value)
+	assert len(dequeue(2)) == 2
+	assert len(dequeue(2)) == 1
+
+def test_idle_dequeue_only_reads(queue):
+	with capture_queries() as log:
+		assert dequeue(10) == []
+	assert [query.sql.split()[0] for query in log.records] == ["SELECT"]
+
+def test_expired_lease_is_reclaimed(queue):
+	task_id = record.delay(1)
+	(_, _, _, _, _, stale_claim), = dequeue(10, lease=-1)
+	(_, _, _, attempts, _, claim), = dequeue(10)
+	assert attempts == 2 and claim != stale_claim
+	complete(task_id, stale_claim)
+	assert queue.get(id=task_id) is not None
+	complete(task_id, claim)
+	assert queue.get(id=task_id) is None
+
+def test_expired_lease_out_of_retries(queue):
+	task_id = explode.delay()
+	dequeue(10, lease=-1)
+	dequeue(10, lease=-1)
+	assert dequeue(10) == []
+	failed = queue.get(id=task_id)
+	assert (failed.status, failed.error) == (FAILED, LEASE_EXPIRED)
+
+def test_fail_retries_then_gives_up(queue):
+	task_id = explode.delay()
+	(_, _, _, attempts, max_retries, claim), = dequeue(10)
+	fail(task_id, claim, attempts, max_retries, "boom")
+	retried = queue.get(id=task_id)
+	assert retried.status == PENDING and retried.run_at > now_ms() - 1000
+	queue.update({"run_at": 0}, id=task_id)
+	(_, _, _, attempts, max_retries, claim), = dequeue(10)
+	fail(task_id, "stale", attempts, max_retries, "boom")
+	assert queue.get(id=task_id).status == RUNNING
+	fail(task_id, claim, attempts, max_retries, "boom")
+	assert queue.get(id=task_id).status == FAILED
+
+def test_worker_run_once(queue):
+	record.delay(1)
+	record.delay(2)
+	explode.delay()
+	worker = Worker(poll_interval=0)
+	assert worker.run_once() == 3
+	assert sorted(calls) == [1, 2]
+	assert [queued.name for queued in queue.all()] == ["tests.explode"]
+	assert "ValueError: boom" in queue.get(name="tests.explode").error
@@ -0,0 +1,58 @@
+from pafmvc.orm.db.entries import DataEngine
+from pafmvc.orm.db.instrumentation import capture_queries
+
+def test_upsert_sql():
+	inserter = DataEngine().insert("tag")
+	inserter.insert_row({"slug": "a", "label": "A"})
+	inserter.insert_row({"slug": "b", "label": "B"})
+	inserter.on_conflict(("slug",), ("label",))
+	assert inserter.to_str() == "INSERT INTO tag\n(slug,label) VALUES (?,?),(?,?)\nON CONFLICT(slug) DO UPDATE SET label=excluded.label;"
+	assert inserter.get_params() == ("a", "A", "b", "B")
+
+def test_insert_or_ignore_sql():
+	inserter = DataEngine().insert("tag")
+	inserter.insert("slug", "a")
+	inserter.on_conflict(("slug",))
+	assert inserter.to_str() == "INSERT INTO tag\n(slug) VALUES (?)\nON CONFLICT(slug) DO NOTHING;"
+
+def test_upsert(db):
+	from testapp.models import Tag
+	Tag.manager.upsert({"slug": "a", "label": "A"}, conflict=("slug",))
+	Tag.manager.upsert({"slug": "a", "label": "B"}, conflict=("slug",))
+	assert [(tag.slug, tag.label) for tag in Tag.manager.all()] == [("a", "B")]
+
+def test_bulk_upsert_mixed_rows(db):
+	from testapp.models import Item
+	first = Item.manager.create(name="a", kind="x", qty=1)
+	Item.manager.bulk_upsert([
+		{"id": first.id, "name": "a", "kind": "x", "qty": 7},
+		{"name": "b", "kind": "y"},
+		{"name": "c", "kind": "y", "qty": 3},
+	])
+	rows = sorted((item.name, item.kind, item.qty) for item in Item.manager.all())
+	assert rows == [("a", "x", 7), ("b", "y", 0), ("c", "y", 3)]
+
+def test_get_or_create_unique(db):
+	from testapp.models import Tag
+	with capture_queries() as log:
+		tag, created = Tag.manager.get_or_create(slug="a", defaults={"label": "A"})
+	assert created and tag.id is not None and tag.label == "A"
+	assert log.count == 1
+	again, created = Tag.manager.get_or_create(slug="a", defaults={"label": "B"})
+	assert not created and again.id == tag.id and again.label == "A"
+
+def test_get_or_create_non_unique(db):
+	from testapp.models import Item
+	item, created = Item.manager.get_or_create(name="a", defaults={"kind": "x"})
+	assert created and item.qty == 0
+	again, created = Item.manager.get_or_create(name="a", defaults={"kind": "y"})
+	assert not created and again.id == item.id and again.kind == "x"
+	assert Item.manager.all().count() == 1
+
+def test_get_or_create_lookup(db):
+	from testapp.models import Item
+	existing = Item.manager.create(name="abc", kind="x", qty=1)
+	item, created = Item.manager.get_or_create(name__contains="b", defaults={"name": "b", "kind": "y"})
+	assert not created and item.id == existing.id
+	item, created = Item.manager.get_or_create(name__contains="z", defaults={"name": "z", "kind": "y"})
+	assert created and item.name == "z"
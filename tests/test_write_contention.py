@@ -0,0 +1,57 @@
+import sqlite3, threading
+import pytest
+from pafmvc.orm.db.backends.sqlite.executor import SQLiteExecutor
+
+@pytest.fixture
+def path(tmp_path) -> str:
+	path = str(tmp_path / "db.sqlite3")
+	connection = sqlite3.connect(path)
+	connection.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT);")
+	connection.close()
+	return path
+
+def lock_database(path: str) -> sqlite3.Connection:
+	connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+	connection.execute("BEGIN IMMEDIATE;")
+	return connection
+
+def test_busy_write_is_retried(path):
+	locker = lock_database(path)
+	timer = threading.Timer(0.1, locker.rollback)
+	timer.start()
+	executor = SQLiteExecutor(path, {"busy_timeout": 0, "retries": 200, "retry_backoff": 0.01, "retry_max_backoff": 0.02})
+	executor.connect()
+	try:
+		executor("INSERT INTO item (name) VALUES (?);", ("a",))
+	finally:
+		executor.close()
+		timer.join()
+		locker.close()
+	assert sqlite3.connect(path).execute("SELECT name FROM item;").fetchall() == [("a",)]
+
+def test_busy_write_gives_up(path):
+	locker = lock_database(path)
+	executor = SQLiteExecutor(path, {"busy_timeout": 0, "retries": 2, "retry_backoff": 0.001})
+	executor.connect()
+	try:
+		with pytest.raises(sqlite3.OperationalError):
+			executor("INSERT INTO item (name) VALUES (?);", ("a",))
+	finally:
+		executor.close()
+		locker.close()
+
+def test_single_writer(path):
+	options = {"single_writer": True, "group_commit_size": 8}
+	def write(name: str):
+		executor = SQLiteExecutor(path, options)
+		executor.connect()
+		try:
+			executor("INSERT INTO item (name) VALUES (?);", (name,))
+		finally:
+			executor.close()
+	writers = list(threading.Thread(target=write, args=(str(index),)) for index in range(20))
+	for writer in writers:
+		writer.start()
+	for writer in writers:
+		writer.join()
+	assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM item;").fetchone() == (20,)
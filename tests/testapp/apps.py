@@ -0,0 +1,4 @@
+from pafmvc.apps.app import App
+
+class TestApp(App):
+	app_name = "testapp"
@@ -0,0 +1,18 @@
+from pafmvc.orm.model import Model
+from pafmvc.orm.model.fields import CharField, IntegerField, ForeignKey
+
+class Item(Model):
+	name = CharField(max_length=50)
+	kind = CharField(max_length=50)
+	qty = IntegerField(default=0)
+
+class Tag(Model):
+	slug = CharField(max_length=50, unique=True)
+	label = CharField(max_length=50)
+
+class Author(Model):
+	name = CharField(max_length=50)
+
+class Book(Model):
+	title = CharField(max_length=50)
+	author = ForeignKey(Author, null=True)